@@ -0,0 +1,41 @@
+"""Add a generated search vector with a GIN index to services
+
+Revision ID: 1d4b7e9a2c50
+Revises: f7a3c6e0b915
+Create Date: 2026-10-17 16:02:41.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1d4b7e9a2c50'
+down_revision: Union[str, Sequence[str], None] = 'f7a3c6e0b915'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        "ALTER TABLE services ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+        ") STORED"
+    )
+    op.create_index(
+        'ix_services_search_vector',
+        'services',
+        ['search_vector'],
+        unique=False,
+        postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_services_search_vector', table_name='services')
+    op.drop_column('services', 'search_vector')
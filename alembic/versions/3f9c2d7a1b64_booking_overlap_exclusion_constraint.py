@@ -0,0 +1,40 @@
+"""Booking overlap exclusion constraint
+
+Revision ID: 3f9c2d7a1b64
+Revises: 8b22c1565e5d
+Create Date: 2026-10-17 09:12:41.204517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2d7a1b64'
+down_revision: Union[str, Sequence[str], None] = '8b22c1565e5d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # btree_gist provides the GiST "=" operator class for the uuid column
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.execute(
+        """
+        ALTER TABLE bookings
+        ADD CONSTRAINT excl_bookings_service_overlap
+        EXCLUDE USING gist (
+            service_id WITH =,
+            tsrange(start_time, end_time, '[)') WITH &&
+        )
+        WHERE (status IN ('pending', 'confirmed'))
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE bookings DROP CONSTRAINT excl_bookings_service_overlap")
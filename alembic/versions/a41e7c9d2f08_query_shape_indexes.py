@@ -0,0 +1,71 @@
+"""Indexes for CRUD query shapes
+
+Revision ID: a41e7c9d2f08
+Revises: 3f9c2d7a1b64
+Create Date: 2026-10-17 11:03:27.518392
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41e7c9d2f08'
+down_revision: Union[str, Sequence[str], None] = '3f9c2d7a1b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Primary keys are already indexed; these duplicated them
+    op.drop_index(op.f('ix_token_blacklist_id'), table_name='token_blacklist')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_index(op.f('ix_services_id'), table_name='services')
+    op.drop_index(op.f('ix_bookings_id'), table_name='bookings')
+    op.drop_index(op.f('ix_reviews_id'), table_name='reviews')
+
+    op.create_index(
+        'ix_bookings_service_active_start',
+        'bookings',
+        ['service_id', 'start_time'],
+        unique=False,
+        postgresql_where=sa.text("status IN ('pending', 'confirmed')"),
+    )
+    op.create_index(
+        'ix_bookings_user_start',
+        'bookings',
+        ['user_id', sa.text('start_time DESC')],
+        unique=False,
+    )
+    op.create_index(
+        'ix_bookings_service_start',
+        'bookings',
+        ['service_id', sa.text('start_time DESC')],
+        unique=False,
+    )
+    op.create_index(
+        'ix_services_active_price', 'services', ['is_active', 'price'], unique=False
+    )
+    op.create_index('ix_services_owner_id', 'services', ['owner_id'], unique=False)
+    op.create_index('ix_reviews_created_at', 'reviews', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_reviews_created_at', table_name='reviews')
+    op.drop_index('ix_services_owner_id', table_name='services')
+    op.drop_index('ix_services_active_price', table_name='services')
+    op.drop_index('ix_bookings_service_start', table_name='bookings')
+    op.drop_index('ix_bookings_user_start', table_name='bookings')
+    op.drop_index('ix_bookings_service_active_start', table_name='bookings')
+
+    op.create_index(op.f('ix_reviews_id'), 'reviews', ['id'], unique=False)
+    op.create_index(op.f('ix_bookings_id'), 'bookings', ['id'], unique=False)
+    op.create_index(op.f('ix_services_id'), 'services', ['id'], unique=False)
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    op.create_index(
+        op.f('ix_token_blacklist_id'), 'token_blacklist', ['id'], unique=False
+    )
@@ -0,0 +1,43 @@
+"""Drop the server default of services.rating_score
+
+Revision ID: a8f2c5e1d7b3
+Revises: e4c7a1f3d962
+Create Date: 2026-10-17 23:05:37.214906
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8f2c5e1d7b3'
+down_revision: Union[str, Sequence[str], None] = 'e4c7a1f3d962'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Rows inserted outside the ORM got a score of 0 rather than the prior
+    op.execute(
+        """
+        UPDATE services SET rating_score = (
+            SELECT (weight * mean + services.rating_sum)
+                   / (weight + services.review_count)
+            FROM rating_prior WHERE id = 1
+        )
+        WHERE EXISTS (SELECT 1 FROM rating_prior WHERE id = 1)
+        """
+    )
+    op.alter_column(
+        'services', 'rating_score', existing_type=sa.Float(), server_default=None
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column(
+        'services', 'rating_score', existing_type=sa.Float(), server_default='0'
+    )
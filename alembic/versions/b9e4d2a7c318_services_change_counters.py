@@ -0,0 +1,36 @@
+"""Add change counters to services for HTTP ETags
+
+Revision ID: b9e4d2a7c318
+Revises: 8c3f1b6d9e27
+Create Date: 2026-10-17 18:05:37.162904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9e4d2a7c318'
+down_revision: Union[str, Sequence[str], None] = '8c3f1b6d9e27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'services',
+        sa.Column('version', sa.Integer(), server_default='1', nullable=False),
+    )
+    op.add_column(
+        'services',
+        sa.Column('review_version', sa.Integer(), server_default='0', nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('services', 'review_version')
+    op.drop_column('services', 'version')
@@ -0,0 +1,35 @@
+"""Index token_blacklist.blacklisted_at for revocation filter refreshes
+
+Revision ID: c5d81e3a9f27
+Revises: a41e7c9d2f08
+Create Date: 2026-10-17 13:42:08.114306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d81e3a9f27'
+down_revision: Union[str, Sequence[str], None] = 'a41e7c9d2f08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        op.f('ix_token_blacklist_blacklisted_at'),
+        'token_blacklist',
+        ['blacklisted_at'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f('ix_token_blacklist_blacklisted_at'), table_name='token_blacklist'
+    )
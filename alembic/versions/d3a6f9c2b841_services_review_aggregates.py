@@ -0,0 +1,56 @@
+"""Store review aggregates on services
+
+Revision ID: d3a6f9c2b841
+Revises: b9e4d2a7c318
+Create Date: 2026-10-17 19:12:08.530417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3a6f9c2b841'
+down_revision: Union[str, Sequence[str], None] = 'b9e4d2a7c318'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+AGGREGATE_COLUMNS = ['review_count', 'rating_sum'] + [
+    f'rating_{rating}_count' for rating in range(1, 6)
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name in AGGREGATE_COLUMNS:
+        op.add_column(
+            'services',
+            sa.Column(name, sa.Integer(), server_default='0', nullable=False),
+        )
+    # Backfill from the existing reviews
+    histogram = ', '.join(
+        f'SUM(CASE WHEN reviews.rating = {rating} THEN 1 ELSE 0 END) '
+        f'AS rating_{rating}_count'
+        for rating in range(1, 6)
+    )
+    assignments = ', '.join(f'{name} = counts.{name}' for name in AGGREGATE_COLUMNS)
+    op.execute(
+        f"""
+        UPDATE services SET {assignments}
+        FROM (
+            SELECT bookings.service_id, COUNT(reviews.id) AS review_count,
+                   SUM(reviews.rating) AS rating_sum, {histogram}
+            FROM reviews JOIN bookings ON reviews.booking_id = bookings.id
+            GROUP BY bookings.service_id
+        ) AS counts
+        WHERE services.id = counts.service_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name in reversed(AGGREGATE_COLUMNS):
+        op.drop_column('services', name)
@@ -0,0 +1,33 @@
+"""Index token_blacklist.expires_at for batched cleanup
+
+Revision ID: e2b94f6c1d38
+Revises: c5d81e3a9f27
+Create Date: 2026-10-17 14:26:51.307742
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b94f6c1d38'
+down_revision: Union[str, Sequence[str], None] = 'c5d81e3a9f27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        op.f('ix_token_blacklist_expires_at'),
+        'token_blacklist',
+        ['expires_at'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_token_blacklist_expires_at'), table_name='token_blacklist')
@@ -0,0 +1,65 @@
+"""Add a Bayesian rating score to services with its prior
+
+Revision ID: e4c7a1f3d962
+Revises: d3a6f9c2b841
+Create Date: 2026-10-17 20:41:53.804126
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4c7a1f3d962'
+down_revision: Union[str, Sequence[str], None] = 'd3a6f9c2b841'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'rating_prior',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('mean', sa.Float(), nullable=False),
+        sa.Column('weight', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    # Prior from the stored review aggregates: the average rating over all
+    # services, worth ten reviews
+    op.execute(
+        """
+        INSERT INTO rating_prior (id, mean, weight)
+        SELECT 1, COALESCE(SUM(rating_sum) * 1.0 / NULLIF(SUM(review_count), 0), 3.0),
+               10.0
+        FROM services
+        """
+    )
+    op.add_column(
+        'services',
+        sa.Column('rating_score', sa.Float(), server_default='0', nullable=False),
+    )
+    op.execute(
+        """
+        UPDATE services SET rating_score = (
+            SELECT (weight * mean + services.rating_sum)
+                   / (weight + services.review_count)
+            FROM rating_prior WHERE id = 1
+        )
+        """
+    )
+    op.create_index(
+        'ix_services_active_rating_score',
+        'services',
+        ['is_active', 'rating_score', 'id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_services_active_rating_score', table_name='services')
+    op.drop_column('services', 'rating_score')
+    op.drop_table('rating_prior')
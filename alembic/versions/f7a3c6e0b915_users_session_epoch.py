@@ -0,0 +1,31 @@
+"""Add users.session_epoch for stateless token revocation
+
+Revision ID: f7a3c6e0b915
+Revises: e2b94f6c1d38
+Create Date: 2026-10-17 15:08:12.640193
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7a3c6e0b915'
+down_revision: Union[str, Sequence[str], None] = 'e2b94f6c1d38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'users',
+        sa.Column('session_epoch', sa.Integer(), server_default='0', nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'session_epoch')
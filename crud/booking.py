@@ -1,17 +1,115 @@
 from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
-from typing import List, Optional
+from sqlalchemy import Select, and_, or_, select
+from sqlalchemy.exc import IntegrityError
+from typing import List, Optional, Tuple
 from uuid import UUID
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from models.booking import Booking
+from models.review import Review
 from models.service import Service
 from models.user import User
 from schemas.booking import BookingCreate, BookingUpdate, BookingResponse, BookingStatus
+from services.booking_index import booking_interval_index, to_naive_utc
+from crud.pagination import apply_keyset
+from crud.review import apply_review_change
 from logger import get_logger
 
 logger = get_logger(__name__)
 
+# SQLSTATE raised by PostgreSQL when an EXCLUDE constraint is violated
+EXCLUSION_VIOLATION = "23P01"
+
+
+# Statements shared by the sync and async CRUD classes
+
+
+def select_booking(booking_id: UUID) -> Select:
+    return select(Booking).filter(Booking.id == str(booking_id))
+
+
+def select_bookings(
+    skip: int = 0,
+    limit: int = 100,
+    user_id: Optional[UUID] = None,
+    service_id: Optional[UUID] = None,
+    status: Optional[str] = None,
+    from_date: Optional[datetime] = None,
+    to_date: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+) -> Select:
+    """Bookings with optional filtering.
+
+    Pages are ordered by (start_time, id) descending. With a cursor the
+    query seeks past it instead of using ``skip``.
+    """
+    query = select(Booking)
+
+    # Filter by user (for user's own bookings)
+    if user_id:
+        query = query.filter(Booking.user_id == str(user_id))
+
+    # Filter by service
+    if service_id:
+        query = query.filter(Booking.service_id == str(service_id))
+
+    # Filter by status
+    if status:
+        query = query.filter(Booking.status == status)
+
+    # Filter by date range
+    if from_date:
+        query = query.filter(Booking.start_time >= from_date)
+    if to_date:
+        query = query.filter(Booking.start_time <= to_date)
+
+    query = query.order_by(Booking.start_time.desc(), Booking.id.desc())
+    if cursor:
+        query = apply_keyset(
+            query, (Booking.start_time, Booking.id), cursor, descending=True
+        )
+    else:
+        query = query.offset(skip)
+
+    return query.limit(limit)
+
+
+def select_busy_intervals(
+    service_id: UUID, window_start: datetime, window_end: datetime
+) -> Select:
+    """Active bookings of a service overlapping a window, in start order"""
+    return (
+        select(Booking.start_time, Booking.end_time)
+        .filter(
+            Booking.service_id == str(service_id),
+            Booking.status.in_(["pending", "confirmed"]),
+            Booking.start_time < window_end,
+            Booking.end_time > window_start,
+        )
+        .order_by(Booking.start_time)
+    )
+
+
+def free_intervals_between(
+    busy: List[Tuple[datetime, datetime]],
+    window_start: datetime,
+    window_end: datetime,
+    min_duration: timedelta,
+) -> List[Tuple[datetime, datetime]]:
+    """Sweep busy intervals in start order, keeping gaps of ``min_duration``"""
+    free_intervals = []
+    cursor = window_start
+    for start_time, end_time in busy:
+        start_time, end_time = to_naive_utc(start_time), to_naive_utc(end_time)
+        if start_time - cursor >= min_duration:
+            free_intervals.append((cursor, start_time))
+        cursor = max(cursor, end_time)
+    if window_end - cursor >= min_duration:
+        free_intervals.append((cursor, window_end))
+
+    return free_intervals
+
 
 class BookingCRUD:
     @staticmethod
@@ -33,14 +131,11 @@ class BookingCRUD:
                 detail="Service not found or is inactive",
             )
 
-        # Check for time conflicts with existing bookings for the same service
-        if BookingCRUD._has_time_conflict(
+        # Check for time conflicts with existing bookings for the same service.
+        # On PostgreSQL the exclusion constraint rejects overlaps on INSERT.
+        BookingCRUD._check_time_conflict(
             db, service_id_str, booking.start_time, booking.end_time
-        ):
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="Time slot is already booked for this service",
-            )
+        )
 
         try:
             db_booking = Booking(
@@ -53,9 +148,19 @@ class BookingCRUD:
             db.add(db_booking)
             db.commit()
             db.refresh(db_booking)
+            booking_interval_index.sync(db_booking)
             logger.info(f"Booking created: {db_booking.id} by user {user_id}")
             return db_booking
 
+        except IntegrityError as e:
+            db.rollback()
+            if BookingCRUD._is_overlap_violation(e):
+                raise BookingCRUD._conflict_exception()
+            logger.error(f"Error creating booking: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Error occurred while creating booking",
+            )
         except Exception as e:
             db.rollback()
             logger.error(f"Error creating booking: {str(e)}")
@@ -64,6 +169,54 @@ class BookingCRUD:
                 detail="Error occurred while creating booking",
             )
 
+    @staticmethod
+    def _enforces_overlap_in_db(db: Session) -> bool:
+        """Whether the database enforces non-overlap via the exclusion constraint"""
+        return db.get_bind().dialect.name == "postgresql"
+
+    @staticmethod
+    def _is_overlap_violation(error: IntegrityError) -> bool:
+        """Check if an integrity error comes from the booking overlap constraint"""
+        return getattr(error.orig, "pgcode", None) == EXCLUSION_VIOLATION
+
+    @staticmethod
+    def _conflict_exception() -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Time slot is already booked for this service",
+        )
+
+    @staticmethod
+    def _check_time_conflict(
+        db: Session,
+        service_id: str,
+        start_time: datetime,
+        end_time: datetime,
+        exclude_booking_id: Optional[str] = None,
+    ) -> None:
+        """Raise a conflict if an active booking of the service overlaps the range.
+
+        With the interval index enabled, a miss there is trusted and skips
+        the query; on PostgreSQL the exclusion constraint still guards the
+        write. The index can be stale for up to its TTL, so an overlap it
+        reports is confirmed against the database before rejecting.
+        """
+        if booking_interval_index.enabled:
+            if not booking_interval_index.has_conflict(
+                db, service_id, start_time, end_time, exclude_booking_id
+            ):
+                return
+            if BookingCRUD._has_time_conflict(
+                db, service_id, start_time, end_time, exclude_booking_id
+            ):
+                raise BookingCRUD._conflict_exception()
+            booking_interval_index.invalidate(service_id)
+        elif not BookingCRUD._enforces_overlap_in_db(db):
+            if BookingCRUD._has_time_conflict(
+                db, service_id, start_time, end_time, exclude_booking_id
+            ):
+                raise BookingCRUD._conflict_exception()
+
     @staticmethod
     def _has_time_conflict(
         db: Session,
@@ -101,8 +254,7 @@ class BookingCRUD:
     @staticmethod
     def get_booking_by_id(db: Session, booking_id: UUID) -> Optional[Booking]:
         """Get booking by ID"""
-        booking_id_str = str(booking_id)
-        return db.query(Booking).filter(Booking.id == booking_id_str).first()
+        return db.scalars(select_booking(booking_id)).first()
 
     @staticmethod
     def get_bookings(
@@ -114,40 +266,47 @@ class BookingCRUD:
         status: Optional[str] = None,
         from_date: Optional[datetime] = None,
         to_date: Optional[datetime] = None,
+        cursor: Optional[str] = None,
     ) -> List[Booking]:
         """Get bookings with optional filtering"""
-        query = db.query(Booking)
-
-        # Filter by user (for user's own bookings)
-        if user_id:
-            user_id_str = str(user_id)
-            query = query.filter(Booking.user_id == user_id_str)
-
-        # Filter by service
-        if service_id:
-            service_id_str = str(service_id)
-            query = query.filter(Booking.service_id == service_id_str)
-
-        # Filter by status
-        if status:
-            query = query.filter(Booking.status == status)
-
-        # Filter by date range
-        if from_date:
-            query = query.filter(Booking.start_time >= from_date)
-        if to_date:
-            query = query.filter(Booking.start_time <= to_date)
+        statement = select_bookings(
+            skip, limit, user_id, service_id, status, from_date, to_date, cursor
+        )
+        return db.scalars(statement).all()
 
-        return query.order_by(Booking.start_time.desc()).offset(skip).limit(limit).all()
+    @staticmethod
+    def get_free_intervals(
+        db: Session,
+        service_id: UUID,
+        window_start: datetime,
+        window_end: datetime,
+        min_duration: timedelta,
+    ) -> List[Tuple[datetime, datetime]]:
+        """Get the free intervals of a service within a time window.
+
+        Fetches the active bookings overlapping the window in one query and
+        sweeps over them in start order, keeping the gaps that can fit at
+        least ``min_duration``.
+        """
+        window_start = to_naive_utc(window_start)
+        window_end = to_naive_utc(window_end)
+        busy = db.execute(
+            select_busy_intervals(service_id, window_start, window_end)
+        ).all()
+        return free_intervals_between(busy, window_start, window_end, min_duration)
 
     @staticmethod
     def get_user_bookings(
-        db: Session, user_id: UUID, skip: int = 0, limit: int = 100
+        db: Session,
+        user_id: UUID,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
     ) -> List[Booking]:
         """Get all bookings for a specific user"""
         user_id_str = str(user_id)
         return BookingCRUD.get_bookings(
-            db=db, user_id=user_id_str, skip=skip, limit=limit
+            db=db, user_id=user_id_str, skip=skip, limit=limit, cursor=cursor
         )
 
     @staticmethod
@@ -210,13 +369,9 @@ class BookingCRUD:
                 new_start = update_data.get("start_time", db_booking.start_time)
                 new_end = update_data.get("end_time", db_booking.end_time)
 
-                if BookingCRUD._has_time_conflict(
+                BookingCRUD._check_time_conflict(
                     db, db_booking.service_id, new_start, new_end, booking_id_str
-                ):
-                    raise HTTPException(
-                        status_code=status.HTTP_409_CONFLICT,
-                        detail="Time slot is already booked for this service",
-                    )
+                )
 
             # Update booking
             for key, value in update_data.items():
@@ -225,11 +380,21 @@ class BookingCRUD:
 
             db.commit()
             db.refresh(db_booking)
+            booking_interval_index.sync(db_booking)
             logger.info(f"Booking updated: {booking_id}")
             return db_booking
 
         except HTTPException:
             raise
+        except IntegrityError as e:
+            db.rollback()
+            if BookingCRUD._is_overlap_violation(e):
+                raise BookingCRUD._conflict_exception()
+            logger.error(f"Error updating booking {booking_id}: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Error occurred while updating booking",
+            )
         except Exception as e:
             db.rollback()
             logger.error(f"Error updating booking {booking_id}: {str(e)}")
@@ -276,8 +441,17 @@ class BookingCRUD:
             )
 
         try:
+            # The review goes with the booking; take it out of the service's
+            # review aggregates in the same transaction
+            review = db.scalars(
+                select(Review).filter(Review.booking_id == booking_id_str)
+            ).first()
+            if review is not None:
+                apply_review_change(db, booking_id_str, removed_rating=review.rating)
+                db.delete(review)
             db.delete(db_booking)
             db.commit()
+            booking_interval_index.discard(db_booking.service_id, db_booking.id)
             logger.info(f"Booking deleted: {booking_id}")
             return db_booking
 
@@ -291,13 +465,103 @@ class BookingCRUD:
 
     @staticmethod
     def get_service_bookings(
-        db: Session, service_id: UUID, skip: int = 0, limit: int = 100
+        db: Session,
+        service_id: UUID,
+        skip: int = 0,
+        limit: int = 100,
+        status: Optional[str] = None,
+        cursor: Optional[str] = None,
     ) -> List[Booking]:
         """Get all bookings for a specific service"""
         service_id_str = str(service_id)
         return BookingCRUD.get_bookings(
-            db=db, service_id=service_id_str, skip=skip, limit=limit
+            db=db,
+            service_id=service_id_str,
+            skip=skip,
+            limit=limit,
+            status=status,
+            cursor=cursor,
+        )
+
+
+class AsyncBookingCRUD:
+    """Read-only booking queries for handlers running on the event loop"""
+
+    @staticmethod
+    async def get_booking_by_id(
+        db: AsyncSession, booking_id: UUID
+    ) -> Optional[Booking]:
+        """Get booking by ID"""
+        return (await db.scalars(select_booking(booking_id))).first()
+
+    @staticmethod
+    async def get_bookings(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        user_id: Optional[UUID] = None,
+        service_id: Optional[UUID] = None,
+        status: Optional[str] = None,
+        from_date: Optional[datetime] = None,
+        to_date: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+    ) -> List[Booking]:
+        """Get bookings with optional filtering"""
+        statement = select_bookings(
+            skip, limit, user_id, service_id, status, from_date, to_date, cursor
+        )
+        return (await db.scalars(statement)).all()
+
+    @staticmethod
+    async def get_free_intervals(
+        db: AsyncSession,
+        service_id: UUID,
+        window_start: datetime,
+        window_end: datetime,
+        min_duration: timedelta,
+    ) -> List[Tuple[datetime, datetime]]:
+        """Get the free intervals of a service within a time window"""
+        window_start = to_naive_utc(window_start)
+        window_end = to_naive_utc(window_end)
+        result = await db.execute(
+            select_busy_intervals(service_id, window_start, window_end)
+        )
+        return free_intervals_between(
+            result.all(), window_start, window_end, min_duration
+        )
+
+    @staticmethod
+    async def get_user_bookings(
+        db: AsyncSession,
+        user_id: UUID,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> List[Booking]:
+        """Get all bookings for a specific user"""
+        return await AsyncBookingCRUD.get_bookings(
+            db=db, user_id=user_id, skip=skip, limit=limit, cursor=cursor
+        )
+
+    @staticmethod
+    async def get_service_bookings(
+        db: AsyncSession,
+        service_id: UUID,
+        skip: int = 0,
+        limit: int = 100,
+        status: Optional[str] = None,
+        cursor: Optional[str] = None,
+    ) -> List[Booking]:
+        """Get all bookings for a specific service"""
+        return await AsyncBookingCRUD.get_bookings(
+            db=db,
+            service_id=service_id,
+            skip=skip,
+            limit=limit,
+            status=status,
+            cursor=cursor,
         )
 
 
 booking_crud = BookingCRUD()
+async_booking_crud = AsyncBookingCRUD()
@@ -0,0 +1,52 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_
+
+# Response header carrying the cursor of the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode the sort key of the last row of a page into an opaque cursor"""
+    payload = [
+        value.isoformat() if isinstance(value, datetime) else str(value)
+        for value in values
+    ]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> List[Any]:
+    """Decode a cursor into sort key values of the given types"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(payload, list) or len(payload) != len(types):
+            raise ValueError("Unexpected cursor shape")
+        return [
+            datetime.fromisoformat(value) if type_ is datetime else type_(value)
+            for value, type_ in zip(payload, types)
+        ]
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+
+def apply_keyset(query, columns: Sequence, cursor: str, descending: bool = False):
+    """Seek past the cursor position for a query ordered by ``columns``"""
+    values = decode_cursor(cursor, [column.type.python_type for column in columns])
+    if len(columns) == 1:
+        key, position = columns[0], values[0]
+    else:
+        key, position = tuple_(*columns), tuple_(*values)
+    return query.filter(key < position if descending else key > position)
+
+
+def next_cursor(items: Sequence, limit: int, *attributes: str) -> Optional[str]:
+    """Cursor for the page after ``items``, or None if this is the last page"""
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor(*(getattr(last, attribute) for attribute in attributes))
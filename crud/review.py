@@ -1,17 +1,196 @@
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import Select, select, update
 from typing import List, Optional
 from uuid import UUID
 from models.review import Review
 from models.booking import Booking
+from models.rating_prior import bayesian_rating
+from models.service import RATINGS, Service, rating_count_column
 from schemas.review import ReviewCreate, ReviewUpdate, ReviewResponse
 from schemas.booking import BookingStatus
+from crud.pagination import apply_keyset
 from logger import get_logger
 
 logger = get_logger(__name__)
 
 
+# Statements shared by the sync and async CRUD classes
+
+
+def select_review(review_id: UUID) -> Select:
+    return select(Review).filter(Review.id == str(review_id))
+
+
+def select_review_by_booking(booking_id: UUID) -> Select:
+    return select(Review).filter(Review.booking_id == str(booking_id))
+
+
+def select_reviews(
+    skip: int = 0,
+    limit: int = 100,
+    user_id: Optional[UUID] = None,
+    service_id: Optional[UUID] = None,
+    booking_id: Optional[UUID] = None,
+    min_rating: Optional[int] = None,
+    max_rating: Optional[int] = None,
+    cursor: Optional[str] = None,
+    with_details: bool = False,
+) -> Select:
+    """Reviews with optional filtering.
+
+    Pages are ordered by (created_at, id) descending. With a cursor the
+    query seeks past it instead of using ``skip``. ``with_details`` loads
+    each review's booking with its user and service in the same query.
+    """
+    query = select(Review)
+    if with_details:
+        query = query.options(
+            joinedload(Review.booking).options(
+                joinedload(Booking.user), joinedload(Booking.service)
+            )
+        )
+
+    # Only join bookings table if we need to filter by user_id or service_id
+    needs_booking_join = user_id is not None or service_id is not None
+    if needs_booking_join:
+        query = query.join(Booking, Review.booking_id == Booking.id)
+
+    # Filter by booking
+    if booking_id is not None:
+        query = query.filter(Review.booking_id == str(booking_id))
+
+    # Filter by user (through booking relationship)
+    if user_id is not None:
+        query = query.filter(Booking.user_id == str(user_id))
+
+    # Filter by service (through booking relationship)
+    if service_id is not None:
+        query = query.filter(Booking.service_id == str(service_id))
+
+    # Filter by rating range
+    if min_rating is not None:
+        query = query.filter(Review.rating >= min_rating)
+    if max_rating is not None:
+        query = query.filter(Review.rating <= max_rating)
+
+    query = query.order_by(Review.created_at.desc(), Review.id.desc())
+    if cursor:
+        query = apply_keyset(
+            query, (Review.created_at, Review.id), cursor, descending=True
+        )
+    else:
+        query = query.offset(skip)
+
+    return query.limit(limit)
+
+
+def review_aggregate_columns() -> list:
+    return [
+        Service.review_version,
+        Service.review_count,
+        Service.rating_sum,
+        Service.rating_score,
+    ] + [rating_count_column(rating) for rating in RATINGS]
+
+
+def select_service_review_aggregates(service_id: UUID) -> Select:
+    return select(*review_aggregate_columns()).filter(Service.id == str(service_id))
+
+
+def select_services_review_aggregates(service_ids: List[UUID]) -> Select:
+    return select(Service.id, *review_aggregate_columns()).filter(
+        Service.id.in_([str(service_id) for service_id in service_ids])
+    )
+
+
+def apply_review_change(
+    db: Session,
+    booking_id: str,
+    added_rating: Optional[int] = None,
+    removed_rating: Optional[int] = None,
+) -> None:
+    """Update the review aggregates of a booking's service in the caller's
+    transaction.
+
+    The counters are incremented in SQL, so concurrent review writes on the
+    same service cannot overwrite each other's changes.
+    """
+    values = {Service.review_version: Service.review_version + 1}
+    count_change = 0
+    sum_change = 0
+    histogram = dict.fromkeys(RATINGS, 0)
+    if added_rating is not None:
+        count_change += 1
+        sum_change += added_rating
+        histogram[added_rating] += 1
+    if removed_rating is not None:
+        count_change -= 1
+        sum_change -= removed_rating
+        histogram[removed_rating] -= 1
+    if count_change:
+        values[Service.review_count] = Service.review_count + count_change
+    if sum_change:
+        values[Service.rating_sum] = Service.rating_sum + sum_change
+    if count_change or sum_change:
+        # Right-hand sides see the row before this update
+        values[Service.rating_score] = bayesian_rating(
+            Service.review_count + count_change, Service.rating_sum + sum_change
+        )
+    for rating, change in histogram.items():
+        if change:
+            column = rating_count_column(rating)
+            values[column] = column + change
+
+    service_id = select(Booking.service_id).filter(Booking.id == booking_id)
+    db.execute(
+        update(Service)
+        .filter(Service.id == service_id.scalar_subquery())
+        .values(values)
+    )
+
+
+def review_stats_version(aggregates) -> str:
+    """Changes whenever review_stats of the same row would.
+
+    The score also moves without a review when the rating prior is
+    refreshed, so it is part of the version.
+    """
+    if aggregates is None:
+        return "0"
+    return f"{aggregates.review_version}.{aggregates.rating_score!r}"
+
+
+def review_stats(aggregates) -> dict:
+    """Shape a row of select_service_review_aggregates into the API response"""
+    if aggregates is None:
+        return {
+            "total_reviews": 0,
+            "average_rating": 0.0,
+            "min_rating": 0,
+            "max_rating": 0,
+            "rating_score": 0.0,
+            "rating_histogram": dict.fromkeys(RATINGS, 0),
+        }
+    histogram = {
+        rating: getattr(aggregates, f"rating_{rating}_count") for rating in RATINGS
+    }
+    rated = [rating for rating, count in histogram.items() if count > 0]
+    return {
+        "total_reviews": aggregates.review_count,
+        "average_rating": (
+            aggregates.rating_sum / aggregates.review_count
+            if aggregates.review_count
+            else 0.0
+        ),
+        "min_rating": rated[0] if rated else 0,
+        "max_rating": rated[-1] if rated else 0,
+        "rating_score": aggregates.rating_score,
+        "rating_histogram": histogram,
+    }
+
+
 class ReviewCRUD:
     @staticmethod
     def create_review(db: Session, review: ReviewCreate, user_id: UUID) -> Review:
@@ -55,6 +234,7 @@ class ReviewCRUD:
                 booking_id=booking_id_str, rating=review.rating, comment=review.comment
             )
             db.add(db_review)
+            apply_review_change(db, booking_id_str, added_rating=review.rating)
             db.commit()
             db.refresh(db_review)
             logger.info(f"Review created: {db_review.id} for booking {booking_id_str}")
@@ -71,8 +251,7 @@ class ReviewCRUD:
     @staticmethod
     def get_review_by_id(db: Session, review_id: UUID) -> Optional[Review]:
         """Get review by ID"""
-        review_id_str = str(review_id)
-        return db.query(Review).filter(Review.id == review_id_str).first()
+        return db.scalars(select_review(review_id)).first()
 
     @staticmethod
     def get_reviews(
@@ -84,53 +263,56 @@ class ReviewCRUD:
         booking_id: Optional[UUID] = None,
         min_rating: Optional[int] = None,
         max_rating: Optional[int] = None,
+        cursor: Optional[str] = None,
+        with_details: bool = False,
     ) -> List[Review]:
         """Get reviews with optional filtering"""
-        query = db.query(Review)
-
-        # Only join bookings table if we need to filter by user_id or service_id
-        needs_booking_join = user_id is not None or service_id is not None
-        if needs_booking_join:
-            query = query.join(Booking, Review.booking_id == Booking.id)
-
-        # Filter by booking
-        if booking_id is not None:
-            booking_id_str = str(booking_id)
-            query = query.filter(Review.booking_id == booking_id_str)
-
-        # Filter by user (through booking relationship)
-        if user_id is not None:
-            user_id_str = str(user_id)
-            query = query.filter(Booking.user_id == user_id_str)
-
-        # Filter by service (through booking relationship)
-        if service_id is not None:
-            service_id_str = str(service_id)
-            query = query.filter(Booking.service_id == service_id_str)
-
-        # Filter by rating range
-        if min_rating is not None:
-            query = query.filter(Review.rating >= min_rating)
-        if max_rating is not None:
-            query = query.filter(Review.rating <= max_rating)
-
-        return query.order_by(Review.created_at.desc()).offset(skip).limit(limit).all()
+        statement = select_reviews(
+            skip,
+            limit,
+            user_id,
+            service_id,
+            booking_id,
+            min_rating,
+            max_rating,
+            cursor,
+            with_details,
+        )
+        return db.scalars(statement).all()
 
     @staticmethod
     def get_service_reviews(
-        db: Session, service_id: UUID, skip: int = 0, limit: int = 100
+        db: Session,
+        service_id: UUID,
+        skip: int = 0,
+        limit: int = 100,
+        min_rating: Optional[int] = None,
+        max_rating: Optional[int] = None,
+        cursor: Optional[str] = None,
     ) -> List[Review]:
         """Get all reviews for a specific service"""
         return ReviewCRUD.get_reviews(
-            db=db, service_id=service_id, skip=skip, limit=limit
+            db=db,
+            service_id=service_id,
+            skip=skip,
+            limit=limit,
+            min_rating=min_rating,
+            max_rating=max_rating,
+            cursor=cursor,
         )
 
     @staticmethod
     def get_user_reviews(
-        db: Session, user_id: UUID, skip: int = 0, limit: int = 100
+        db: Session,
+        user_id: UUID,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
     ) -> List[Review]:
         """Get all reviews by a specific user"""
-        return ReviewCRUD.get_reviews(db=db, user_id=user_id, skip=skip, limit=limit)
+        return ReviewCRUD.get_reviews(
+            db=db, user_id=user_id, skip=skip, limit=limit, cursor=cursor
+        )
 
     @staticmethod
     def update_review(
@@ -162,10 +344,17 @@ class ReviewCRUD:
                 )
 
         try:
+            old_rating = db_review.rating
             # Update only provided fields
             for key, value in review_update.model_dump(exclude_unset=True).items():
                 if value is not None:
                     setattr(db_review, key, value)
+            apply_review_change(
+                db,
+                db_review.booking_id,
+                added_rating=db_review.rating,
+                removed_rating=old_rating,
+            )
 
             db.commit()
             db.refresh(db_review)
@@ -210,6 +399,9 @@ class ReviewCRUD:
 
         try:
             db.delete(db_review)
+            apply_review_change(
+                db, db_review.booking_id, removed_rating=db_review.rating
+            )
             db.commit()
             logger.info(f"Review deleted: {review_id_str}")
             return db_review
@@ -225,34 +417,106 @@ class ReviewCRUD:
     @staticmethod
     def get_review_by_booking(db: Session, booking_id: UUID) -> Optional[Review]:
         """Get review for a specific booking"""
-        booking_id_str = str(booking_id)
-        return db.query(Review).filter(Review.booking_id == booking_id_str).first()
+        return db.scalars(select_review_by_booking(booking_id)).first()
 
     @staticmethod
     def get_service_review_stats(db: Session, service_id: UUID) -> dict:
         """Get review statistics for a service"""
-        service_id_str = str(service_id)
-
-        stats = (
-            db.query(
-                func.count(Review.id).label("total_reviews"),
-                func.avg(Review.rating).label("average_rating"),
-                func.min(Review.rating).label("min_rating"),
-                func.max(Review.rating).label("max_rating"),
-            )
-            .join(Booking, Review.booking_id == Booking.id)
-            .filter(Booking.service_id == service_id_str)
-            .first()
+        return review_stats(
+            db.execute(select_service_review_aggregates(service_id)).first()
         )
 
-        return {
-            "total_reviews": stats.total_reviews or 0,
-            "average_rating": (
-                float(stats.average_rating) if stats.average_rating else 0.0
-            ),
-            "min_rating": stats.min_rating or 0,
-            "max_rating": stats.max_rating or 0,
-        }
+
+class AsyncReviewCRUD:
+    """Read-only review queries for handlers running on the event loop"""
+
+    @staticmethod
+    async def get_review_by_id(db: AsyncSession, review_id: UUID) -> Optional[Review]:
+        """Get review by ID"""
+        return (await db.scalars(select_review(review_id))).first()
+
+    @staticmethod
+    async def get_reviews(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        user_id: Optional[UUID] = None,
+        service_id: Optional[UUID] = None,
+        booking_id: Optional[UUID] = None,
+        min_rating: Optional[int] = None,
+        max_rating: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> List[Review]:
+        """Get reviews with optional filtering"""
+        statement = select_reviews(
+            skip, limit, user_id, service_id, booking_id, min_rating, max_rating, cursor
+        )
+        return (await db.scalars(statement)).all()
+
+    @staticmethod
+    async def get_service_reviews(
+        db: AsyncSession,
+        service_id: UUID,
+        skip: int = 0,
+        limit: int = 100,
+        min_rating: Optional[int] = None,
+        max_rating: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> List[Review]:
+        """Get all reviews for a specific service"""
+        return await AsyncReviewCRUD.get_reviews(
+            db=db,
+            service_id=service_id,
+            skip=skip,
+            limit=limit,
+            min_rating=min_rating,
+            max_rating=max_rating,
+            cursor=cursor,
+        )
+
+    @staticmethod
+    async def get_user_reviews(
+        db: AsyncSession,
+        user_id: UUID,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> List[Review]:
+        """Get all reviews by a specific user"""
+        return await AsyncReviewCRUD.get_reviews(
+            db=db, user_id=user_id, skip=skip, limit=limit, cursor=cursor
+        )
+
+    @staticmethod
+    async def get_review_by_booking(
+        db: AsyncSession, booking_id: UUID
+    ) -> Optional[Review]:
+        """Get review for a specific booking"""
+        return (await db.scalars(select_review_by_booking(booking_id))).first()
+
+    @staticmethod
+    async def get_service_review_aggregates(db: AsyncSession, service_id: UUID):
+        """Stored review aggregates of a service, or None if there is no service"""
+        result = await db.execute(select_service_review_aggregates(service_id))
+        return result.first()
+
+    @staticmethod
+    async def get_services_review_aggregates(
+        db: AsyncSession, service_ids: List[UUID]
+    ) -> dict:
+        """Stored review aggregates of many services in one query, by service ID"""
+        if not service_ids:
+            return {}
+        result = await db.execute(select_services_review_aggregates(service_ids))
+        return {row.id: row for row in result}
+
+    @staticmethod
+    async def get_service_review_stats(db: AsyncSession, service_id: UUID) -> dict:
+        """Get review statistics for a service"""
+        return review_stats(
+            await AsyncReviewCRUD.get_service_review_aggregates(db, service_id)
+        )
 
 
 review_crud = ReviewCRUD()
+async_review_crud = AsyncReviewCRUD()
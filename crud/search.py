@@ -0,0 +1,25 @@
+import re
+from typing import Optional, Union
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+
+def supports_search_indexes(db: Union[Session, AsyncSession]) -> bool:
+    """Check if the session's database has the full-text and trigram indexes.
+
+    They only exist on PostgreSQL; elsewhere (SQLite in tests) searches
+    fall back to ILIKE.
+    """
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def prefix_tsquery(q: str) -> Optional[str]:
+    """Turn search text into a tsquery matching every word as a prefix.
+
+    Only word characters are kept, so user input cannot inject tsquery
+    operators. None if the text has no words.
+    """
+    terms = re.findall(r"\w+", q)
+    if not terms:
+        return None
+    return " & ".join(f"{term}:*" for term in terms)
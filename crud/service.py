@@ -1,15 +1,119 @@
 from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
-from typing import List, Optional
+from sqlalchemy import Select, or_, and_, select, func, literal_column
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from typing import List, NamedTuple, Optional
 from uuid import UUID
-from models.service import Service
+from models.service import SEARCH_CONFIG, Service
 from schemas.service import ServiceCreate, ServiceUpdate, ServiceResponse
+from crud.pagination import apply_keyset
+from crud.search import prefix_tsquery, supports_search_indexes
+from services.catalog_cache import MISSING, bump_catalog_version, catalog_cache
 from logger import get_logger
 
 logger = get_logger(__name__)
 
 
+# Generated column maintained by the database; see models/service.py
+search_vector = literal_column("services.search_vector", TSVECTOR)
+
+
+# Statements shared by the sync and async CRUD classes
+
+
+def select_service(service_id: UUID) -> Select:
+    return select(Service).filter(Service.id == str(service_id))
+
+
+def select_services(
+    skip: int = 0,
+    limit: int = 100,
+    q: Optional[str] = None,
+    price_min: Optional[float] = None,
+    price_max: Optional[float] = None,
+    active: Optional[bool] = None,
+    owner_id: Optional[UUID] = None,
+    cursor: Optional[str] = None,
+    full_text: bool = False,
+    top_rated: bool = False,
+) -> Select:
+    """Services with optional filtering.
+
+    Pages are ordered by id, or with ``top_rated`` by rating score, best
+    first. With a cursor the query seeks past it instead of using ``skip``.
+    With ``full_text`` a search matches words through the search vector
+    and misspelled titles through trigrams, and unless ordered by rating or
+    paged with a cursor orders matches by relevance.
+    """
+    query = select(Service)
+    ranking = ()
+
+    # Filter by search query (title or description)
+    tsquery_text = prefix_tsquery(q) if q and full_text else None
+    if tsquery_text:
+        tsquery = func.to_tsquery(SEARCH_CONFIG, tsquery_text)
+        query = query.filter(
+            or_(
+                search_vector.bool_op("@@")(tsquery),
+                Service.title.bool_op("%>")(q),
+            )
+        )
+        # Word matches first, then titles by closeness to the search text
+        ranking = (
+            func.ts_rank(search_vector, tsquery).desc(),
+            func.word_similarity(q, Service.title).desc(),
+        )
+    elif q:
+        query = query.filter(
+            or_(Service.title.ilike(f"%{q}%"), Service.description.ilike(f"%{q}%"))
+        )
+
+    # Filter by price range
+    if price_min is not None:
+        query = query.filter(Service.price >= price_min)
+    if price_max is not None:
+        query = query.filter(Service.price <= price_max)
+
+    # Filter by active status
+    if active is not None:
+        query = query.filter(Service.is_active == active)
+
+    # Filter by owner (for admin or owner views)
+    if owner_id:
+        query = query.filter(Service.owner_id == owner_id)
+
+    if top_rated:
+        # Equal scores are ordered by id, descending so that one row value
+        # comparison seeks past the cursor
+        query = query.order_by(Service.rating_score.desc(), Service.id.desc())
+        if cursor:
+            query = apply_keyset(
+                query, (Service.rating_score, Service.id), cursor, descending=True
+            )
+        else:
+            query = query.offset(skip)
+    elif cursor:
+        query = apply_keyset(query.order_by(Service.id), (Service.id,), cursor)
+    elif ranking:
+        query = query.order_by(*ranking, Service.id).offset(skip)
+    else:
+        query = query.order_by(Service.id).offset(skip)
+
+    return query.limit(limit)
+
+
+def select_services_by_owner(
+    owner_id: UUID, skip: int = 0, limit: int = 100
+) -> Select:
+    return (
+        select(Service)
+        .filter(Service.owner_id == str(owner_id))
+        .offset(skip)
+        .limit(limit)
+    )
+
+
 class ServiceCRUD:
     @staticmethod
     def create_service(db: Session, service: ServiceCreate, owner_id: UUID) -> Service:
@@ -23,7 +127,9 @@ class ServiceCRUD:
                 owner_id=owner_id,
             )
             db.add(db_service)
+            version = bump_catalog_version(db)
             db.commit()
+            catalog_cache.observe_version(version)
             db.refresh(db_service)
             logger.info(f"Service created: {service.title} by owner {owner_id}")
             return db_service
@@ -39,7 +145,7 @@ class ServiceCRUD:
     @staticmethod
     def get_service_by_id(db: Session, service_id: UUID) -> Optional[Service]:
         """Get service by ID"""
-        return db.query(Service).filter(Service.id == str(service_id)).first()
+        return db.scalars(select_service(service_id)).first()
 
     @staticmethod
     def get_services(
@@ -51,31 +157,23 @@ class ServiceCRUD:
         price_max: Optional[float] = None,
         active: Optional[bool] = None,
         owner_id: Optional[UUID] = None,
+        cursor: Optional[str] = None,
+        top_rated: bool = False,
     ) -> List[Service]:
         """Get services with optional filtering"""
-        query = db.query(Service)
-
-        # Filter by search query (title or description)
-        if q:
-            query = query.filter(
-                or_(Service.title.ilike(f"%{q}%"), Service.description.ilike(f"%{q}%"))
-            )
-
-        # Filter by price range
-        if price_min is not None:
-            query = query.filter(Service.price >= price_min)
-        if price_max is not None:
-            query = query.filter(Service.price <= price_max)
-
-        # Filter by active status
-        if active is not None:
-            query = query.filter(Service.is_active == active)
-
-        # Filter by owner (for admin or owner views)
-        if owner_id:
-            query = query.filter(Service.owner_id == owner_id)
-
-        return query.offset(skip).limit(limit).all()
+        statement = select_services(
+            skip,
+            limit,
+            q,
+            price_min,
+            price_max,
+            active,
+            owner_id,
+            cursor,
+            full_text=supports_search_indexes(db),
+            top_rated=top_rated,
+        )
+        return db.scalars(statement).all()
 
     @staticmethod
     def get_active_services(
@@ -85,6 +183,8 @@ class ServiceCRUD:
         q: Optional[str] = None,
         price_min: Optional[float] = None,
         price_max: Optional[float] = None,
+        cursor: Optional[str] = None,
+        top_rated: bool = False,
     ) -> List[Service]:
         """Get only active services (public endpoint)"""
         return ServiceCRUD.get_services(
@@ -95,6 +195,8 @@ class ServiceCRUD:
             price_min=price_min,
             price_max=price_max,
             active=True,
+            cursor=cursor,
+            top_rated=top_rated,
         )
 
     @staticmethod
@@ -123,8 +225,11 @@ class ServiceCRUD:
             for key, value in service_update.model_dump(exclude_unset=True).items():
                 if value is not None:
                     setattr(db_service, key, value)
+            db_service.version = Service.version + 1
 
+            version = bump_catalog_version(db)
             db.commit()
+            catalog_cache.observe_version(version)
             db.refresh(db_service)
             logger.info(f"Service updated: {service_id}")
             return db_service
@@ -157,7 +262,10 @@ class ServiceCRUD:
 
         try:
             db_service.is_active = False
+            db_service.version = Service.version + 1
+            version = bump_catalog_version(db)
             db.commit()
+            catalog_cache.observe_version(version)
             db.refresh(db_service)
             logger.info(f"Service deleted : {service_id}")
             return db_service
@@ -175,13 +283,150 @@ class ServiceCRUD:
         db: Session, owner_id: UUID, skip: int = 0, limit: int = 100
     ) -> List[Service]:
         """Get all services owned by a specific user"""
-        return (
-            db.query(Service)
-            .filter(Service.owner_id == str(owner_id))
-            .offset(skip)
-            .limit(limit)
-            .all()
+        return db.scalars(select_services_by_owner(owner_id, skip, limit)).all()
+
+
+class AsyncServiceCRUD:
+    """Read-only service queries for handlers running on the event loop"""
+
+    @staticmethod
+    async def get_service_by_id(
+        db: AsyncSession, service_id: UUID
+    ) -> Optional[Service]:
+        """Get service by ID"""
+        return (await db.scalars(select_service(service_id))).first()
+
+    @staticmethod
+    async def get_services(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        q: Optional[str] = None,
+        price_min: Optional[float] = None,
+        price_max: Optional[float] = None,
+        active: Optional[bool] = None,
+        owner_id: Optional[UUID] = None,
+        cursor: Optional[str] = None,
+        top_rated: bool = False,
+    ) -> List[Service]:
+        """Get services with optional filtering"""
+        statement = select_services(
+            skip,
+            limit,
+            q,
+            price_min,
+            price_max,
+            active,
+            owner_id,
+            cursor,
+            full_text=supports_search_indexes(db),
+            top_rated=top_rated,
+        )
+        return (await db.scalars(statement)).all()
+
+    @staticmethod
+    async def get_active_services(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        q: Optional[str] = None,
+        price_min: Optional[float] = None,
+        price_max: Optional[float] = None,
+        cursor: Optional[str] = None,
+        top_rated: bool = False,
+    ) -> List[Service]:
+        """Get only active services (public endpoint)"""
+        return await AsyncServiceCRUD.get_services(
+            db=db,
+            skip=skip,
+            limit=limit,
+            q=q,
+            price_min=price_min,
+            price_max=price_max,
+            active=True,
+            cursor=cursor,
+            top_rated=top_rated,
+        )
+
+    @staticmethod
+    async def get_services_by_owner(
+        db: AsyncSession, owner_id: UUID, skip: int = 0, limit: int = 100
+    ) -> List[Service]:
+        """Get all services owned by a specific user"""
+        statement = select_services_by_owner(owner_id, skip, limit)
+        return (await db.scalars(statement)).all()
+
+
+class CachedService(NamedTuple):
+    """A service response with the row version its ETag is built from"""
+
+    service: ServiceResponse
+    version: int
+
+    @classmethod
+    def from_row(cls, service: Service) -> "CachedService":
+        return cls(ServiceResponse.model_validate(service), service.version)
+
+
+class CachedServiceCRUD:
+    """Public catalog reads served from the per-worker catalog cache.
+
+    Results are cached as response models, so hits skip both the query and
+    the ORM-to-schema conversion.
+    """
+
+    @staticmethod
+    async def get_active_service(
+        db: AsyncSession, service_id: UUID
+    ) -> Optional[CachedService]:
+        """Get an active service by ID, or None"""
+        key = ("service", str(service_id))
+        version = await catalog_cache.current_version(db)
+        cached = catalog_cache.get(key, version)
+        if cached is not MISSING:
+            return cached
+
+        service = await AsyncServiceCRUD.get_service_by_id(db, service_id)
+        result = None
+        if service and service.is_active:
+            result = CachedService.from_row(service)
+        catalog_cache.set(key, result, version)
+        return result
+
+    @staticmethod
+    async def get_active_services(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        q: Optional[str] = None,
+        price_min: Optional[float] = None,
+        price_max: Optional[float] = None,
+        cursor: Optional[str] = None,
+    ) -> List[CachedService]:
+        """Get only active services (public endpoint)"""
+        # Searches ignore case and extra whitespace, so such variants share
+        # an entry
+        q = " ".join((q or "").split()).lower() or None
+        key = ("services", q, price_min, price_max, skip, limit, cursor)
+        version = await catalog_cache.current_version(db)
+        cached = catalog_cache.get(key, version)
+        if cached is not MISSING:
+            return cached
+
+        services = await AsyncServiceCRUD.get_active_services(
+            db=db,
+            skip=skip,
+            limit=limit,
+            q=q,
+            price_min=price_min,
+            price_max=price_max,
+            cursor=cursor,
         )
+        result = [CachedService.from_row(service) for service in services]
+        catalog_cache.set(key, result, version)
+        return result
 
 
 service_crud = ServiceCRUD()
+async_service_crud = AsyncServiceCRUD()
+cached_service_crud = CachedServiceCRUD()
@@ -4,25 +4,87 @@ from typing import List, Optional
 from uuid import UUID
 from schemas.user import UserCreate, UserUpdate, UserOut
 from models.user import User
+from sqlalchemy import Select, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from security.auth import get_password_hash
+from security.token_cache import token_cache
+from security.session_epoch import session_epochs
+from crud.pagination import apply_keyset
+from crud.search import supports_search_indexes
 from logger import get_logger
 
 logger = get_logger(__name__)
 
 
+# Statements shared by the sync and async CRUD classes
+
+
+def select_user(user_id: UUID) -> Select:
+    return select(User).filter(User.id == str(user_id))
+
+
+def select_user_by_email(email: str) -> Select:
+    return select(User).filter(User.email == email)
+
+
+def select_users(
+    skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> Select:
+    query = select(User).order_by(User.id)
+    if cursor:
+        query = apply_keyset(query, (User.id,), cursor)
+    else:
+        query = query.offset(skip)
+    return query.limit(limit)
+
+
+def select_search_users(
+    q: str, skip: int = 0, limit: int = 20, fuzzy: bool = False
+) -> Select:
+    """Users whose name or email contains ``q``.
+
+    With ``fuzzy`` names and emails that are close to ``q`` also match,
+    through the trigram indexes, and the closest come first.
+    """
+    pattern = f"%{q}%"
+    matches = [User.name.ilike(pattern), User.email.ilike(pattern)]
+    if not fuzzy:
+        query = select(User).filter(or_(*matches)).order_by(User.name, User.id)
+        return query.offset(skip).limit(limit)
+
+    matches += [User.name.bool_op("%>")(q), User.email.bool_op("%>")(q)]
+    closeness = func.greatest(
+        func.word_similarity(q, User.name), func.word_similarity(q, User.email)
+    )
+    query = select(User).filter(or_(*matches)).order_by(closeness.desc(), User.id)
+    return query.offset(skip).limit(limit)
+
+
 class UserCRUD:
     @staticmethod
     def get_user_id(db: Session, user_id: UUID):
-        return db.query(User).filter(User.id == str(user_id)).first()
+        return db.scalars(select_user(user_id)).first()
 
     @staticmethod
     def get_user_by_email(db: Session, email: str):
-        return db.query(User).filter(User.email == email).first()
+        return db.scalars(select_user_by_email(email)).first()
 
     @staticmethod
-    def get_users(db: Session, skip: int = 0, limit: int = 100) -> List[User]:
-        return db.query(User).offset(skip).limit(limit).all()
+    def get_users(
+        db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+    ) -> List[User]:
+        return db.scalars(select_users(skip, limit, cursor)).all()
+
+    @staticmethod
+    def search_users(
+        db: Session, q: str, skip: int = 0, limit: int = 20
+    ) -> List[User]:
+        """Search users by name or email, tolerating typos on PostgreSQL"""
+        statement = select_search_users(
+            q, skip, limit, fuzzy=supports_search_indexes(db)
+        )
+        return db.scalars(statement).all()
 
     @staticmethod
     def create_user(db: Session, user: UserCreate) -> User:
@@ -46,6 +108,7 @@ class UserCRUD:
                 )  # Update timestamp
                 db.commit()
                 db.refresh(existing_user)
+                token_cache.invalidate_user(existing_user.id)
                 return existing_user
         # Create new user if existing user found
         db_user = User(
@@ -69,15 +132,23 @@ class UserCRUD:
                 status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
             )
 
+        password_changed = False
         for key, value in user_update.model_dump(exclude_unset=True).items():
             if value is not None:
                 if key == "password":
                     setattr(db_user, "password_hash", get_password_hash(value))
+                    password_changed = True
                 else:
                     setattr(db_user, key, value)
+        if password_changed:
+            # Revoke stateless access tokens issued under the old password
+            db_user.session_epoch = User.session_epoch + 1
 
         db.commit()
         db.refresh(db_user)
+        if password_changed:
+            session_epochs.invalidate(db_user.id)
+        token_cache.invalidate_user(db_user.id)
         return db_user
 
     @staticmethod
@@ -89,9 +160,34 @@ class UserCRUD:
             )
         # Soft delete by setting is_active to False
         db_user.is_active = False
+        db_user.session_epoch = User.session_epoch + 1
         db.commit()
         db.refresh(db_user)
+        session_epochs.invalidate(db_user.id)
+        token_cache.invalidate_user(db_user.id)
         return db_user
 
 
+class AsyncUserCRUD:
+    """Read-only user queries for handlers running on the event loop"""
+
+    @staticmethod
+    async def get_user_id(db: AsyncSession, user_id: UUID):
+        return (await db.scalars(select_user(user_id))).first()
+
+    @staticmethod
+    async def get_user_by_email(db: AsyncSession, email: str):
+        return (await db.scalars(select_user_by_email(email))).first()
+
+    @staticmethod
+    async def get_users(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> List[User]:
+        return (await db.scalars(select_users(skip, limit, cursor))).all()
+
+
 user_crud = UserCRUD()
+async_user_crud = AsyncUserCRUD()
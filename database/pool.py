@@ -0,0 +1,124 @@
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Upper bounds in seconds of the checkout latency histogram buckets
+CHECKOUT_BUCKETS = (0.001, 0.01, 0.1, 1.0, float("inf"))
+
+
+class PoolStats:
+    """Counters describing how requests wait for pooled connections"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_seconds = 0.0
+        self.max_checkout_seconds = 0.0
+        self.buckets = [0] * len(CHECKOUT_BUCKETS)
+        self.overflow_checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+
+    def record_checkout(self, seconds: float, overflowed: bool) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.checkout_seconds += seconds
+            self.max_checkout_seconds = max(self.max_checkout_seconds, seconds)
+            for index, bound in enumerate(CHECKOUT_BUCKETS):
+                if seconds <= bound:
+                    self.buckets[index] += 1
+                    break
+            if overflowed:
+                self.overflow_checkouts += 1
+
+    def record(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "avg_checkout_seconds": (
+                    self.checkout_seconds / self.checkouts if self.checkouts else 0.0
+                ),
+                "max_checkout_seconds": self.max_checkout_seconds,
+                "checkout_latency_buckets": {
+                    f"le_{bound}": count
+                    for bound, count in zip(CHECKOUT_BUCKETS, self.buckets)
+                },
+                "overflow_checkouts": self.overflow_checkouts,
+                "timeouts": self.timeouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection.
+
+    Pool events only fire once a connection has been handed out, so the
+    wait itself is timed around ``_do_get``.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.stats.record("timeouts")
+            raise
+        self.stats.record_checkout(time.perf_counter() - started, self.overflow() > 0)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+class InstrumentedAsyncAdaptedQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """InstrumentedQueuePool for async engines"""
+
+
+def instrument_pool(engine) -> None:
+    """Count new and invalidated connections on an instrumented engine pool.
+
+    Async engines are instrumented through their ``sync_engine``.
+    """
+    engine = getattr(engine, "sync_engine", engine)
+    pool = engine.pool
+    if not isinstance(pool, InstrumentedQueuePool):
+        return
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        engine.pool.stats.record("connects")
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        engine.pool.stats.record("invalidations")
+
+
+def pool_status(engine) -> dict:
+    """Current occupancy and counters of an engine's pool"""
+    pool = getattr(engine, "sync_engine", engine).pool
+    status = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            {
+                "checked_out": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": max(0, pool.overflow()),
+            }
+        )
+    if isinstance(pool, InstrumentedQueuePool):
+        status.update(pool.stats.snapshot())
+    return status
@@ -0,0 +1,82 @@
+import os
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+from dotenv import load_dotenv
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from logger import get_logger
+
+load_dotenv()
+
+logger = get_logger(__name__)
+
+# Flag a request once the same statement runs more than this many times;
+# 0 disables the check
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "0"))
+# "log" to warn about repeated statements, "raise" to fail the request
+N_PLUS_ONE_MODE = os.getenv("N_PLUS_ONE_MODE", "log").lower()
+
+
+class NPlusOneError(RuntimeError):
+    """Raised in strict mode when a request repeats a statement too often"""
+
+
+class QueryStats:
+    """Statements issued on behalf of one request"""
+
+    def __init__(self, threshold: int = 0, mode: str = "log"):
+        self.threshold = threshold
+        self.mode = mode
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes = Counter()
+
+    def record_statement(self, statement: str) -> None:
+        self.count += 1
+        self.shapes[statement] += 1
+        if not self.threshold or self.shapes[statement] != self.threshold + 1:
+            return
+        message = (
+            f"Statement ran more than {self.threshold} times in one request "
+            f"(likely N+1): {statement}"
+        )
+        if self.mode == "raise":
+            raise NPlusOneError(message)
+        logger.warning(message)
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar(
+    "query_stats", default=None
+)
+
+
+@contextmanager
+def track_queries(threshold: int = N_PLUS_ONE_THRESHOLD, mode: str = N_PLUS_ONE_MODE):
+    """Count statements run in this context and in threads started from it"""
+    stats = QueryStats(threshold, mode)
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is None:
+        return
+    stats.record_statement(statement)
+    if context is not None:
+        context.query_started_at = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    started_at = getattr(context, "query_started_at", None)
+    if stats is not None and started_at is not None:
+        stats.seconds += time.perf_counter() - started_at
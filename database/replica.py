@@ -0,0 +1,102 @@
+import os
+import threading
+import time
+from dotenv import load_dotenv
+from fastapi import Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from database.database import async_engine_options, get_async_db, to_async_url
+from database.pool import instrument_pool
+
+load_dotenv()
+
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+# How long a client reads from the primary after one of its writes; should
+# comfortably exceed the replica's usual replication lag
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+# Cookie holding the unix time until which the client reads from the primary
+PRIMARY_STICKY_COOKIE = "bookit_read_primary_until"
+
+_replica_engine = None
+ReplicaSessionLocal = None
+if DATABASE_REPLICA_URL:
+    ReplicaSessionLocal = async_sessionmaker(
+        class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
+
+
+def get_replica_engine():
+    """The replica engine, created on first use; None without a replica"""
+    global _replica_engine
+    if _replica_engine is None and DATABASE_REPLICA_URL:
+        replica_url = to_async_url(DATABASE_REPLICA_URL)
+        _replica_engine = create_async_engine(
+            replica_url, **async_engine_options(replica_url)
+        )
+        instrument_pool(_replica_engine)
+        ReplicaSessionLocal.configure(bind=_replica_engine)
+    return _replica_engine
+
+
+async def dispose_replica_engine() -> None:
+    if _replica_engine is not None:
+        await _replica_engine.dispose()
+
+
+def reset_replica_engine_after_fork() -> None:
+    if _replica_engine is not None:
+        _replica_engine.sync_engine.dispose(close=False)
+
+
+class RoutingStats:
+    """Counts of where read-only requests were sent"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {
+            "replica": 0,
+            "primary_sticky": 0,
+            "primary_no_replica": 0,
+            "sticky_marks": 0,
+        }
+
+    def record(self, decision: str) -> None:
+        with self._lock:
+            self.counts[decision] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"replica_configured": bool(DATABASE_REPLICA_URL), **self.counts}
+
+
+routing_stats = RoutingStats()
+
+
+def reads_from_primary(request: Request) -> bool:
+    """Check if the client wrote recently enough that the replica may lag"""
+    try:
+        return float(request.cookies.get(PRIMARY_STICKY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+async def get_read_db(
+    request: Request, primary: AsyncSession = Depends(get_async_db)
+):
+    """Session for read-only endpoints: the replica unless the client just wrote.
+
+    The primary session is created lazily, so it costs no connection when
+    the replica serves the request.
+    """
+    if ReplicaSessionLocal is None:
+        routing_stats.record("primary_no_replica")
+        yield primary
+        return
+    if reads_from_primary(request):
+        routing_stats.record("primary_sticky")
+        yield primary
+        return
+
+    routing_stats.record("replica")
+    get_replica_engine()
+    async with ReplicaSessionLocal() as db:
+        yield db
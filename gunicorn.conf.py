@@ -0,0 +1,47 @@
+"""Gunicorn settings for running BookIt behind uvicorn workers.
+
+    gunicorn -c gunicorn.conf.py main:app
+
+The app is imported once in the master and shared with the workers
+copy-on-write. Every setting can be overridden from the environment.
+"""
+
+import gc
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+worker_class = "uvicorn.workers.UvicornWorker"
+# Each async worker can keep one CPU busy; blocking work (bcrypt, sync
+# endpoints) goes to thread pools inside the worker. Every worker has its
+# own DB pool, so more workers also means more database connections
+workers = int(os.getenv("WEB_CONCURRENCY", str(max(2, multiprocessing.cpu_count()))))
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() == "true"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+accesslog = "-"
+
+
+def when_ready(server):
+    """Freeze the preloaded heap before the first fork.
+
+    Frozen objects are skipped by the cyclic GC, so collections in the
+    workers stop writing to the pages they share with the master.
+    """
+    if not preload_app:
+        return
+    gc.collect()
+    gc.freeze()
+    server.log.info("Froze %d objects before forking workers", gc.get_freeze_count())
+
+
+def post_fork(server, worker):
+    """Drop any pooled connections the worker inherited from the master"""
+    if not preload_app:
+        return
+    from database.database import reset_engines_after_fork
+    from database.replica import reset_replica_engine_after_fork
+
+    reset_engines_after_fork()
+    reset_replica_engine_after_fork()
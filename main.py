@@ -1,15 +1,88 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from database.database import Base, engine
+from database.database import DB_POOL_WARM_CONNECTIONS, dispose_engines, init_engines
+from database.replica import dispose_replica_engine
 from fastapi.middleware.cors import CORSMiddleware
-from middleware.middleware import add_request_id_and_process_time
+from crud.pagination import NEXT_CURSOR_HEADER
+from middleware.middleware import (
+    add_request_id_and_process_time,
+    count_db_queries,
+    stick_to_primary_after_writes,
+)
 from routers.user import user_router
 from routers.service import service_router
 from routers.booking import booking_router
 from routers.review import review_router
+from routers.metrics import metrics_router
+from routers.json_response import FastJSONResponse
+from services.background import run_periodically, run_with_session
+from services.token_blacklist import (
+    BLACKLIST_CLEANUP_INTERVAL_SECONDS,
+    token_blacklist_service,
+)
+from services.review_aggregates import (
+    REVIEW_RECONCILE_INTERVAL_SECONDS,
+    review_aggregate_service,
+)
+from services.revocation_filter import (
+    REVOCATION_FILTER_REFRESH_SECONDS,
+    revocation_filter,
+)
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # The schema is managed by Alembic (see migrate.sh), not created here
+    await asyncio.to_thread(init_engines, DB_POOL_WARM_CONNECTIONS)
+    tasks = []
+    if revocation_filter.enabled:
+        try:
+            await asyncio.to_thread(run_with_session, revocation_filter.rebuild)
+        except Exception as e:
+            # Lookups fall back to the database until a refresh succeeds
+            logger.error(f"Could not build revocation filter: {str(e)}")
+        tasks.append(
+            asyncio.create_task(
+                run_periodically(
+                    "revocation_filter_refresh",
+                    REVOCATION_FILTER_REFRESH_SECONDS,
+                    revocation_filter.refresh,
+                )
+            )
+        )
+    tasks.append(
+        asyncio.create_task(
+            run_periodically(
+                "token_blacklist_cleanup",
+                BLACKLIST_CLEANUP_INTERVAL_SECONDS,
+                token_blacklist_service.cleanup_expired_tokens,
+            )
+        )
+    )
+    tasks.append(
+        asyncio.create_task(
+            run_periodically(
+                "review_aggregate_reconcile",
+                REVIEW_RECONCILE_INTERVAL_SECONDS,
+                review_aggregate_service.reconcile,
+            )
+        )
+    )
+    yield
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await dispose_engines()
+    await dispose_replica_engine()
 
 
-Base.metadata.create_all(bind=engine)
 app = FastAPI(
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
     title="BookIt API",
     version="1.0.0",
     description="API for a simple bookings platform called BookIt, allowing users to book services, leave reviews, and manage their accounts.",
@@ -20,7 +93,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
+app.middleware("http")(count_db_queries)
+app.middleware("http")(stick_to_primary_after_writes)
 app.middleware("http")(add_request_id_and_process_time)
 
 
@@ -33,3 +109,4 @@ app.include_router(user_router, prefix="/api", tags=["Users"])
 app.include_router(service_router, prefix="/api", tags=["Services"])
 app.include_router(booking_router, prefix="/api", tags=["Bookings"])
 app.include_router(review_router, prefix="/api", tags=["Reviews"])
+app.include_router(metrics_router, prefix="/api", tags=["Internal"])
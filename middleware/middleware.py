@@ -1,6 +1,8 @@
 import time
 import uuid
 from fastapi import FastAPI, Request, HTTPException
+from database import replica
+from database.query_stats import track_queries
 from logger import get_logger
 
 app = FastAPI()
@@ -48,4 +50,31 @@ async def add_request_id_and_process_time(request: Request, call_next):
         )
         
         # Re-raise the exception to let FastAPI handle it
-        raise
\ No newline at end of file
+        raise
+
+async def stick_to_primary_after_writes(request: Request, call_next):
+    """Send a client's reads to the primary for a while after it writes"""
+    response = await call_next(request)
+    if (
+        replica.ReplicaSessionLocal is not None
+        and request.method not in ("GET", "HEAD", "OPTIONS")
+        and response.status_code < 400
+    ):
+        response.set_cookie(
+            replica.PRIMARY_STICKY_COOKIE,
+            str(time.time() + replica.REPLICA_STICKY_SECONDS),
+            max_age=replica.REPLICA_STICKY_SECONDS,
+            httponly=True,
+            samesite="lax",
+        )
+        replica.routing_stats.record("sticky_marks")
+    return response
+
+
+async def count_db_queries(request: Request, call_next):
+    """Report the statements a request issued and the time spent on them"""
+    with track_queries() as stats:
+        response = await call_next(request)
+    response.headers["X-DB-Queries"] = str(stats.count)
+    response.headers["X-DB-Time"] = str(stats.seconds)
+    return response
@@ -5,4 +5,4 @@ echo "Running Alembic migrations..."
 alembic upgrade head
 
 echo "Starting app with Gunicorn..."
-gunicorn main:app -k uvicorn.workers.UvicornWorker
+gunicorn -c gunicorn.conf.py main:app
@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
-from sqlalchemy import Column, String, DateTime, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, func, text
+from sqlalchemy.dialects.postgresql import UUID, ExcludeConstraint
 import uuid
 from database.database import Base
 from sqlalchemy.orm import relationship
@@ -13,7 +13,6 @@ class Booking(Base):
         UUID(as_uuid=False),
         primary_key=True,
         default=lambda: str(uuid.uuid4()),
-        index=True,
     )
     user_id = Column(UUID(as_uuid=False), ForeignKey("users.id"), nullable=False)
     service_id = Column(UUID(as_uuid=False), ForeignKey("services.id"), nullable=False)
@@ -22,7 +21,34 @@ class Booking(Base):
     end_time = Column(DateTime, nullable=False)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
 
+    # Active bookings of the same service may never overlap. PostgreSQL enforces
+    # this itself (requires the btree_gist extension); other dialects fall back
+    # to the application-level check in BookingCRUD.
+    __table_args__ = (
+        ExcludeConstraint(
+            (service_id, "="),
+            (func.tsrange(start_time, end_time, text("'[)'")), "&&"),
+            name="excl_bookings_service_overlap",
+            using="gist",
+            where=text("status IN ('pending', 'confirmed')"),
+        ).ddl_if(dialect="postgresql"),
+        # Conflict checks and availability: active bookings of a service by time
+        Index(
+            "ix_bookings_service_active_start",
+            service_id,
+            start_time,
+            postgresql_where=text("status IN ('pending', 'confirmed')"),
+        ),
+        # Booking listings filtered by user or service, newest first
+        Index("ix_bookings_user_start", user_id, start_time.desc()),
+        Index("ix_bookings_service_start", service_id, start_time.desc()),
+    )
+
     # Relationships
-    user = relationship("User", back_populates="bookings")
-    service = relationship("Service", back_populates="bookings")
-    reviews = relationship("Review", back_populates="booking")
+    user = relationship("User", back_populates="bookings", lazy="raise_on_sql")
+    service = relationship("Service", back_populates="bookings", lazy="raise_on_sql")
+    # Never loaded to unlink on delete: BookingCRUD.delete_booking removes
+    # the review itself so the service's review aggregates stay current
+    reviews = relationship(
+        "Review", back_populates="booking", lazy="raise_on_sql", passive_deletes=True
+    )
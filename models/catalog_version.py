@@ -0,0 +1,15 @@
+from sqlalchemy import BigInteger, Column, Integer
+from database.database import Base
+
+
+class CatalogVersion(Base):
+    """Single row counting changes to the public service catalog.
+
+    Bumped in the same transaction as every service write so that
+    in-process catalog caches can tell when their entries are stale.
+    """
+
+    __tablename__ = "catalog_version"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    version = Column(BigInteger, nullable=False, default=0, server_default="0")
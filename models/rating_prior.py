@@ -0,0 +1,37 @@
+from sqlalchemy import Column, Float, Integer, func, select
+from database.database import Base
+
+RATING_PRIOR_ID = 1
+# Used until the reconcile job has stored a prior: the middle of the scale,
+# worth ten reviews
+DEFAULT_PRIOR_MEAN = 3.0
+DEFAULT_PRIOR_WEIGHT = 10.0
+
+
+class RatingPrior(Base):
+    """Single row holding the prior of the Bayesian rating score.
+
+    Every service is scored as if, besides its own reviews, it had
+    ``weight`` reviews averaging ``mean``, the average rating over all
+    services. Refreshed by services/review_aggregates.py.
+    """
+
+    __tablename__ = "rating_prior"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    mean = Column(Float, nullable=False)
+    weight = Column(Float, nullable=False)
+
+
+def prior_value(column, default: float):
+    return func.coalesce(
+        select(column).where(RatingPrior.id == RATING_PRIOR_ID).scalar_subquery(),
+        default,
+    )
+
+
+def bayesian_rating(review_count, rating_sum):
+    """SQL expression for the Bayesian average of a service's ratings"""
+    weight = prior_value(RatingPrior.weight, DEFAULT_PRIOR_WEIGHT)
+    mean = prior_value(RatingPrior.mean, DEFAULT_PRIOR_MEAN)
+    return (weight * mean + rating_sum) / (weight + review_count)
@@ -7,6 +7,7 @@ from sqlalchemy import (
     ForeignKey,
     Text,
     CheckConstraint,
+    Index,
 )
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
@@ -21,24 +22,26 @@ class Review(Base):
         UUID(as_uuid=False),
         primary_key=True,
         default=lambda: str(uuid.uuid4()),
-        index=True,
     )
     booking_id = Column(
         UUID(as_uuid=False), ForeignKey("bookings.id"), nullable=False, unique=True
     )  # One review per booking
     rating = Column(Integer, nullable=False)
     comment = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=datetime.now(timezone.utc))
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
 
     # Add constraint to ensure rating is between 1 and 5
     __table_args__ = (
         CheckConstraint("rating >= 1 AND rating <= 5", name="check_rating_range"),
+        # Review listings are ordered newest first
+        Index("ix_reviews_created_at", created_at),
     )
 
     # Relationships
-    booking = relationship("Booking", back_populates="reviews")
+    booking = relationship("Booking", back_populates="reviews", lazy="raise_on_sql")
 
-    # Convenience relationship to get user through booking
+    # Convenience relationship to get user through booking; load it with
+    # joinedload(Review.booking).joinedload(Booking.user)
     @property
     def user(self):
         return self.booking.user if self.booking else None
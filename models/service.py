@@ -1,8 +1,21 @@
 from datetime import datetime, timezone
-from sqlalchemy import Column, String, Boolean, ForeignKey, Numeric, Integer, DateTime
+from sqlalchemy import (
+    Column,
+    String,
+    Boolean,
+    ForeignKey,
+    Numeric,
+    Integer,
+    Float,
+    DateTime,
+    Index,
+    DDL,
+    event,
+)
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from database.database import Base
+from models.rating_prior import bayesian_rating
 from sqlalchemy.orm import relationship
 
 
@@ -13,7 +26,6 @@ class Service(Base):
         UUID(as_uuid=False),
         primary_key=True,
         default=lambda: str(uuid.uuid4()),
-        index=True,
     )
     title = Column(String, nullable=False, index=True)
     description = Column(String, nullable=True)
@@ -22,7 +34,69 @@ class Service(Base):
     is_active = Column(Boolean, default=True)
     owner_id = Column(UUID(as_uuid=False), ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime, default=datetime.now(timezone.utc))
+    # Change counters behind the public endpoints' ETags: version moves on
+    # every update of the row, review_version on every change to its reviews
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    review_version = Column(Integer, nullable=False, default=0, server_default="0")
+    # Review aggregates, kept current by every review write (crud/review.py)
+    # and repaired by services/review_aggregates.py if they ever drift
+    review_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_sum = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_1_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_2_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_3_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_4_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_5_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # Bayesian average of the ratings (models/rating_prior.py), sorted on by
+    # the top rated listing; a new service starts at the prior mean. There is
+    # no server default, as no constant matches the moving prior: inserts
+    # outside the ORM must set it (bayesian_rating(0, 0)).
+    rating_score = Column(Float, nullable=False, default=bayesian_rating(0, 0))
+
+    __table_args__ = (
+        # Public listing: active services filtered by price range
+        Index("ix_services_active_price", is_active, price),
+        Index("ix_services_owner_id", owner_id),
+        # Top rated listing: active services by score, paged by (score, id)
+        Index("ix_services_active_rating_score", is_active, rating_score, id),
+        # Typo-tolerant title search (pg_trgm)
+        Index(
+            "ix_services_title_trgm",
+            title,
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
 
     # Relationships
-    owner = relationship("User", back_populates="services")
-    bookings = relationship("Booking", back_populates="service")
+    owner = relationship("User", back_populates="services", lazy="raise_on_sql")
+    bookings = relationship("Booking", back_populates="service", lazy="raise_on_sql")
+
+
+# Ratings a review can have, each with its histogram column on services
+RATINGS = range(1, 6)
+
+
+def rating_count_column(rating: int):
+    return getattr(Service, f"rating_{rating}_count")
+
+
+# Text search configuration used for the search vector and search queries
+SEARCH_CONFIG = "english"
+
+# Full-text search on PostgreSQL: a generated tsvector over title (weighted
+# higher) and description, with a GIN index. The column is left out of the
+# model so SQLite, which searches with ILIKE instead, can still create the
+# table; migration 1d4b7e9a2c50 adds it to real databases
+for _search_ddl in (
+    "ALTER TABLE services ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B')"
+    ") STORED",
+    "CREATE INDEX ix_services_search_vector ON services USING gin (search_vector)",
+):
+    event.listen(
+        Service.__table__,
+        "after_create",
+        DDL(_search_ddl).execute_if(dialect="postgresql"),
+    )
@@ -12,11 +12,12 @@ class TokenBlacklist(Base):
         UUID(as_uuid=False),
         primary_key=True,
         default=lambda: str(uuid.uuid4()),
-        index=True,
     )
     jti = Column(String, unique=True, nullable=False, index=True)  # JWT ID
     token = Column(String, nullable=False)  # Full token for additional verification
-    expires_at = Column(DateTime, nullable=False)  # Token expiration time
+    expires_at = Column(
+        DateTime, nullable=False, index=True
+    )  # Token expiration time
     blacklisted_at = Column(
-        DateTime, default=datetime.now(timezone.utc)
+        DateTime, default=lambda: datetime.now(timezone.utc), index=True
     )  # When token was blacklisted
@@ -1,5 +1,5 @@
 from datetime import datetime, timezone
-from sqlalchemy import Column, String, DateTime, Boolean
+from sqlalchemy import Column, String, DateTime, Boolean, Integer, Index
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from database.database import Base
@@ -13,7 +13,6 @@ class User(Base):
         UUID(as_uuid=False),
         primary_key=True,
         default=lambda: str(uuid.uuid4()),
-        index=True,
     )
     name = Column(String, nullable=False, index=True)
     email = Column(String, unique=True, nullable=False, index=True)
@@ -21,8 +20,26 @@ class User(Base):
     status = Column(String, default="active")
     role = Column(String, default="user")
     is_active = Column(Boolean, default=True)
+    # Bumped on logout and deactivation to revoke stateless access tokens
+    session_epoch = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime, default=datetime.now(timezone.utc))
 
-    # Relationships
-    services = relationship("Service", back_populates="owner")
-    bookings = relationship("Booking", back_populates="user")
+    __table_args__ = (
+        # Admin user search by partial or misspelled name and email (pg_trgm)
+        Index(
+            "ix_users_name_trgm",
+            name,
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_users_email_trgm",
+            email,
+            postgresql_using="gin",
+            postgresql_ops={"email": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
+
+    # Relationships; never lazy loaded, queries that need them must eager load
+    services = relationship("Service", back_populates="owner", lazy="raise_on_sql")
+    bookings = relationship("Booking", back_populates="user", lazy="raise_on_sql")
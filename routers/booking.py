@@ -1,18 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from uuid import UUID
 from typing import List, Optional
 from datetime import datetime, timezone
 from crud.booking import booking_crud
+from crud.pagination import NEXT_CURSOR_HEADER, next_cursor
 from schemas.booking import BookingCreate, BookingUpdate, BookingResponse, BookingStatus
 from database.database import get_db
 from security.auth import get_current_active_user, get_current_admin_user
-from models.user import User
+from schemas.user import CurrentUser
 from logger import get_logger
 
 booking_router = APIRouter()
 logger = get_logger(__name__)
 
+
+def _set_next_cursor(response: Response, bookings: List, limit: int) -> None:
+    cursor = next_cursor(bookings, limit, "start_time", "id")
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+
+
 # USER ENDPOINTS - Users can manage their own bookings
 
 
@@ -21,7 +29,7 @@ logger = get_logger(__name__)
 )
 def create_booking(
     booking: BookingCreate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ):
     """Create a new booking (user creates)"""
@@ -47,6 +55,7 @@ def create_booking(
     "/bookings", response_model=List[BookingResponse], status_code=status.HTTP_200_OK
 )
 def get_user_bookings(
+    response: Response,
     skip: int = Query(0, ge=0, description="Number of bookings to skip"),
     limit: int = Query(100, ge=1, le=100, description="Number of bookings to retrieve"),
     booking_status: Optional[BookingStatus] = Query(
@@ -59,7 +68,10 @@ def get_user_bookings(
     to_date: Optional[datetime] = Query(
         None, description="Filter bookings to this date"
     ),
-    current_user: User = Depends(get_current_active_user),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from the X-Next-Cursor header (replaces skip)"
+    ),
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ):
     """Get user's own bookings with optional filtering"""
@@ -74,9 +86,13 @@ def get_user_bookings(
             service_id=service_id,
             from_date=from_date,
             to_date=to_date,
+            cursor=cursor,
         )
+        _set_next_cursor(response, bookings, limit)
         return [BookingResponse.model_validate(booking) for booking in bookings]
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching user bookings: {str(e)}")
         raise HTTPException(
@@ -92,7 +108,7 @@ def get_user_bookings(
 )
 def get_booking(
     booking_id: UUID,
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ):
     """Get booking by ID (owner or admin)"""
@@ -131,7 +147,7 @@ def get_booking(
 def update_booking(
     booking_id: UUID,
     booking_update: BookingUpdate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ):
     """Update booking (owner can reschedule/cancel; admin can update status)"""
@@ -163,7 +179,7 @@ def update_booking(
 )
 def delete_booking(
     booking_id: UUID,
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ):
     """Delete booking (owner before start_time; admin anytime)"""
@@ -195,6 +211,7 @@ def delete_booking(
     status_code=status.HTTP_200_OK,
 )
 def get_all_bookings(
+    response: Response,
     skip: int = Query(0, ge=0, description="Number of bookings to skip"),
     limit: int = Query(100, ge=1, le=100, description="Number of bookings to retrieve"),
     user_id: Optional[UUID] = Query(None, description="Filter by user ID"),
@@ -208,7 +225,10 @@ def get_all_bookings(
     to_date: Optional[datetime] = Query(
         None, description="Filter bookings to this date"
     ),
-    current_user: User = Depends(get_current_admin_user),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from the X-Next-Cursor header (replaces skip)"
+    ),
+    current_user: CurrentUser = Depends(get_current_admin_user),
     db: Session = Depends(get_db),
 ):
     """Get all bookings with filtering (admin only)"""
@@ -223,9 +243,13 @@ def get_all_bookings(
             status=status,
             from_date=from_date,
             to_date=to_date,
+            cursor=cursor,
         )
+        _set_next_cursor(response, bookings, limit)
         return [BookingResponse.model_validate(booking) for booking in bookings]
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching all bookings: {str(e)}")
         raise HTTPException(
@@ -242,7 +266,7 @@ def get_all_bookings(
 def update_booking_status(
     booking_id: UUID,
     status: BookingStatus,
-    current_user: User = Depends(get_current_admin_user),
+    current_user: CurrentUser = Depends(get_current_admin_user),
     db: Session = Depends(get_db),
 ):
     """Update booking status (admin only)"""
@@ -277,12 +301,16 @@ def update_booking_status(
 )
 def get_service_bookings(
     service_id: UUID,
+    response: Response,
     skip: int = Query(0, ge=0, description="Number of bookings to skip"),
     limit: int = Query(100, ge=1, le=100, description="Number of bookings to retrieve"),
     status: Optional[BookingStatus] = Query(
         None, description="Filter by booking status"
     ),
-    current_user: User = Depends(get_current_admin_user),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from the X-Next-Cursor header (replaces skip)"
+    ),
+    current_user: CurrentUser = Depends(get_current_admin_user),
     db: Session = Depends(get_db),
 ):
     """Get all bookings for a specific service (admin only)"""
@@ -290,14 +318,14 @@ def get_service_bookings(
         logger.info(
             f"Admin {current_user.email} fetching bookings for service {service_id}"
         )
-        bookings = booking_crud.get_service_bookings(db, service_id, skip, limit)
-
-        # Apply status filter if provided
-        if status:
-            bookings = [booking for booking in bookings if booking.status == status]
-
+        bookings = booking_crud.get_service_bookings(
+            db, service_id, skip, limit, status=status, cursor=cursor
+        )
+        _set_next_cursor(response, bookings, limit)
         return [BookingResponse.model_validate(booking) for booking in bookings]
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching service bookings: {str(e)}")
         raise HTTPException(
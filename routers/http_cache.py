@@ -0,0 +1,45 @@
+import hashlib
+import os
+from typing import Optional
+from dotenv import load_dotenv
+from fastapi import Request, Response, status
+
+load_dotenv()
+
+# How long clients and shared caches may reuse a public response before
+# revalidating it with its ETag
+PUBLIC_CACHE_MAX_AGE = int(os.getenv("PUBLIC_CACHE_MAX_AGE", "0"))
+PUBLIC_CACHE_CONTROL = f"public, max-age={PUBLIC_CACHE_MAX_AGE}, must-revalidate"
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag from the versions a response was built from"""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(str(part).encode())
+        digest.update(b"\0")
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check If-None-Match, which compares ETags weakly (RFC 9110)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in tags
+
+
+def not_modified(
+    request: Request, response: Response, etag: str
+) -> Optional[Response]:
+    """Set ETag and Cache-Control; a 304 to send instead if the client is current"""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = PUBLIC_CACHE_CONTROL
+    if not etag_matches(request, etag):
+        return None
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED, headers=dict(response.headers)
+    )
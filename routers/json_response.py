@@ -0,0 +1,59 @@
+import math
+from decimal import Decimal
+from typing import Any
+import orjson
+from fastapi.responses import JSONResponse
+
+# Dict keys like the stdlib encoder (rating histograms use int keys), and
+# UTC datetimes ending in "Z" as pydantic writes them
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+NON_FINITE_ERROR = "Out of range float values are not JSON compliant"
+
+
+def encode_decimal(value: Any) -> Any:
+    """orjson fallback for Decimal, written the way jsonable_encoder does"""
+    if isinstance(value, Decimal):
+        if not value.is_finite():
+            # Written as null, and rejected by FastJSONResponse.render
+            return float(value)
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def has_non_finite_float(content: Any) -> bool:
+    """Whether content holds a NaN or infinity, which orjson writes as null"""
+    # Iterative, as this runs on every body that contains a null
+    stack = [content]
+    while stack:
+        value = stack.pop()
+        kind = type(value)
+        if kind is dict:
+            stack.extend(value.values())
+        elif kind is list or kind is tuple:
+            stack.extend(value)
+        elif kind is float or kind is Decimal:
+            if not math.isfinite(value):
+                return True
+    return False
+
+
+class FastJSONResponse(JSONResponse):
+    """Default response class of the app, encoding with orjson.
+
+    Matches the stdlib encoder behind JSONResponse on compact separators,
+    non-ASCII text left as UTF-8 and floats the stdlib writes in plain
+    notation. Floats it writes with an exponent can differ: 1e+16 comes out
+    as 1e16 and 1e-05 as 0.00001, the same numbers to any JSON parser.
+    UUIDs, datetimes and Decimals are encoded without a conversion pass,
+    for responses built directly from such values.
+
+    orjson writes NaN and infinities as null. Like the stdlib encoder, the
+    response raises ValueError instead; only bodies containing a null are
+    scanned for them.
+    """
+
+    def render(self, content: Any) -> bytes:
+        body = orjson.dumps(content, default=encode_decimal, option=ORJSON_OPTIONS)
+        if b"null" in body and has_non_finite_float(content):
+            raise ValueError(NON_FINITE_ERROR)
+        return body
@@ -0,0 +1,44 @@
+from fastapi import APIRouter, Depends, status
+from database.database import get_async_engine, get_engine, pool_config
+from database.pool import pool_status
+from database.replica import get_replica_engine, routing_stats
+from security.auth import get_current_admin_user, password_hash_pool
+from security.token_cache import token_cache
+from security.session_epoch import session_epochs
+from services.catalog_cache import catalog_cache
+from services.review_aggregates import reconcile_stats
+from services.revocation_filter import revocation_filter
+from services.token_blacklist import cleanup_stats
+from schemas.user import CurrentUser
+from logger import get_logger
+
+metrics_router = APIRouter()
+logger = get_logger(__name__)
+
+
+def db_pool_status() -> dict:
+    """Pool status of each engine this worker reads and writes through"""
+    replica_engine = get_replica_engine()
+    return {
+        "config": pool_config(),
+        "primary": pool_status(get_engine()),
+        "primary_async": pool_status(get_async_engine()),
+        "replica": pool_status(replica_engine) if replica_engine else None,
+    }
+
+
+@metrics_router.get("/internal/metrics", status_code=status.HTTP_200_OK)
+def get_metrics(current_user: CurrentUser = Depends(get_current_admin_user)):
+    """Get in-process cache and pool statistics for this worker (admin only)"""
+    logger.info(f"Admin {current_user.email} fetching internal metrics")
+    return {
+        "token_cache": token_cache.stats(),
+        "session_epochs": session_epochs.stats(),
+        "password_hash_pool": password_hash_pool.stats(),
+        "revocation_filter": revocation_filter.stats(),
+        "token_blacklist_cleanup": dict(cleanup_stats),
+        "db_pool": db_pool_status(),
+        "db_routing": routing_stats.snapshot(),
+        "catalog_cache": catalog_cache.stats(),
+        "review_aggregate_reconcile": dict(reconcile_stats),
+    }
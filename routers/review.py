@@ -1,17 +1,75 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from uuid import UUID
-from typing import List, Optional
-from crud.review import review_crud
-from schemas.review import ReviewCreate, ReviewUpdate, ReviewResponse
+from typing import List, Literal, Optional, Union
+from crud.pagination import NEXT_CURSOR_HEADER, next_cursor
+from crud.review import (
+    async_review_crud,
+    review_crud,
+    review_stats,
+    review_stats_version,
+)
+from schemas.booking import BookingResponse
+from schemas.review import (
+    ReviewCreate,
+    ReviewUpdate,
+    ReviewResponse,
+    ReviewWithDetails,
+    ServiceReviewStats,
+)
+from schemas.service import ServiceResponse
+from schemas.user import UserOut
 from database.database import get_db
+from database.replica import get_read_db
+from routers.http_cache import make_etag, not_modified
 from security.auth import get_current_active_user, get_current_admin_user
-from models.user import User
+from schemas.user import CurrentUser
 from logger import get_logger
 
 review_router = APIRouter()
 logger = get_logger(__name__)
 
+# Most services whose stats one batch request may ask for; a full listing page
+MAX_STATS_BATCH_SIZE = 100
+
+
+def _set_next_cursor(response: Response, reviews: List, limit: int) -> None:
+    cursor = next_cursor(reviews, limit, "created_at", "id")
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+
+
+def _with_details(review) -> ReviewWithDetails:
+    """Review with its booking, service and author, eager loaded by the query"""
+    booking = review.booking
+    return ReviewWithDetails(
+        **ReviewResponse.model_validate(review).model_dump(),
+        booking=BookingResponse.model_validate(booking).model_dump(mode="json"),
+        service=ServiceResponse.model_validate(booking.service).model_dump(mode="json"),
+        user=UserOut.model_validate(booking.user).model_dump(mode="json"),
+    )
+
+
+def _parse_service_ids(ids: str) -> List[UUID]:
+    """Distinct service IDs from a comma-separated list, in the given order"""
+    try:
+        service_ids = list(
+            dict.fromkeys(UUID(value) for value in ids.split(",") if value.strip())
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'ids' must be a comma-separated list of service IDs",
+        )
+    if not service_ids or len(service_ids) > MAX_STATS_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"'ids' must list between 1 and {MAX_STATS_BATCH_SIZE} services",
+        )
+    return service_ids
+
+
 # USER ENDPOINTS - Users can manage their own reviews
 
 
@@ -20,7 +78,7 @@ logger = get_logger(__name__)
 )
 def create_review(
     review: ReviewCreate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ):
     """Create a new review (must be for a completed booking by the same user)"""
@@ -49,7 +107,7 @@ def create_review(
 )
 def get_review(
     review_id: UUID,
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ):
     """Get review by ID"""
@@ -81,7 +139,7 @@ def get_review(
 def update_review(
     review_id: UUID,
     review_update: ReviewUpdate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ):
     """Update review (owner only)"""
@@ -113,7 +171,7 @@ def update_review(
 )
 def delete_review(
     review_id: UUID,
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ):
     """Delete review (owner or admin)"""
@@ -144,8 +202,9 @@ def delete_review(
     response_model=List[ReviewResponse],
     status_code=status.HTTP_200_OK,
 )
-def get_service_reviews(
+async def get_service_reviews(
     service_id: UUID,
+    response: Response,
     skip: int = Query(0, ge=0, description="Number of reviews to skip"),
     limit: int = Query(100, ge=1, le=100, description="Number of reviews to retrieve"),
     min_rating: Optional[int] = Query(
@@ -154,23 +213,28 @@ def get_service_reviews(
     max_rating: Optional[int] = Query(
         None, ge=1, le=5, description="Maximum rating filter"
     ),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from the X-Next-Cursor header (replaces skip)"
+    ),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get all reviews for a specific service (public endpoint)"""
     try:
         logger.info(f"Fetching reviews for service: {service_id}")
-        reviews = review_crud.get_service_reviews(
-            db, service_id, skip=skip, limit=limit
+        reviews = await async_review_crud.get_service_reviews(
+            db,
+            service_id,
+            skip=skip,
+            limit=limit,
+            min_rating=min_rating,
+            max_rating=max_rating,
+            cursor=cursor,
         )
-
-        # Apply rating filters if provided
-        if min_rating is not None:
-            reviews = [review for review in reviews if review.rating >= min_rating]
-        if max_rating is not None:
-            reviews = [review for review in reviews if review.rating <= max_rating]
-
+        _set_next_cursor(response, reviews, limit)
         return [ReviewResponse.model_validate(review) for review in reviews]
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching service reviews: {str(e)}")
         raise HTTPException(
@@ -179,15 +243,67 @@ def get_service_reviews(
         )
 
 
+@review_router.get(
+    "/services/reviews/stats",
+    response_model=List[ServiceReviewStats],
+    status_code=status.HTTP_200_OK,
+)
+async def get_services_review_stats(
+    request: Request,
+    response: Response,
+    ids: str = Query(..., description="Comma-separated service IDs"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Get review statistics for many services at once (public endpoint)"""
+    service_ids = _parse_service_ids(ids)
+    try:
+        logger.info(f"Fetching review stats for {len(service_ids)} services")
+        aggregates = await async_review_crud.get_services_review_aggregates(
+            db, service_ids
+        )
+        rows = [aggregates.get(str(service_id)) for service_id in service_ids]
+        etag = make_etag(
+            *(
+                f"{service_id}.{review_stats_version(row)}"
+                for service_id, row in zip(service_ids, rows)
+            )
+        )
+        return not_modified(request, response, etag) or [
+            {"service_id": service_id, **review_stats(row)}
+            for service_id, row in zip(service_ids, rows)
+        ]
+
+    except Exception as e:
+        logger.error(f"Error fetching review stats for services: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error occurred while fetching review statistics",
+        )
+
+
 @review_router.get(
     "/services/{service_id}/reviews/stats", status_code=status.HTTP_200_OK
 )
-def get_service_review_stats(service_id: UUID, db: Session = Depends(get_db)):
+async def get_service_review_stats(
+    service_id: UUID,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+):
     """Get review statistics for a service (public endpoint)"""
     try:
         logger.info(f"Fetching review stats for service: {service_id}")
-        stats = review_crud.get_service_review_stats(db, service_id)
-        return stats
+        # One primary-key lookup gives both the stored aggregates and the
+        # change counter the ETag is built from
+        aggregates = await async_review_crud.get_service_review_aggregates(
+            db, service_id
+        )
+        if aggregates is not None:
+            etag = make_etag(service_id, "reviews", review_stats_version(aggregates))
+            cached = not_modified(request, response, etag)
+            if cached:
+                return cached
+        return review_stats(aggregates)
 
     except Exception as e:
         logger.error(f"Error fetching service review stats: {str(e)}")
@@ -206,19 +322,26 @@ def get_service_review_stats(service_id: UUID, db: Session = Depends(get_db)):
     status_code=status.HTTP_200_OK,
 )
 def get_user_reviews(
+    response: Response,
     skip: int = Query(0, ge=0, description="Number of reviews to skip"),
     limit: int = Query(100, ge=1, le=100, description="Number of reviews to retrieve"),
-    current_user: User = Depends(get_current_active_user),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from the X-Next-Cursor header (replaces skip)"
+    ),
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ):
     """Get current user's reviews"""
     try:
         logger.info(f"User {current_user.email} fetching their reviews")
         reviews = review_crud.get_user_reviews(
-            db, current_user.id, skip=skip, limit=limit
+            db, current_user.id, skip=skip, limit=limit, cursor=cursor
         )
+        _set_next_cursor(response, reviews, limit)
         return [ReviewResponse.model_validate(review) for review in reviews]
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching user reviews: {str(e)}")
         raise HTTPException(
@@ -232,10 +355,11 @@ def get_user_reviews(
 
 @review_router.get(
     "/admin/reviews",
-    response_model=List[ReviewResponse],
+    response_model=List[Union[ReviewWithDetails, ReviewResponse]],
     status_code=status.HTTP_200_OK,
 )
 def get_all_reviews(
+    response: Response,
     skip: int = Query(0, ge=0, description="Number of reviews to skip"),
     limit: int = Query(100, ge=1, le=100, description="Number of reviews to retrieve"),
     user_id: Optional[UUID] = Query(None, description="Filter by user ID"),
@@ -246,7 +370,13 @@ def get_all_reviews(
     max_rating: Optional[int] = Query(
         None, ge=1, le=5, description="Maximum rating filter"
     ),
-    current_user: User = Depends(get_current_admin_user),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from the X-Next-Cursor header (replaces skip)"
+    ),
+    include: Optional[Literal["details"]] = Query(
+        None, description="'details' adds the booking, service and author"
+    ),
+    current_user: CurrentUser = Depends(get_current_admin_user),
     db: Session = Depends(get_db),
 ):
     """Get all reviews with filtering (admin only)"""
@@ -260,9 +390,16 @@ def get_all_reviews(
             service_id=service_id,
             min_rating=min_rating,
             max_rating=max_rating,
+            cursor=cursor,
+            with_details=include == "details",
         )
+        _set_next_cursor(response, reviews, limit)
+        if include == "details":
+            return [_with_details(review) for review in reviews]
         return [ReviewResponse.model_validate(review) for review in reviews]
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching all reviews: {str(e)}")
         raise HTTPException(
@@ -278,17 +415,26 @@ def get_all_reviews(
 )
 def get_user_reviews_admin(
     user_id: UUID,
+    response: Response,
     skip: int = Query(0, ge=0, description="Number of reviews to skip"),
     limit: int = Query(100, ge=1, le=100, description="Number of reviews to retrieve"),
-    current_user: User = Depends(get_current_admin_user),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from the X-Next-Cursor header (replaces skip)"
+    ),
+    current_user: CurrentUser = Depends(get_current_admin_user),
     db: Session = Depends(get_db),
 ):
     """Get reviews by specific user (admin only)"""
     try:
         logger.info(f"Admin {current_user.email} fetching reviews for user {user_id}")
-        reviews = review_crud.get_user_reviews(db, user_id, skip=skip, limit=limit)
+        reviews = review_crud.get_user_reviews(
+            db, user_id, skip=skip, limit=limit, cursor=cursor
+        )
+        _set_next_cursor(response, reviews, limit)
         return [ReviewResponse.model_validate(review) for review in reviews]
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching user reviews for admin: {str(e)}")
         raise HTTPException(
@@ -307,7 +453,7 @@ def get_user_reviews_admin(
 )
 def get_booking_review(
     booking_id: UUID,
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ):
     """Get review for a specific booking"""
@@ -1,39 +1,184 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from uuid import UUID
-from typing import List, Optional
-from crud.service import service_crud
-from schemas.service import ServiceCreate, ServiceUpdate, ServiceResponse
+from typing import List, Literal, Optional, Union
+from datetime import datetime, timedelta
+from crud.booking import async_booking_crud
+from crud.pagination import NEXT_CURSOR_HEADER, next_cursor
+from crud.review import async_review_crud, review_stats, review_stats_version
+from crud.service import (
+    CachedService,
+    async_service_crud,
+    cached_service_crud,
+    service_crud,
+)
+from schemas.booking import ServiceAvailability, TimeSlot
+from schemas.service import (
+    ServiceCreate,
+    ServiceUpdate,
+    ServiceResponse,
+    ServiceWithStatsResponse,
+)
 from database.database import get_db
+from database.replica import get_read_db
+from routers.http_cache import make_etag, not_modified
 from security.auth import get_current_active_user, get_current_admin_user
-from models.user import User
+from services.booking_index import to_aware_utc
+from schemas.user import CurrentUser
 from logger import get_logger
 
 service_router = APIRouter()
 logger = get_logger(__name__)
 
+# Longest window the availability endpoint will sweep in one request
+MAX_AVAILABILITY_WINDOW = timedelta(days=31)
+
+
+def _set_next_cursor(
+    response: Response,
+    services: List,
+    limit: int,
+    q: Optional[str] = None,
+    cursor: Optional[str] = None,
+) -> None:
+    # Search results are ranked by relevance and page with skip; only
+    # id-ordered pages can continue from a cursor
+    if q and not cursor:
+        return
+    next_page = next_cursor(services, limit, "id")
+    if next_page:
+        response.headers[NEXT_CURSOR_HEADER] = next_page
+
+
+async def _with_review_stats(
+    db: AsyncSession,
+    request: Request,
+    response: Response,
+    entries: List[CachedService],
+):
+    """Merge review statistics into a page of services.
+
+    Stats change with every review, not with the catalog, so they are read
+    fresh (one query for the page) rather than kept in the catalog cache.
+    """
+    aggregates = await async_review_crud.get_services_review_aggregates(
+        db, [entry.service.id for entry in entries]
+    )
+    rows = [aggregates.get(str(entry.service.id)) for entry in entries]
+    etag = make_etag(
+        "stats",
+        *(
+            f"{entry.service.id}.{entry.version}.{review_stats_version(row)}"
+            for entry, row in zip(entries, rows)
+        ),
+    )
+    return not_modified(request, response, etag) or [
+        ServiceWithStatsResponse(
+            **entry.service.model_dump(), review_stats=review_stats(row)
+        )
+        for entry, row in zip(entries, rows)
+    ]
+
+
+async def _top_rated(
+    db: AsyncSession,
+    request: Request,
+    response: Response,
+    skip: int,
+    limit: int,
+    q: Optional[str],
+    price_min: Optional[float],
+    price_max: Optional[float],
+    cursor: Optional[str],
+):
+    """A page of active services by rating score, with their review stats.
+
+    Scores move with every review, so the page is read from the score
+    index instead of the catalog cache. The stats come from the same rows.
+    """
+    services = await async_service_crud.get_active_services(
+        db=db,
+        skip=skip,
+        limit=limit,
+        q=q,
+        price_min=price_min,
+        price_max=price_max,
+        cursor=cursor,
+        top_rated=True,
+    )
+    next_page = next_cursor(services, limit, "rating_score", "id")
+    if next_page:
+        response.headers[NEXT_CURSOR_HEADER] = next_page
+    etag = make_etag(
+        "top_rated",
+        *(
+            f"{service.id}.{service.version}.{review_stats_version(service)}"
+            for service in services
+        ),
+    )
+    return not_modified(request, response, etag) or [
+        ServiceWithStatsResponse(
+            **ServiceResponse.model_validate(service).model_dump(),
+            review_stats=review_stats(service),
+        )
+        for service in services
+    ]
+
+
 # PUBLIC ENDPOINTS - Anyone can browse services
 
 
 @service_router.get(
-    "/services", response_model=List[ServiceResponse], status_code=status.HTTP_200_OK
+    "/services",
+    response_model=List[Union[ServiceWithStatsResponse, ServiceResponse]],
+    status_code=status.HTTP_200_OK,
 )
-def get_services(
+async def get_services(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0, description="Number of services to skip"),
     limit: int = Query(100, ge=1, le=100, description="Number of services to retrieve"),
     q: Optional[str] = Query(None, description="Search query for title or description"),
     price_min: Optional[float] = Query(None, ge=0, description="Minimum price filter"),
     price_max: Optional[float] = Query(None, ge=0, description="Maximum price filter"),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from the X-Next-Cursor header (replaces skip)"
+    ),
+    include: Optional[Literal["stats"]] = Query(
+        None, description="'stats' adds the review statistics of every service"
+    ),
+    sort: Optional[Literal["top_rated"]] = Query(
+        None,
+        description="'top_rated' orders by rating score, best first, with stats",
+    ),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get all active services with optional filtering (public endpoint)"""
     try:
         logger.info(f"Fetching services: skip={skip}, limit={limit}, q={q}")
-        services = service_crud.get_active_services(
-            db=db, skip=skip, limit=limit, q=q, price_min=price_min, price_max=price_max
+        if sort == "top_rated":
+            return await _top_rated(
+                db, request, response, skip, limit, q, price_min, price_max, cursor
+            )
+        entries = await cached_service_crud.get_active_services(
+            db=db,
+            skip=skip,
+            limit=limit,
+            q=q,
+            price_min=price_min,
+            price_max=price_max,
+            cursor=cursor,
         )
-        return [ServiceResponse.model_validate(service) for service in services]
+        services = [entry.service for entry in entries]
+        _set_next_cursor(response, services, limit, q, cursor)
+        if include == "stats":
+            return await _with_review_stats(db, request, response, entries)
+        etag = make_etag(*(f"{entry.service.id}.{entry.version}" for entry in entries))
+        return not_modified(request, response, etag) or services
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching services: {str(e)}")
         raise HTTPException(
@@ -47,31 +192,102 @@ def get_services(
     response_model=ServiceResponse,
     status_code=status.HTTP_200_OK,
 )
-def get_service(service_id: UUID, db: Session = Depends(get_db)):
+async def get_service(
+    service_id: UUID,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+):
     """Get service by ID (public endpoint)"""
     try:
         logger.info(f"Fetching service: {service_id}")
-        service = service_crud.get_service_by_id(db, service_id)
-        if not service:
+        # Only active services are returned by the public endpoint
+        entry = await cached_service_crud.get_active_service(db, service_id)
+        if not entry:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Service not found"
             )
+        etag = make_etag(entry.service.id, entry.version)
+        return not_modified(request, response, etag) or entry.service
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching service {service_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error occurred while fetching service",
+        )
+
+
+@service_router.get(
+    "/services/{service_id}/availability",
+    response_model=ServiceAvailability,
+    status_code=status.HTTP_200_OK,
+)
+async def get_service_availability(
+    service_id: UUID,
+    window_start: datetime = Query(
+        ..., alias="from", description="Start of the availability window"
+    ),
+    window_end: datetime = Query(
+        ..., alias="to", description="End of the availability window"
+    ),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Get free time intervals for a service within a window (public endpoint)"""
+    # Naive bounds are read as UTC, so mixed naive and offset values compare
+    window_start = to_aware_utc(window_start)
+    window_end = to_aware_utc(window_end)
+    if window_end <= window_start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'to' must be after 'from'",
+        )
+    if window_end - window_start > MAX_AVAILABILITY_WINDOW:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Availability window cannot exceed {MAX_AVAILABILITY_WINDOW.days} days",
+        )
 
-        # Only return active services for public endpoint
-        if not service.is_active:
+    try:
+        logger.info(
+            f"Fetching availability for service {service_id}: {window_start} - {window_end}"
+        )
+        service = await async_service_crud.get_service_by_id(db, service_id)
+        if not service or not service.is_active:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Service not found"
             )
 
-        return ServiceResponse.model_validate(service)
+        free_intervals = await async_booking_crud.get_free_intervals(
+            db,
+            service_id,
+            window_start,
+            window_end,
+            timedelta(minutes=service.duration_minutes),
+        )
+        return ServiceAvailability(
+            service_id=service.id,
+            window_start=window_start,
+            window_end=window_end,
+            duration_minutes=service.duration_minutes,
+            free_slots=[
+                TimeSlot(
+                    start_time=to_aware_utc(start_time),
+                    end_time=to_aware_utc(end_time),
+                )
+                for start_time, end_time in free_intervals
+            ],
+        )
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error fetching service {service_id}: {str(e)}")
+        logger.error(f"Error fetching availability for service {service_id}: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Error occurred while fetching service",
+            detail="Error occurred while fetching availability",
         )
 
 
@@ -83,7 +299,7 @@ def get_service(service_id: UUID, db: Session = Depends(get_db)):
 )
 def create_service(
     service: ServiceCreate,
-    current_user: User = Depends(get_current_admin_user),
+    current_user: CurrentUser = Depends(get_current_admin_user),
     db: Session = Depends(get_db),
 ):
     """Create a new service (admin only)"""
@@ -111,7 +327,7 @@ def create_service(
 def update_service(
     service_id: UUID,
     service_update: ServiceUpdate,
-    current_user: User = Depends(get_current_admin_user),
+    current_user: CurrentUser = Depends(get_current_admin_user),
     db: Session = Depends(get_db),
 ):
     """Update service by ID (admin only)"""
@@ -138,7 +354,7 @@ def update_service(
 )
 def delete_service(
     service_id: UUID,
-    current_user: User = Depends(get_current_admin_user),
+    current_user: CurrentUser = Depends(get_current_admin_user),
     db: Session = Depends(get_db),
 ):
     """Soft delete service by ID (admin only)"""
@@ -167,6 +383,7 @@ def delete_service(
     status_code=status.HTTP_200_OK,
 )
 def get_all_services_admin(
+    response: Response,
     skip: int = Query(0, ge=0, description="Number of services to skip"),
     limit: int = Query(100, ge=1, le=100, description="Number of services to retrieve"),
     q: Optional[str] = Query(None, description="Search query for title or description"),
@@ -174,7 +391,10 @@ def get_all_services_admin(
     price_max: Optional[float] = Query(None, ge=0, description="Maximum price filter"),
     active: Optional[bool] = Query(None, description="Filter by active status"),
     owner_id: Optional[UUID] = Query(None, description="Filter by owner ID"),
-    current_user: User = Depends(get_current_admin_user),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from the X-Next-Cursor header (replaces skip)"
+    ),
+    current_user: CurrentUser = Depends(get_current_admin_user),
     db: Session = Depends(get_db),
 ):
     """Get all services including inactive ones (admin only)"""
@@ -189,9 +409,13 @@ def get_all_services_admin(
             price_max=price_max,
             active=active,
             owner_id=owner_id,
+            cursor=cursor,
         )
+        _set_next_cursor(response, services, limit, q, cursor)
         return [ServiceResponse.model_validate(service) for service in services]
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching all services: {str(e)}")
         raise HTTPException(
@@ -207,7 +431,7 @@ def get_all_services_admin(
 )
 def get_service_admin(
     service_id: UUID,
-    current_user: User = Depends(get_current_admin_user),
+    current_user: CurrentUser = Depends(get_current_admin_user),
     db: Session = Depends(get_db),
 ):
     """Get service by ID including inactive ones (admin only)"""
@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from jose import jwt
 from uuid import UUID
-from typing import Annotated, List
+from typing import Annotated, List, Optional
 from datetime import datetime, timezone
+from crud.pagination import NEXT_CURSOR_HEADER, next_cursor
 from crud.user import user_crud
 from schemas.user import (
     UserCreate,
@@ -15,8 +17,9 @@ from schemas.user import (
     LogoutResponse,
     RefreshTokenRequest,
     RefreshTokenResponse,
+    CurrentUser,
 )
-from database.database import get_db
+from database.database import get_async_db, get_db
 from security.auth import (
     oauth2_scheme,
     get_current_user,
@@ -25,7 +28,6 @@ from security.auth import (
     authenticate_user,
 )
 from services.user import user_service
-from models.user import User
 from logger import get_logger
 
 user_router = APIRouter()
@@ -58,13 +60,14 @@ def register_user(user: UserCreate, db: Session = Depends(get_db)):
 @user_router.post("/token", response_model=LoginResponse)
 async def user_token(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     logger.info(f"Token request for user: {form_data.username}")
     user_login = UserLogin(email=form_data.username, password=form_data.password)
 
     try:
-        return user_service.login_user(db, user_login)
+        # Awaits the password hash pool, so waiting logins hold no thread
+        return await user_service.login_user(db, user_login)
     except HTTPException:
         raise
     except Exception as e:
@@ -80,11 +83,13 @@ async def user_token(
 @user_router.post(
     "/auth/login", response_model=LoginResponse, status_code=status.HTTP_200_OK
 )
-def login_user(user_login: UserLogin, db: Session = Depends(get_db)):
+async def login_user(
+    user_login: UserLogin, db: AsyncSession = Depends(get_async_db)
+):
     """Login user and return access and refresh tokens"""
     try:
         logger.info(f"Login attempt for user: {user_login.email}")
-        return user_service.login_user(db, user_login)
+        return await user_service.login_user(db, user_login)
     except HTTPException:
         raise
     except Exception as e:
@@ -100,7 +105,7 @@ def login_user(user_login: UserLogin, db: Session = Depends(get_db)):
 )
 def logout_user(
     refresh_request: RefreshTokenRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db),
 ):
@@ -161,15 +166,24 @@ def refresh_access_token(
 
 
 @user_router.get("/me", response_model=UserOut, status_code=status.HTTP_200_OK)
-def get_current_user_profile(current_user: User = Depends(get_current_active_user)):
+def get_current_user_profile(
+    current_user: CurrentUser = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+):
     """Get current user profile"""
-    return UserOut.model_validate(current_user)
+    # Token claims may be stale or lack fields, so read the profile itself
+    db_user = user_crud.get_user_id(db, current_user.id)
+    if db_user is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+        )
+    return UserOut.model_validate(db_user)
 
 
 @user_router.patch("/me", response_model=UserOut, status_code=status.HTTP_200_OK)
 def update_current_user_profile(
     user_update: UserUpdate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: CurrentUser = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ):
     """Update current user profile"""
@@ -194,15 +208,22 @@ def update_current_user_profile(
 
 @user_router.get("/users", response_model=List[UserOut], status_code=status.HTTP_200_OK)
 def get_all_users(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(get_current_admin_user),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from the X-Next-Cursor header (replaces skip)"
+    ),
+    current_user: CurrentUser = Depends(get_current_admin_user),
     db: Session = Depends(get_db),
 ):
     """Get all users (admin only)"""
     try:
         logger.info(f"Admin {current_user.email} fetching users list")
-        users = user_crud.get_users(db, skip=skip, limit=limit)
+        users = user_crud.get_users(db, skip=skip, limit=limit, cursor=cursor)
+        next_page = next_cursor(users, limit, "id")
+        if next_page:
+            response.headers[NEXT_CURSOR_HEADER] = next_page
         return [UserOut.model_validate(user) for user in users]
 
     except HTTPException:
@@ -215,12 +236,39 @@ def get_all_users(
         )
 
 
+# Declared before /users/{user_id} so "search" is not parsed as an id
+@user_router.get(
+    "/users/search", response_model=List[UserOut], status_code=status.HTTP_200_OK
+)
+def search_users(
+    q: str = Query(..., min_length=1, description="Part of a name or email"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: CurrentUser = Depends(get_current_admin_user),
+    db: Session = Depends(get_db),
+):
+    """Search users by name or email (admin only)"""
+    try:
+        logger.info(f"Admin {current_user.email} searching users: q={q}")
+        users = user_crud.search_users(db, q, skip=skip, limit=limit)
+        return [UserOut.model_validate(user) for user in users]
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error searching users: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error occurred while searching users",
+        )
+
+
 @user_router.get(
     "/users/{user_id}", response_model=UserOut, status_code=status.HTTP_200_OK
 )
 def get_user_by_id(
     user_id: UUID,
-    current_user: User = Depends(get_current_admin_user),
+    current_user: CurrentUser = Depends(get_current_admin_user),
     db: Session = Depends(get_db),
 ):
     """Get user by ID (admin only)"""
@@ -249,7 +297,7 @@ def get_user_by_id(
 def update_user_by_id(
     user_id: UUID,
     user_update: UserUpdate,
-    current_user: User = Depends(get_current_admin_user),
+    current_user: CurrentUser = Depends(get_current_admin_user),
     db: Session = Depends(get_db),
 ):
     """Update user by ID (admin only)"""
@@ -274,7 +322,7 @@ def update_user_by_id(
 )
 def delete_user_by_id(
     user_id: UUID,
-    current_user: User = Depends(get_current_admin_user),
+    current_user: CurrentUser = Depends(get_current_admin_user),
     db: Session = Depends(get_db),
 ):
     """Soft delete user by ID (admin only)"""
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, field_validator, model_validator
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 from datetime import datetime, timezone
 from enum import Enum
@@ -64,4 +64,15 @@ class BookingWithDetails(BookingResponse):
     user: Optional[dict] = None
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class TimeSlot(BaseModel):
+    start_time: datetime
+    end_time: datetime
+
+class ServiceAvailability(BaseModel):
+    service_id: UUID
+    window_start: datetime
+    window_end: datetime
+    duration_minutes: int
+    free_slots: List[TimeSlot]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, field_validator
-from typing import Optional
+from typing import Dict, Optional
 from uuid import UUID
 from datetime import datetime, timezone
 
@@ -48,3 +48,18 @@ class ReviewWithDetails(ReviewResponse):
 
     class Config:
         from_attributes = True
+
+
+class ReviewStats(BaseModel):
+    total_reviews: int
+    average_rating: float
+    min_rating: int
+    max_rating: int
+    # Bayesian average used by the top rated listing
+    rating_score: float
+    # Number of reviews with each rating from 1 to 5
+    rating_histogram: Dict[int, int]
+
+
+class ServiceReviewStats(ReviewStats):
+    service_id: UUID
@@ -2,6 +2,7 @@ from pydantic import BaseModel, Field
 from typing import Optional
 from uuid import UUID
 from datetime import datetime, timezone
+from schemas.review import ReviewStats
 
 
 class ServiceBase(BaseModel):
@@ -34,3 +35,9 @@ class ServiceResponse(ServiceBase):
 
     class Config:
         from_attributes = True
+
+
+class ServiceWithStatsResponse(ServiceResponse):
+    """Service with its review statistics, for listings with include=stats"""
+
+    review_stats: ReviewStats
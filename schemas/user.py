@@ -30,6 +30,21 @@ class UserOut(UserBase):
         from_attributes = True
 
 
+class CurrentUser(BaseModel):
+    """Slim snapshot of the authenticated user, safe to cache between requests"""
+
+    id: str
+    name: str
+    email: str
+    role: str
+    status: str
+    is_active: bool
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
 class UserUpdate(BaseModel):
     email: Optional[EmailStr] = None
     name: Optional[str] = None
@@ -0,0 +1,214 @@
+"""Compare response encoding with the stdlib JSONResponse and FastJSONResponse.
+
+Serves the same routers from two in-process apps that differ only in their
+default response class, sends interleaved requests to list endpoints
+returning 100 items, and reports p50/p99 latency per endpoint and encoder,
+together with the time spent rendering the body alone. Seeds a throwaway
+SQLite database unless --database-url points at one that already has
+data (give --user-email of a user with bookings and reviews).
+
+    python scripts/bench_json.py --requests 500
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+ITEMS = 100
+
+
+def seed(user_email: str) -> None:
+    """Create the schema and 100 services, bookings and reviews"""
+    import main  # noqa: F401  (registers every model)
+    from database.database import Base, SessionLocal, get_engine
+    from models.booking import Booking
+    from models.review import Review
+    from models.service import Service
+    from models.user import User
+
+    Base.metadata.create_all(get_engine())
+    db = SessionLocal()
+    owner = User(
+        id=str(uuid.uuid4()),
+        name="Bench Owner",
+        email="bench-owner@example.com",
+        password_hash="not-a-real-hash",
+        role="admin",
+    )
+    user = User(
+        id=str(uuid.uuid4()),
+        name="Bench Usér",
+        email=user_email,
+        password_hash="not-a-real-hash",
+        role="user",
+    )
+    db.add_all([owner, user])
+    services = [
+        Service(
+            id=str(uuid.uuid4()),
+            title=f"Service {index} — café cleaning",
+            description="Professional cleaning of homes and offices " * 3,
+            price=Decimal("49.99") + index,
+            duration_minutes=90,
+            owner_id=owner.id,
+        )
+        for index in range(ITEMS)
+    ]
+    db.add_all(services)
+    # Every booking is for the first service, so its review list is full
+    start = datetime(2026, 1, 1, 9, tzinfo=timezone.utc)
+    for index in range(ITEMS):
+        booking = Booking(
+            id=str(uuid.uuid4()),
+            user_id=user.id,
+            service_id=services[0].id,
+            start_time=start + timedelta(days=index),
+            end_time=start + timedelta(days=index, hours=2),
+            status="completed",
+        )
+        review = Review(
+            id=str(uuid.uuid4()),
+            booking_id=booking.id,
+            rating=1 + index % 5,
+            comment="Great service, would book again. " * 4,
+        )
+        db.add_all([booking, review])
+    db.commit()
+    db.close()
+
+
+def build_app(response_class):
+    from fastapi import FastAPI
+    import main
+
+    bench_app = FastAPI(default_response_class=response_class)
+    bench_app.user_middleware = list(main.app.user_middleware)
+    for router in (
+        main.user_router,
+        main.service_router,
+        main.booking_router,
+        main.review_router,
+    ):
+        bench_app.include_router(router, prefix="/api")
+    return bench_app
+
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def run(args) -> None:
+    import httpx
+    from fastapi.responses import JSONResponse
+    from sqlalchemy import select
+    from database.database import SessionLocal, dispose_engines, get_engine
+    from models.booking import Booking
+    from models.user import User
+    from routers.json_response import FastJSONResponse
+    from security.auth import create_access_token
+
+    get_engine()
+    db = SessionLocal()
+    user = db.scalars(select(User).filter(User.email == args.user_email)).one()
+    service_id = db.scalars(
+        select(Booking.service_id).filter(Booking.user_id == user.id)
+    ).first()
+    db.close()
+    token, _ = create_access_token(
+        data={"sub": str(user.id)}, expires_delta=timedelta(hours=1)
+    )
+    headers = {"Authorization": f"Bearer {token}"}
+    paths = {
+        "/api/services": f"/api/services?limit={ITEMS}",
+        "/api/bookings": f"/api/bookings?limit={ITEMS}",
+        "/api/users/me/reviews": f"/api/users/me/reviews?limit={ITEMS}",
+        "/api/services/{id}/reviews": (
+            f"/api/services/{service_id}/reviews?limit={ITEMS}"
+        ),
+    }
+    encoders = {
+        "json (stdlib)": JSONResponse,
+        "orjson": FastJSONResponse,
+    }
+    clients = {
+        name: httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=build_app(response_class)),
+            base_url="http://bench",
+            headers=headers,
+        )
+        for name, response_class in encoders.items()
+    }
+    latencies = {(path, name): [] for path in paths.values() for name in encoders}
+    bodies = {}
+    for round_ in range(args.warmup + args.requests):
+        for path in paths.values():
+            # Alternate which encoder goes first so neither gains from order
+            names = list(clients) if round_ % 2 else list(reversed(clients))
+            for name in names:
+                started = time.perf_counter()
+                response = await clients[name].get(path)
+                elapsed = time.perf_counter() - started
+                response.raise_for_status()
+                if round_ >= args.warmup:
+                    latencies[(path, name)].append(elapsed * 1000)
+                bodies[(path, name)] = response.content
+    for client in clients.values():
+        await client.aclose()
+    await dispose_engines()
+
+    print(f"{args.requests} requests per endpoint and encoder, {ITEMS} items each")
+    print(
+        f"{'endpoint':<28} {'encoder':<14} {'p50 ms':>8} {'p99 ms':>8}"
+        f" {'render ms':>10} {'bytes':>7}"
+    )
+    for label, path in paths.items():
+        stdlib_body, orjson_body = (bodies[(path, name)] for name in encoders)
+        same = "identical" if stdlib_body == orjson_body else "DIFFERENT"
+        content = json.loads(stdlib_body)
+        for name, response_class in encoders.items():
+            values = latencies[(path, name)]
+            render_started = time.perf_counter()
+            for _ in range(args.render_runs):
+                response_class(content)
+            render = (time.perf_counter() - render_started) / args.render_runs
+            print(
+                f"{label:<28} {name:<14}"
+                f" {statistics.median(values):8.2f} {percentile(values, 0.99):8.2f}"
+                f" {render * 1000:10.3f} {len(bodies[(path, name)]):7d}"
+            )
+        print(f"{'':<28} bodies {same}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--render-runs", type=int, default=200)
+    parser.add_argument("--database-url")
+    parser.add_argument("--user-email", default="bench-user@example.com")
+    args = parser.parse_args()
+
+    database_url = args.database_url
+    if database_url is None:
+        path = os.path.join(tempfile.mkdtemp(), "bench_json.db")
+        database_url = f"sqlite:///{path}"
+    os.environ["DATABASE_URL"] = database_url
+    if args.database_url is None:
+        seed(args.user_email)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
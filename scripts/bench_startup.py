@@ -0,0 +1,76 @@
+"""Measure how long a fresh worker takes to become ready.
+
+Each run starts a new interpreter, imports ``main``, runs the app lifespan
+startup and serves one request in-process, timing every phase. Point
+DATABASE_URL at the database to measure against.
+
+    python scripts/bench_startup.py --runs 10 --path /api/services
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WORKER = """
+import asyncio, json, sys, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+
+async def run():
+    import httpx
+    async with main.app.router.lifespan_context(main.app):
+        ready = time.perf_counter()
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            response = await client.get(sys.argv[1])
+        served = time.perf_counter()
+    return ready, served, response.status_code
+
+ready, served, status_code = asyncio.run(run())
+print(json.dumps({
+    "import": imported - started,
+    "startup": ready - imported,
+    "first_request": served - ready,
+    "ready": ready - started,
+    "status": status_code,
+}))
+"""
+
+
+def run_once(path: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", WORKER, path],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--path", default="/api/services")
+    args = parser.parse_args()
+
+    samples = [run_once(args.path) for _ in range(args.runs)]
+    print(f"{args.runs} runs, request GET {args.path}")
+    for phase in ("import", "startup", "first_request", "ready"):
+        values = [sample[phase] * 1000 for sample in samples]
+        print(
+            f"{phase:>14}: median {statistics.median(values):8.1f} ms"
+            f"  min {min(values):8.1f} ms  max {max(values):8.1f} ms"
+        )
+    statuses = sorted({sample["status"] for sample in samples})
+    print(f"{'status':>14}: {statuses}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Measure the memory of each gunicorn worker, with and without preloading.
+
+Starts gunicorn with gunicorn.conf.py, sends some requests so every worker
+has handled traffic and run its garbage collector, then reads RSS, PSS and
+private memory of the master and every worker from /proc (Linux only).
+PSS splits shared pages between the processes using them, so its sum is
+the real footprint. Point DATABASE_URL at the database to use.
+
+    python scripts/measure_worker_rss.py --workers 4 --compare
+"""
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIELDS = ("Rss", "Pss", "Private_Clean", "Private_Dirty")
+
+
+def memory_kb(pid: int) -> dict:
+    """Memory counters of a process from /proc/<pid>/smaps_rollup"""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as rollup:
+        for line in rollup:
+            name, _, rest = line.partition(":")
+            if name in FIELDS:
+                values[name] = int(rest.split()[0])
+    values["Private"] = values.pop("Private_Clean") + values.pop("Private_Dirty")
+    return values
+
+
+def worker_pids(master_pid: int) -> list:
+    with open(f"/proc/{master_pid}/task/{master_pid}/children") as children:
+        return [int(pid) for pid in children.read().split()]
+
+
+def wait_for_workers(master_pid: int, workers: int, url: str, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if len(worker_pids(master_pid)) == workers:
+            try:
+                urllib.request.urlopen(url, timeout=1).read()
+                return
+            except OSError:
+                pass
+        time.sleep(0.2)
+    raise RuntimeError(f"gunicorn did not start {workers} workers in {timeout}s")
+
+
+def measure(preload: bool, workers: int, port: int, requests: int, path: str) -> dict:
+    env = dict(
+        os.environ,
+        GUNICORN_PRELOAD=str(preload).lower(),
+        WEB_CONCURRENCY=str(workers),
+        PORT=str(port),
+    )
+    started = time.perf_counter()
+    master = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "main:app"],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        url = f"http://127.0.0.1:{port}{path}"
+        wait_for_workers(master.pid, workers, url, timeout=60)
+        ready_seconds = time.perf_counter() - started
+        for _ in range(requests):
+            urllib.request.urlopen(url, timeout=5).read()
+        return {
+            "ready_seconds": ready_seconds,
+            "master": memory_kb(master.pid),
+            "workers": [memory_kb(pid) for pid in worker_pids(master.pid)],
+        }
+    finally:
+        master.send_signal(signal.SIGTERM)
+        master.wait(timeout=30)
+
+
+def report(label: str, result: dict) -> None:
+    workers = result["workers"]
+    print(f"{label}: all workers ready after {result['ready_seconds']:.2f}s")
+    print(f"{'process':>10} {'RSS MiB':>9} {'PSS MiB':>9} {'private MiB':>12}")
+    rows = [("master", result["master"])] + [
+        (f"worker {index}", memory) for index, memory in enumerate(workers)
+    ]
+    for name, memory in rows:
+        print(
+            f"{name:>10} {memory['Rss'] / 1024:9.1f} {memory['Pss'] / 1024:9.1f}"
+            f" {memory['Private'] / 1024:12.1f}"
+        )
+    total_pss = sum(memory["Pss"] for _, memory in rows) / 1024
+    private = sum(memory["Private"] for memory in workers) / len(workers) / 1024
+    print(f"total PSS {total_pss:.1f} MiB, private per worker {private:.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--path", default="/")
+    parser.add_argument(
+        "--compare", action="store_true", help="also measure without preloading"
+    )
+    args = parser.parse_args()
+
+    modes = [True, False] if args.compare else [True]
+    for preload in modes:
+        result = measure(preload, args.workers, args.port, args.requests, args.path)
+        report("preload + gc.freeze" if preload else "no preload", result)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Backfill or repair the review aggregates stored on services.
+
+Recomputes review_count, rating_sum and the rating histogram from the
+reviews for every service whose stored values differ, which the API also
+does every REVIEW_RECONCILE_INTERVAL_SECONDS. Point DATABASE_URL at the
+database to repair. Exits with status 1 if the run fails.
+
+    python scripts/reconcile_review_aggregates.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import app  # noqa: E402,F401  (registers every model)
+from services.background import run_with_session  # noqa: E402
+from services.review_aggregates import (  # noqa: E402
+    reconcile_stats,
+    review_aggregate_service,
+)
+
+
+def main() -> int:
+    try:
+        run_with_session(review_aggregate_service.reconcile)
+    except Exception as e:
+        print(
+            f"failed after repairing {reconcile_stats['last_services_fixed']} "
+            f"services: {e}",
+            file=sys.stderr,
+        )
+        return 1
+    print(
+        f"repaired {reconcile_stats['last_services_fixed']} services in "
+        f"{reconcile_stats['last_duration_seconds']:.3f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,8 @@
+import asyncio
 import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from jose import jwt
 from datetime import datetime, timedelta, timezone
 from typing import Optional
@@ -7,9 +11,14 @@ from dotenv import load_dotenv
 from passlib.context import CryptContext
 from fastapi import HTTPException, Depends, status
 from fastapi.security import OAuth2PasswordBearer, HTTPBearer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from models.user import User
+from schemas.user import CurrentUser
 from database.database import get_db
+from security.token_cache import token_cache
+from security.session_epoch import session_epochs
 
 load_dotenv()
 
@@ -17,18 +26,134 @@ SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES"))
 REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS"))
+# Authorize access tokens from their claims and the user's session epoch
+# instead of loading the user and checking the JTI blacklist. A logout,
+# password change or deletion in another worker is seen there once both its
+# session epoch cache and its token cache have expired, so a revoked token
+# can be accepted for up to SESSION_EPOCH_TTL_SECONDS +
+# TOKEN_CACHE_TTL_SECONDS.
+STATELESS_AUTH = os.getenv("STATELESS_AUTH", "false").lower() == "true"
+# Profile claims access tokens carry only in stateless mode
+STATELESS_CLAIMS = ("name", "email", "status", "is_active")
+PASSWORD_HASH_WORKERS = int(
+    os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1)))
+)
+PASSWORD_HASH_MAX_QUEUE = int(
+    os.getenv("PASSWORD_HASH_MAX_QUEUE", str(PASSWORD_HASH_WORKERS * 8))
+)
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/token")
 
 
+class PasswordHashPool:
+    """Size-limited thread pool for bcrypt work.
+
+    bcrypt releases the GIL, so a few dedicated threads hash in parallel.
+    Login handlers run on the event loop and await the job with
+    ``run_async``, so a login burst holds neither the loop nor request
+    threads; sync callers such as registration block on ``run``. Work
+    beyond ``max_queue`` waiting jobs is rejected with 503 instead of
+    piling up behind a burst.
+    """
+
+    def __init__(
+        self,
+        workers: int = PASSWORD_HASH_WORKERS,
+        max_queue: int = PASSWORD_HASH_MAX_QUEUE,
+    ):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hash"
+        )
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.total_wait_seconds = 0.0
+
+    def _submit(self, func, *args) -> Future:
+        """Queue a job, or raise 503 if the queue is full"""
+        with self._lock:
+            if self.in_flight >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many concurrent authentication requests",
+                    headers={"Retry-After": "1"},
+                )
+            self.in_flight += 1
+        submitted_at = time.perf_counter()
+        waited = []
+
+        def task():
+            waited.append(time.perf_counter() - submitted_at)
+            return func(*args)
+
+        def finish(future: Future) -> None:
+            # Jobs cancelled before they started (the client went away)
+            # count as neither completed nor failed
+            with self._lock:
+                self.in_flight -= 1
+                if future.cancelled():
+                    return
+                if future.exception() is not None:
+                    self.failed += 1
+                else:
+                    self.completed += 1
+                    self.total_wait_seconds += waited[0]
+
+        try:
+            future = self._executor.submit(task)
+        except BaseException:
+            with self._lock:
+                self.in_flight -= 1
+            raise
+        future.add_done_callback(finish)
+        return future
+
+    def run(self, func, *args):
+        """Run a job and block the calling thread until it is done"""
+        return self._submit(func, *args).result()
+
+    async def run_async(self, func, *args):
+        """Run a job without blocking the event loop"""
+        return await asyncio.wrap_future(self._submit(func, *args))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "in_flight": self.in_flight,
+                "queue_depth": max(0, self.in_flight - self.workers),
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "avg_wait_seconds": (
+                    self.total_wait_seconds / self.completed if self.completed else 0.0
+                ),
+            }
+
+
+password_hash_pool = PasswordHashPool()
+
+
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hash_pool.run(pwd_context.verify, plain_password, hashed_password)
+
+
+async def verify_password_async(plain_password, hashed_password):
+    return await password_hash_pool.run_async(
+        pwd_context.verify, plain_password, hashed_password
+    )
 
 
 def get_password_hash(password):
-    return pwd_context.hash(password)
+    return password_hash_pool.run(pwd_context.hash, password)
 
 
 def authenticate_user(db: Session, email: str, password: str):
@@ -47,6 +172,38 @@ def authenticate_user(db: Session, email: str, password: str):
     return user
 
 
+async def authenticate_user_async(db: AsyncSession, email: str, password: str):
+    """authenticate_user for handlers running on the event loop"""
+    user = (
+        await db.scalars(
+            select(User).filter(User.email == email, User.is_active == True)
+        )
+    ).first()
+    if not user or not await verify_password_async(password, user.password_hash):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
+
+
+def access_token_claims(user: User) -> dict:
+    """Claims of a user's access token.
+
+    In stateless mode they include the profile fields needed to authorize a
+    request without the user row; otherwise tokens do not expose them.
+    """
+    claims = {
+        "sub": str(user.id),
+        "role": user.role,
+        "sep": user.session_epoch or 0,
+    }
+    if STATELESS_AUTH:
+        claims.update({claim: getattr(user, claim) for claim in STATELESS_CLAIMS})
+    return claims
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -127,7 +284,12 @@ def verify_refresh_token(token: str, db: Session) -> User:
 
 def get_current_user(
     token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
-):
+) -> CurrentUser:
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached.user
+    generation = token_cache.generation
+
     credentials_exception = HTTPException(
         status_code=401,
         detail="Could not validate credentials",
@@ -145,7 +307,11 @@ def get_current_user(
         # Check if token is blacklisted
         from services.token_blacklist import token_blacklist_service
 
-        if token_blacklist_service.is_token_blacklisted(db, jti):
+        # Tokens issued before stateless mode was enabled take the full path
+        stateless = STATELESS_AUTH and all(
+            claim in payload for claim in ("sep",) + STATELESS_CLAIMS
+        )
+        if not stateless and token_blacklist_service.is_token_blacklisted(db, jti):
             raise HTTPException(
                 status_code=401,
                 detail="Token has been revoked",
@@ -155,13 +321,35 @@ def get_current_user(
     except jwt.JWTError:
         raise credentials_exception
 
+    if stateless:
+        epoch = session_epochs.get(db, user_id)
+        if epoch is None or payload["sep"] != epoch:
+            raise HTTPException(
+                status_code=401,
+                detail="Token has been revoked",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        current_user = CurrentUser(
+            id=user_id,
+            name=payload["name"],
+            email=payload["email"],
+            role=payload["role"],
+            status=payload["status"],
+            is_active=payload["is_active"],
+        )
+        token_cache.set(token, payload, current_user, generation)
+        return current_user
+
     user = db.query(User).filter(User.id == user_id, User.is_active == True).first()
     if user is None:
         raise credentials_exception
-    return user
+
+    current_user = CurrentUser.model_validate(user)
+    token_cache.set(token, payload, current_user, generation)
+    return current_user
 
 
-def get_current_active_user(current_user: User = Depends(get_current_user)):
+def get_current_active_user(current_user: CurrentUser = Depends(get_current_user)):
     """Get current user and ensure they are active (not logged out)"""
     if current_user.status != "active":
         raise HTTPException(
@@ -170,7 +358,9 @@ def get_current_active_user(current_user: User = Depends(get_current_user)):
     return current_user
 
 
-def get_current_admin_user(current_user: User = Depends(get_current_active_user)):
+def get_current_admin_user(
+    current_user: CurrentUser = Depends(get_current_active_user),
+):
     """Get current user and ensure they are admin"""
     if current_user.role != "admin":
         raise HTTPException(
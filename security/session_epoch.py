@@ -0,0 +1,83 @@
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from dotenv import load_dotenv
+from sqlalchemy.orm import Session
+from models.user import User
+
+load_dotenv()
+
+SESSION_EPOCH_TTL_SECONDS = float(os.getenv("SESSION_EPOCH_TTL_SECONDS", "10"))
+SESSION_EPOCH_MAX_SIZE = int(os.getenv("SESSION_EPOCH_MAX_SIZE", "100000"))
+
+
+class SessionEpochCache:
+    """Per-process cache of each user's current session epoch.
+
+    Stateless access tokens carry the epoch they were issued under and stop
+    being accepted once it is bumped. Bumps in this process take effect
+    immediately; bumps in other workers within SESSION_EPOCH_TTL_SECONDS.
+    A missing or deactivated user is cached as None.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = SESSION_EPOCH_TTL_SECONDS,
+        max_size: int = SESSION_EPOCH_MAX_SIZE,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: Dict[str, Tuple[Optional[int], float]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, db: Session, user_id: str) -> Optional[int]:
+        """Current epoch of an active user, or None if there is no such user"""
+        user_id = str(user_id)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[1] > now:
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        row = (
+            db.query(User.session_epoch)
+            .filter(User.id == user_id, User.is_active == True)
+            .first()
+        )
+        epoch = (row[0] or 0) if row is not None else None
+        with self._lock:
+            if len(self._entries) >= self.max_size:
+                self._entries = {
+                    key: value for key, value in self._entries.items() if value[1] > now
+                }
+                if len(self._entries) >= self.max_size:
+                    self._entries.clear()
+            self._entries[user_id] = (epoch, now + self.ttl_seconds)
+        return epoch
+
+    def invalidate(self, user_id) -> None:
+        with self._lock:
+            self._entries.pop(str(user_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+session_epochs = SessionEpochCache()
@@ -0,0 +1,134 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional, Set
+from dotenv import load_dotenv
+from schemas.user import CurrentUser
+
+load_dotenv()
+
+TOKEN_CACHE_TTL_SECONDS = float(os.getenv("TOKEN_CACHE_TTL_SECONDS", "30"))
+TOKEN_CACHE_MAX_SIZE = int(os.getenv("TOKEN_CACHE_MAX_SIZE", "10000"))
+
+
+class CachedToken(NamedTuple):
+    claims: dict
+    user: CurrentUser
+    expires_at: float
+
+
+class TokenCache:
+    """Bounded TTL/LRU cache of verified access tokens.
+
+    Entries are keyed by a SHA-256 digest of the raw token rather than its
+    ``jti``: the jti is readable by anyone holding a token, so only an exact
+    match of an already verified token may skip verification. Entries never
+    outlive the token's ``exp`` and are dropped when the user logs out or is
+    updated or deleted in this process; other workers pick up such changes
+    within TOKEN_CACHE_TTL_SECONDS.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = TOKEN_CACHE_TTL_SECONDS,
+        max_size: int = TOKEN_CACHE_MAX_SIZE,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, CachedToken]" = OrderedDict()
+        self._keys_by_user: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        # Bumped on every invalidation so lookups that started before it do
+        # not re-insert stale data
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_size > 0
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[CachedToken]:
+        if not self.enabled:
+            return None
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires_at <= time.time():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(
+        self, token: str, claims: dict, user: CurrentUser, generation: int
+    ) -> None:
+        """Cache a verified token unless an invalidation happened meanwhile"""
+        if not self.enabled:
+            return
+        expires_at = time.time() + self.ttl_seconds
+        if claims.get("exp"):
+            expires_at = min(expires_at, float(claims["exp"]))
+        key = self._key(token)
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._remove(key)
+            self._entries[key] = CachedToken(claims, user, expires_at)
+            self._keys_by_user.setdefault(user.id, set()).add(key)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate_user(self, user_id) -> None:
+        """Drop every cached token of a user"""
+        with self._lock:
+            self.generation += 1
+            self.invalidations += 1
+            for key in self._keys_by_user.pop(str(user_id), set()):
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            keys = self._keys_by_user.get(entry.user.id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_user[entry.user.id]
+
+
+token_cache = TokenCache()
@@ -0,0 +1,29 @@
+import asyncio
+from typing import Callable
+from sqlalchemy.orm import Session
+from database.database import SessionLocal, get_engine
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def run_with_session(job: Callable[[Session], object]) -> None:
+    """Run a job with its own database session"""
+    get_engine()
+    db = SessionLocal()
+    try:
+        job(db)
+    finally:
+        db.close()
+
+
+async def run_periodically(
+    name: str, interval_seconds: float, job: Callable[[Session], object]
+) -> None:
+    """Run a blocking database job every ``interval_seconds`` until cancelled"""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await asyncio.to_thread(run_with_session, job)
+        except Exception as e:
+            logger.error(f"Background job {name} failed: {str(e)}")
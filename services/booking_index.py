@@ -0,0 +1,197 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+from dotenv import load_dotenv
+from sqlalchemy.orm import Session
+from models.booking import Booking
+from logger import get_logger
+
+load_dotenv()
+
+logger = get_logger(__name__)
+
+# Answer "no conflict" from memory instead of querying. Without the
+# PostgreSQL exclusion constraint, a booking made by another worker is only
+# seen once this worker reloads the service, so enable it there only with a
+# single worker.
+BOOKING_INDEX_ENABLED = os.getenv("BOOKING_INDEX_ENABLED", "false").lower() == "true"
+BOOKING_INDEX_TTL_SECONDS = float(os.getenv("BOOKING_INDEX_TTL_SECONDS", "30"))
+BOOKING_INDEX_MAX_SERVICES = int(os.getenv("BOOKING_INDEX_MAX_SERVICES", "1000"))
+
+ACTIVE_STATUSES = ("pending", "confirmed")
+
+
+def to_naive_utc(value: datetime) -> datetime:
+    """Bookings are stored as naive UTC; normalize aware datetimes to match"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def to_aware_utc(value: datetime) -> datetime:
+    """Aware UTC datetime; naive values are taken to be UTC already"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+class _ServiceIntervals:
+    """Active bookings of one service as a list sorted by start time.
+
+    ``max_ends[i]`` is the latest end among ``entries[:i + 1]``. Active
+    bookings should not overlap each other, but a missed sync or a write by
+    another worker can leave overlapping entries until the next reload, so
+    lookups do not rely on it.
+    """
+
+    def __init__(self, rows: List[Tuple[datetime, datetime, str]]):
+        self.entries = sorted(rows)
+        self.starts = [entry[0] for entry in self.entries]
+        self.max_ends = []
+        self.by_id = {entry[2]: entry for entry in self.entries}
+        self._update_max_ends(0)
+        self.loaded_at = time.monotonic()
+
+    def add(self, start: datetime, end: datetime, booking_id: str) -> None:
+        entry = (start, end, booking_id)
+        position = bisect_left(self.entries, entry)
+        self.entries.insert(position, entry)
+        self.starts.insert(position, start)
+        self.by_id[booking_id] = entry
+        self._update_max_ends(position)
+
+    def remove(self, booking_id: str) -> None:
+        entry = self.by_id.pop(booking_id, None)
+        if entry is None:
+            return
+        position = bisect_left(self.entries, entry)
+        del self.entries[position]
+        del self.starts[position]
+        self._update_max_ends(position)
+
+    def _update_max_ends(self, position: int) -> None:
+        del self.max_ends[position:]
+        latest = self.max_ends[-1] if self.max_ends else None
+        for _, end, _ in self.entries[position:]:
+            if latest is None or end > latest:
+                latest = end
+            self.max_ends.append(latest)
+
+    def overlaps(
+        self, start: datetime, end: datetime, exclude_booking_id: Optional[str]
+    ) -> bool:
+        # Entries before `position` start before the new booking ends; walk
+        # back from there until none of the remaining ones ends after the
+        # new start. Without overlapping entries that is one or two steps.
+        position = bisect_left(self.starts, end)
+        for candidate in range(position - 1, -1, -1):
+            if self.max_ends[candidate] <= start:
+                return False
+            _, entry_end, booking_id = self.entries[candidate]
+            if entry_end > start and booking_id != exclude_booking_id:
+                return True
+        return False
+
+
+class BookingIntervalIndex:
+    """Per-process index of active booking intervals, keyed by service.
+
+    Services are loaded lazily on their first conflict check and reloaded
+    after BOOKING_INDEX_TTL_SECONDS so changes made by other workers are
+    picked up. Overlaps it reports are confirmed against the database.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = BOOKING_INDEX_ENABLED,
+        ttl_seconds: float = BOOKING_INDEX_TTL_SECONDS,
+        max_services: int = BOOKING_INDEX_MAX_SERVICES,
+    ):
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self.max_services = max_services
+        self._services: "OrderedDict[str, _ServiceIntervals]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def has_conflict(
+        self,
+        db: Session,
+        service_id: str,
+        start_time: datetime,
+        end_time: datetime,
+        exclude_booking_id: Optional[str] = None,
+    ) -> bool:
+        """Check if an active booking of the service overlaps the given range"""
+        service_id = str(service_id)
+        with self._lock:
+            intervals = self._services.get(service_id)
+            if intervals is not None and not self._is_expired(intervals):
+                self._services.move_to_end(service_id)
+                return intervals.overlaps(
+                    to_naive_utc(start_time), to_naive_utc(end_time), exclude_booking_id
+                )
+
+        intervals = self._load(db, service_id)
+        with self._lock:
+            self._services[service_id] = intervals
+            self._services.move_to_end(service_id)
+            while len(self._services) > self.max_services:
+                self._services.popitem(last=False)
+            return intervals.overlaps(
+                to_naive_utc(start_time), to_naive_utc(end_time), exclude_booking_id
+            )
+
+    def sync(self, booking: Booking) -> None:
+        """Reflect a created or updated booking in the index"""
+        with self._lock:
+            intervals = self._services.get(str(booking.service_id))
+            if intervals is None:
+                return
+            intervals.remove(str(booking.id))
+            if booking.status in ACTIVE_STATUSES:
+                intervals.add(
+                    to_naive_utc(booking.start_time),
+                    to_naive_utc(booking.end_time),
+                    str(booking.id),
+                )
+
+    def discard(self, service_id: str, booking_id: str) -> None:
+        """Remove a deleted booking from the index"""
+        with self._lock:
+            intervals = self._services.get(str(service_id))
+            if intervals is not None:
+                intervals.remove(str(booking_id))
+
+    def invalidate(self, service_id: str) -> None:
+        """Drop the intervals of a service so the next check reloads them"""
+        with self._lock:
+            self._services.pop(str(service_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._services.clear()
+
+    def _is_expired(self, intervals: _ServiceIntervals) -> bool:
+        return time.monotonic() - intervals.loaded_at > self.ttl_seconds
+
+    @staticmethod
+    def _load(db: Session, service_id: str) -> _ServiceIntervals:
+        rows = (
+            db.query(Booking.start_time, Booking.end_time, Booking.id)
+            .filter(
+                Booking.service_id == service_id,
+                Booking.status.in_(ACTIVE_STATUSES),
+            )
+            .all()
+        )
+        logger.info(f"Loaded {len(rows)} active bookings for service {service_id}")
+        return _ServiceIntervals(
+            [(to_naive_utc(start), to_naive_utc(end), str(id_)) for start, end, id_ in rows]
+        )
+
+
+booking_interval_index = BookingIntervalIndex()
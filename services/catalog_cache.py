@@ -0,0 +1,147 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Tuple
+from dotenv import load_dotenv
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from models.catalog_version import CatalogVersion
+
+load_dotenv()
+
+# Entries kept per worker; 0 disables the cache
+CATALOG_CACHE_MAX_SIZE = int(os.getenv("CATALOG_CACHE_MAX_SIZE", "1000"))
+# Longest an entry is served without looking at the catalog version again;
+# bounds how stale other workers' writes can appear
+CATALOG_CACHE_TTL_SECONDS = float(os.getenv("CATALOG_CACHE_TTL_SECONDS", "30"))
+# true: read the catalog version (one primary-key lookup) on every cached
+# request, so writes in other workers are seen immediately
+CATALOG_CACHE_VERSION_CHECK = (
+    os.getenv("CATALOG_CACHE_VERSION_CHECK", "false").lower() == "true"
+)
+
+CATALOG_VERSION_ID = 1
+
+# Returned by CatalogCache.get for keys that are not cached
+MISSING = object()
+
+
+def bump_catalog_version(db: Session) -> int:
+    """Increment the catalog version in the caller's transaction"""
+    version = db.execute(
+        update(CatalogVersion)
+        .where(CatalogVersion.id == CATALOG_VERSION_ID)
+        .values(version=CatalogVersion.version + 1)
+        .returning(CatalogVersion.version)
+    ).scalar()
+    if version is None:
+        # The migration seeds the row; databases built with create_all lack it
+        db.execute(insert(CatalogVersion).values(id=CATALOG_VERSION_ID, version=1))
+        version = 1
+    return version
+
+
+async def read_catalog_version(db: AsyncSession) -> int:
+    version = await db.scalar(
+        select(CatalogVersion.version).where(CatalogVersion.id == CATALOG_VERSION_ID)
+    )
+    return version or 0
+
+
+class CatalogCache:
+    """Bounded LRU cache of public service catalog responses.
+
+    Every entry is tagged with the catalog version it was read under and is
+    only served while that is still the version this process knows about.
+    Service writes in this process advance the version at once. Writes in
+    other workers are seen on the next lookup with
+    CATALOG_CACHE_VERSION_CHECK, and otherwise once the entry expires after
+    CATALOG_CACHE_TTL_SECONDS.
+    """
+
+    def __init__(
+        self,
+        max_size: int = CATALOG_CACHE_MAX_SIZE,
+        ttl_seconds: float = CATALOG_CACHE_TTL_SECONDS,
+        version_check: bool = CATALOG_CACHE_VERSION_CHECK,
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.version_check = version_check
+        self.version = 0
+        self._entries: "OrderedDict[Hashable, Tuple[int, float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.version_changes = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    async def current_version(self, db: AsyncSession) -> int:
+        """Catalog version to read under, checking the database if configured"""
+        if self.version_check:
+            self.observe_version(await read_catalog_version(db))
+        return self.version
+
+    def get(self, key: Hashable, version: int) -> Any:
+        """Cached value for ``key``, or MISSING"""
+        if not self.enabled:
+            return MISSING
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version or entry[1] <= time.monotonic():
+                self.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def set(self, key: Hashable, value: Any, version: int) -> None:
+        """Cache a value read under ``version`` unless the catalog moved on"""
+        if not self.enabled:
+            return
+        with self._lock:
+            if version != self.version:
+                return
+            self._entries[key] = (version, time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def observe_version(self, version: int) -> None:
+        """Drop every entry once the catalog version changes"""
+        with self._lock:
+            if version == self.version:
+                return
+            self.version = version
+            self.version_changes += 1
+            self._entries.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "version_check": self.version_check,
+                "version": self.version,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "version_changes": self.version_changes,
+            }
+
+
+catalog_cache = CatalogCache()
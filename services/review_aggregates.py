@@ -0,0 +1,206 @@
+import os
+import time
+from datetime import datetime, timezone
+from dotenv import load_dotenv
+from sqlalchemy import Select, case, func, or_, select, update
+from sqlalchemy.orm import Session
+from models.booking import Booking
+from models.rating_prior import (
+    DEFAULT_PRIOR_MEAN,
+    RATING_PRIOR_ID,
+    RatingPrior,
+    bayesian_rating,
+)
+from models.review import Review
+from models.service import RATINGS, Service, rating_count_column
+from logger import get_logger
+
+load_dotenv()
+
+logger = get_logger(__name__)
+
+REVIEW_RECONCILE_INTERVAL_SECONDS = float(
+    os.getenv("REVIEW_RECONCILE_INTERVAL_SECONDS", "3600")
+)
+# How many reviews at the global average every service is assumed to have;
+# higher values keep services with few reviews closer to the average
+RATING_PRIOR_WEIGHT = float(os.getenv("RATING_PRIOR_WEIGHT", "10"))
+# Smallest move of the global average that rescores every service
+RATING_PRIOR_TOLERANCE = float(os.getenv("RATING_PRIOR_TOLERANCE", "0.01"))
+# Stored scores further than this from the recomputed score count as drift
+RATING_SCORE_EPSILON = 1e-9
+
+reconcile_stats = {
+    "runs": 0,
+    "failures": 0,
+    "services_fixed": 0,
+    "last_services_fixed": 0,
+    "prior_mean": None,
+    "services_rescored": 0,
+    "last_duration_seconds": 0.0,
+    "last_run_at": None,
+}
+
+
+def select_review_aggregates() -> Select:
+    """Review aggregates of every reviewed service, computed from the reviews"""
+    return (
+        select(
+            Booking.service_id.label("service_id"),
+            func.count(Review.id).label("review_count"),
+            func.sum(Review.rating).label("rating_sum"),
+            *(
+                func.sum(case((Review.rating == rating, 1), else_=0)).label(
+                    f"rating_{rating}_count"
+                )
+                for rating in RATINGS
+            ),
+        )
+        .join(Booking, Review.booking_id == Booking.id)
+        .group_by(Booking.service_id)
+    )
+
+
+def stored_columns() -> list:
+    return [Service.review_count, Service.rating_sum] + [
+        rating_count_column(rating) for rating in RATINGS
+    ]
+
+
+class ReviewAggregateService:
+    @staticmethod
+    def find_drifted_services(db: Session) -> list:
+        """Ids of services whose stored aggregates differ from their reviews"""
+        actual = select_review_aggregates().subquery()
+        mismatches = [
+            column != func.coalesce(actual.c[column.key], 0)
+            for column in stored_columns()
+        ]
+        mismatches.append(
+            func.abs(
+                Service.rating_score
+                - bayesian_rating(Service.review_count, Service.rating_sum)
+            )
+            > RATING_SCORE_EPSILON
+        )
+        return list(
+            db.scalars(
+                select(Service.id)
+                .outerjoin(actual, actual.c.service_id == Service.id)
+                .filter(or_(*mismatches))
+            )
+        )
+
+    @staticmethod
+    def recompute_service(db: Session, service_id: str) -> None:
+        """Overwrite a service's aggregates with values computed from its
+        reviews, in the caller's transaction.
+
+        The service row is locked first. Review writes update that row in
+        their own transaction, so one in flight either commits before the
+        recount and is included, or waits and is applied on top of it.
+        """
+        db.execute(
+            select(Service.id).filter(Service.id == service_id).with_for_update()
+        )
+        row = db.execute(
+            select_review_aggregates().filter(Booking.service_id == service_id)
+        ).first()
+        values = {
+            column: getattr(row, column.key) if row else 0
+            for column in stored_columns()
+        }
+        values[Service.rating_score] = bayesian_rating(
+            values[Service.review_count], values[Service.rating_sum]
+        )
+        values[Service.review_version] = Service.review_version + 1
+        db.execute(update(Service).filter(Service.id == service_id).values(values))
+
+    @staticmethod
+    def refresh_prior(db: Session) -> int:
+        """Store the current global average rating as the score prior.
+
+        Once it has moved by RATING_PRIOR_TOLERANCE or more, or the weight
+        changed, every service is rescored in one statement. Returns the
+        number of services rescored.
+        """
+        totals = db.execute(
+            select(func.sum(Service.review_count), func.sum(Service.rating_sum))
+        ).first()
+        prior = db.get(RatingPrior, RATING_PRIOR_ID, with_for_update=True)
+        if not totals[0]:
+            # Nothing to average yet; keep whatever prior is configured
+            mean = prior.mean if prior else DEFAULT_PRIOR_MEAN
+        else:
+            mean = totals[1] / totals[0]
+        reconcile_stats["prior_mean"] = mean
+        if (
+            prior is not None
+            and abs(prior.mean - mean) < RATING_PRIOR_TOLERANCE
+            and prior.weight == RATING_PRIOR_WEIGHT
+        ):
+            db.commit()
+            return 0
+
+        if prior is None:
+            db.add(
+                RatingPrior(id=RATING_PRIOR_ID, mean=mean, weight=RATING_PRIOR_WEIGHT)
+            )
+        else:
+            prior.mean = mean
+            prior.weight = RATING_PRIOR_WEIGHT
+        db.flush()
+        rescored = db.execute(
+            update(Service).values(
+                rating_score=bayesian_rating(Service.review_count, Service.rating_sum)
+            )
+        ).rowcount
+        db.commit()
+        logger.info(f"Rating prior moved to {mean:.3f}; rescored {rescored} services")
+        return rescored
+
+    @staticmethod
+    def reconcile(db: Session) -> int:
+        """Repair the stored review aggregates of every service that drifted,
+        then refresh the rating prior.
+
+        Each service is fixed in its own short transaction. Also backfills
+        services whose aggregates were never filled in. Errors are re-raised
+        after the services fixed so far have been recorded.
+        """
+        started = time.perf_counter()
+        fixed = 0
+        try:
+            drifted = ReviewAggregateService.find_drifted_services(db)
+            db.commit()
+            for service_id in drifted:
+                ReviewAggregateService.recompute_service(db, service_id)
+                db.commit()
+                fixed += 1
+            reconcile_stats["services_rescored"] += (
+                ReviewAggregateService.refresh_prior(db)
+            )
+
+        except Exception as e:
+            logger.error(f"Error reconciling review aggregates: {str(e)}")
+            db.rollback()
+            reconcile_stats["failures"] += 1
+            raise
+
+        finally:
+            elapsed = time.perf_counter() - started
+            reconcile_stats["runs"] += 1
+            reconcile_stats["services_fixed"] += fixed
+            reconcile_stats["last_services_fixed"] = fixed
+            reconcile_stats["last_duration_seconds"] = elapsed
+            reconcile_stats["last_run_at"] = datetime.now(timezone.utc).isoformat()
+
+        if fixed > 0:
+            logger.warning(
+                f"Repaired review aggregates of {fixed} services in {elapsed:.3f}s"
+            )
+
+        return fixed
+
+
+review_aggregate_service = ReviewAggregateService()
@@ -0,0 +1,227 @@
+import hashlib
+import math
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional
+from dotenv import load_dotenv
+from sqlalchemy.orm import Session
+from models.token_blacklist import TokenBlacklist
+from logger import get_logger
+
+load_dotenv()
+
+logger = get_logger(__name__)
+
+REVOCATION_FILTER_ENABLED = (
+    os.getenv("REVOCATION_FILTER_ENABLED", "true").lower() == "true"
+)
+REVOCATION_FILTER_CAPACITY = int(os.getenv("REVOCATION_FILTER_CAPACITY", "100000"))
+REVOCATION_FILTER_ERROR_RATE = float(
+    os.getenv("REVOCATION_FILTER_ERROR_RATE", "0.001")
+)
+REVOCATION_FILTER_REFRESH_SECONDS = float(
+    os.getenv("REVOCATION_FILTER_REFRESH_SECONDS", "5")
+)
+REVOCATION_FILTER_REBUILD_SECONDS = float(
+    os.getenv("REVOCATION_FILTER_REBUILD_SECONDS", "900")
+)
+# Delta refreshes re-read this much history to tolerate clock skew between
+# workers and transactions that committed after a previous refresh started
+REVOCATION_FILTER_OVERLAP_SECONDS = float(
+    os.getenv("REVOCATION_FILTER_OVERLAP_SECONDS", "60")
+)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(
+            8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        )
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        # Approximate: repeated or colliding items are not counted twice
+        self.count = 0
+
+    def _positions(self, item: str) -> List[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [
+            (first + i * second) % self.num_bits for i in range(self.num_hashes)
+        ]
+
+    def add(self, item: str) -> None:
+        added = False
+        for position in self._positions(item):
+            mask = 1 << (position & 7)
+            if not self.bits[position >> 3] & mask:
+                self.bits[position >> 3] |= mask
+                added = True
+        if added:
+            self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self.bits)
+
+    def estimated_error_rate(self) -> float:
+        """False-positive rate expected for the current number of items"""
+        return (
+            1 - math.exp(-self.num_hashes * self.count / self.num_bits)
+        ) ** self.num_hashes
+
+
+class RevocationFilter:
+    """Per-process Bloom filter of revoked token JTIs.
+
+    A miss proves a token was not revoked as of the last refresh, so only
+    hits need to be confirmed against ``token_blacklist``. Revocations made
+    in this process are added immediately; those made by other workers are
+    picked up by ``refresh`` every REVOCATION_FILTER_REFRESH_SECONDS. Until
+    the first build completes every lookup falls through to the database.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = REVOCATION_FILTER_ENABLED,
+        capacity: int = REVOCATION_FILTER_CAPACITY,
+        error_rate: float = REVOCATION_FILTER_ERROR_RATE,
+    ):
+        self.enabled = enabled
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._bloom: Optional[BloomFilter] = None
+        self._pending: Optional[List[str]] = None
+        self._lock = threading.Lock()
+        self._refreshed_from: Optional[datetime] = None
+        self._built_at = 0.0
+        self.lookups = 0
+        self.db_checks = 0
+        self.false_positives = 0
+
+    @property
+    def ready(self) -> bool:
+        return self.enabled and self._bloom is not None
+
+    def might_contain(self, jti: str) -> bool:
+        """Check if a JTI may be revoked; False means it definitely is not"""
+        with self._lock:
+            self.lookups += 1
+            if self._bloom is not None and jti not in self._bloom:
+                return False
+            self.db_checks += 1
+            return True
+
+    def record_false_positive(self) -> None:
+        with self._lock:
+            self.false_positives += 1
+
+    def add(self, jti: str) -> None:
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(jti)
+            if self._pending is not None:
+                self._pending.append(jti)
+
+    def rebuild(self, db: Session) -> None:
+        """Build a fresh filter from every non-expired blacklist row"""
+        if not self.enabled:
+            return
+        started_at = datetime.now(timezone.utc)
+        with self._lock:
+            self._pending = []
+        try:
+            jtis = [
+                jti
+                for (jti,) in db.query(TokenBlacklist.jti)
+                .filter(TokenBlacklist.expires_at > started_at)
+                .all()
+            ]
+            # Leave room to grow until the next rebuild
+            bloom = BloomFilter(max(self.capacity, 2 * len(jtis)), self.error_rate)
+            self._add_all(bloom, jtis)
+            with self._lock:
+                self._add_all(bloom, self._pending)
+                self._bloom = bloom
+                self._refreshed_from = started_at
+                self._built_at = time.monotonic()
+        finally:
+            with self._lock:
+                self._pending = None
+        logger.info(f"Built revocation filter with {len(jtis)} revoked tokens")
+
+    def refresh(self, db: Session) -> None:
+        """Add tokens revoked by other workers since the previous refresh"""
+        if not self.enabled:
+            return
+        with self._lock:
+            bloom, refreshed_from = self._bloom, self._refreshed_from
+        if (
+            bloom is None
+            or bloom.count > bloom.capacity
+            or time.monotonic() - self._built_at > REVOCATION_FILTER_REBUILD_SECONDS
+        ):
+            # Bloom filters cannot drop expired entries, so rebuild periodically
+            self.rebuild(db)
+            return
+
+        started_at = datetime.now(timezone.utc)
+        since = refreshed_from - timedelta(seconds=REVOCATION_FILTER_OVERLAP_SECONDS)
+        jtis = [
+            jti
+            for (jti,) in db.query(TokenBlacklist.jti)
+            .filter(TokenBlacklist.blacklisted_at >= since)
+            .all()
+        ]
+        with self._lock:
+            if self._bloom is bloom:
+                self._add_all(bloom, jtis)
+                self._refreshed_from = started_at
+
+    def clear(self) -> None:
+        with self._lock:
+            self._bloom = None
+            self._refreshed_from = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            bloom = self._bloom
+            return {
+                "enabled": self.enabled,
+                "ready": bloom is not None,
+                "items": bloom.count if bloom else 0,
+                "capacity": bloom.capacity if bloom else self.capacity,
+                "size_bytes": bloom.size_bytes if bloom else 0,
+                "hash_functions": bloom.num_hashes if bloom else 0,
+                "target_false_positive_rate": self.error_rate,
+                "estimated_false_positive_rate": (
+                    bloom.estimated_error_rate() if bloom else 0.0
+                ),
+                "lookups": self.lookups,
+                "db_checks": self.db_checks,
+                "false_positives": self.false_positives,
+                "last_refreshed_from": (
+                    self._refreshed_from.isoformat() if self._refreshed_from else None
+                ),
+            }
+
+    @staticmethod
+    def _add_all(bloom: BloomFilter, jtis: Iterable[str]) -> None:
+        for jti in jtis:
+            bloom.add(jti)
+
+
+revocation_filter = RevocationFilter()
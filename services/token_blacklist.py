@@ -1,12 +1,63 @@
+import os
+import time
+from contextlib import contextmanager
 from datetime import datetime, timezone
+from dotenv import load_dotenv
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 from models.token_blacklist import TokenBlacklist
 from jose import jwt
 from fastapi import HTTPException, status
+from services.revocation_filter import revocation_filter
 from logger import get_logger
 
+load_dotenv()
+
 logger = get_logger(__name__)
 
+BLACKLIST_CLEANUP_INTERVAL_SECONDS = float(
+    os.getenv("BLACKLIST_CLEANUP_INTERVAL_SECONDS", "300")
+)
+BLACKLIST_CLEANUP_BATCH_SIZE = int(os.getenv("BLACKLIST_CLEANUP_BATCH_SIZE", "5000"))
+# Arbitrary application-wide key for pg_try_advisory_lock
+BLACKLIST_CLEANUP_LOCK_KEY = 7_305_214_001
+
+cleanup_stats = {
+    "runs": 0,
+    "skipped_runs": 0,
+    "rows_purged": 0,
+    "last_rows_purged": 0,
+    "last_duration_seconds": 0.0,
+    "last_run_at": None,
+}
+
+
+@contextmanager
+def _cleanup_lock(db: Session):
+    """Hold a PostgreSQL advisory lock for the duration of a cleanup run.
+
+    The lock is taken on a dedicated connection because the session hands
+    its connection back to the pool after every batch commit.
+    """
+    bind = db.get_bind()
+    if bind.dialect.name != "postgresql":
+        yield True
+        return
+    with bind.connect() as connection:
+        acquired = connection.execute(
+            text("SELECT pg_try_advisory_lock(:key)"),
+            {"key": BLACKLIST_CLEANUP_LOCK_KEY},
+        ).scalar()
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                connection.execute(
+                    text("SELECT pg_advisory_unlock(:key)"),
+                    {"key": BLACKLIST_CLEANUP_LOCK_KEY},
+                )
+            connection.commit()
+
 
 class TokenBlacklistService:
     @staticmethod
@@ -34,6 +85,9 @@ class TokenBlacklistService:
                 jti=jti, token=token, expires_at=expires_at
             )
             db.add(blacklisted_token)
+            # Added before commit so no request can see the row missing from
+            # the filter; a rolled back add only costs a false positive
+            revocation_filter.add(jti)
             db.commit()
 
             logger.info(f"Token with JTI {jti} blacklisted successfully")
@@ -45,6 +99,9 @@ class TokenBlacklistService:
     @staticmethod
     def is_token_blacklisted(db: Session, jti: str) -> bool:
         """Check if a token is blacklisted"""
+        if not revocation_filter.might_contain(jti):
+            return False
+
         blacklisted_token = (
             db.query(TokenBlacklist)
             .filter(
@@ -54,29 +111,64 @@ class TokenBlacklistService:
             )
             .first()
         )
+        if blacklisted_token is None and revocation_filter.ready:
+            revocation_filter.record_false_positive()
 
         return blacklisted_token is not None
 
     @staticmethod
-    def cleanup_expired_tokens(db: Session) -> int:
-        """Remove expired tokens from blacklist to keep the table clean"""
-        try:
-            expired_count = (
-                db.query(TokenBlacklist)
-                .filter(TokenBlacklist.expires_at <= datetime.now(timezone.utc))
-                .delete()
+    def cleanup_expired_tokens(
+        db: Session, batch_size: int = BLACKLIST_CLEANUP_BATCH_SIZE
+    ) -> int:
+        """Remove expired tokens from blacklist to keep the table clean.
+
+        Rows are deleted in batches of ``batch_size``, each in its own
+        transaction, so no run holds row locks for long. On PostgreSQL only
+        one worker at a time runs the purge.
+        """
+        started = time.perf_counter()
+        with _cleanup_lock(db) as acquired:
+            if not acquired:
+                logger.info("Blacklist cleanup already running in another worker")
+                cleanup_stats["skipped_runs"] += 1
+                return 0
+
+            expired_count = 0
+            try:
+                while True:
+                    expired_ids = (
+                        db.query(TokenBlacklist.id)
+                        .filter(TokenBlacklist.expires_at <= datetime.now(timezone.utc))
+                        .limit(batch_size)
+                        .scalar_subquery()
+                    )
+                    deleted = (
+                        db.query(TokenBlacklist)
+                        .filter(TokenBlacklist.id.in_(expired_ids))
+                        .delete(synchronize_session=False)
+                    )
+                    db.commit()
+                    expired_count += deleted
+                    if deleted < batch_size:
+                        break
+
+            except Exception as e:
+                logger.error(f"Error cleaning up expired tokens: {str(e)}")
+                db.rollback()
+
+        elapsed = time.perf_counter() - started
+        cleanup_stats["runs"] += 1
+        cleanup_stats["rows_purged"] += expired_count
+        cleanup_stats["last_rows_purged"] = expired_count
+        cleanup_stats["last_duration_seconds"] = elapsed
+        cleanup_stats["last_run_at"] = datetime.now(timezone.utc).isoformat()
+        if expired_count > 0:
+            logger.info(
+                f"Cleaned up {expired_count} expired tokens from blacklist "
+                f"in {elapsed:.3f}s"
             )
-            db.commit()
-
-            if expired_count > 0:
-                logger.info(f"Cleaned up {expired_count} expired tokens from blacklist")
-
-            return expired_count
 
-        except Exception as e:
-            logger.error(f"Error cleaning up expired tokens: {str(e)}")
-            db.rollback()
-            return 0
+        return expired_count
 
 
 token_blacklist_service = TokenBlacklistService()
@@ -1,5 +1,6 @@
 from datetime import timedelta, datetime, timezone
 from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from models.user import User
 from security.auth import verify_password
@@ -11,15 +12,19 @@ from schemas.user import (
     LogoutResponse,
     RefreshTokenRequest,
     RefreshTokenResponse,
+    CurrentUser,
 )
 from fastapi import HTTPException, status
 from security.auth import (
-    authenticate_user,
+    access_token_claims,
+    authenticate_user_async,
     create_access_token,
     create_refresh_token,
     verify_refresh_token,
 )
 from services.token_blacklist import token_blacklist_service
+from security.token_cache import token_cache
+from security.session_epoch import session_epochs
 from logger import get_logger
 
 logger = get_logger(__name__)
@@ -27,8 +32,8 @@ logger = get_logger(__name__)
 
 class UserService:
     @staticmethod
-    def login_user(db: Session, user_login: UserLogin) -> LoginResponse:
-        user = authenticate_user(db, user_login.email, user_login.password)
+    async def login_user(db: AsyncSession, user_login: UserLogin) -> LoginResponse:
+        user = await authenticate_user_async(db, user_login.email, user_login.password)
         if not user:
             logger.warning(f"Failed login attempt for email: {user_login.email}")
             raise HTTPException(
@@ -39,8 +44,8 @@ class UserService:
         # Reactivate user status on successful login (in case they were logged out)
         if user.status != "active":
             user.status = "active"
-            db.commit()
-            db.refresh(user)
+            await db.commit()
+            token_cache.invalidate_user(user.id)
             logger.info(f"User status reactivated for: {user_login.email}")
 
         # Create access and refresh tokens
@@ -48,7 +53,7 @@ class UserService:
         refresh_token_expires = timedelta(days=7)
 
         access_token, access_expires_at = create_access_token(
-            data={"sub": str(user.id)}, expires_delta=access_token_expires
+            data=access_token_claims(user), expires_delta=access_token_expires
         )
         refresh_token, refresh_expires_at = create_refresh_token(
             data={"sub": str(user.id)}, expires_delta=refresh_token_expires
@@ -65,7 +70,7 @@ class UserService:
     @staticmethod
     def logout_user(
         db: Session,
-        user: User,
+        user: CurrentUser,
         access_token: str,
         access_expires_at,
         refresh_token: str = None,
@@ -74,13 +79,17 @@ class UserService:
         """
         Logout user by:
         1. Setting user status to 'inactive' (for logout tracking)
-        2. Adding both access and refresh tokens to blacklist
+        2. Bumping the session epoch, which revokes stateless access tokens
+        3. Adding both access and refresh tokens to blacklist
         """
         try:
             # Update user status to inactive (for logout state)
-            user.status = "inactive"
+            db_user = user_crud.get_user_id(db, user.id)
+            db_user.status = "inactive"
+            db_user.session_epoch = User.session_epoch + 1
             db.commit()
-            db.refresh(user)
+            session_epochs.invalidate(user.id)
+            token_cache.invalidate_user(user.id)
 
             # Add access token to blacklist
             token_blacklist_service.blacklist_token(db, access_token, access_expires_at)
@@ -134,7 +143,7 @@ class UserService:
             refresh_token_expires = timedelta(days=7)
 
             access_token, _ = create_access_token(
-                data={"sub": str(user.id)}, expires_delta=access_token_expires
+                data=access_token_claims(user), expires_delta=access_token_expires
             )
             refresh_token, _ = create_refresh_token(
                 data={"sub": str(user.id)}, expires_delta=refresh_token_expires
@@ -2,10 +2,14 @@ from datetime import timedelta, datetime, timezone
 import uuid
 from fastapi import status
 from decimal import Decimal
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
 
 from models.user import User
 from models.service import Service
 from models.booking import Booking
+from crud.booking import BookingCRUD
+from services.booking_index import booking_interval_index
 from security.auth import create_access_token, get_password_hash
 
 
@@ -228,6 +232,276 @@ def test_create_booking_time_conflict(client, db_session):
     assert response.status_code == status.HTTP_409_CONFLICT
 
 
+def test_create_booking_db_overlap_violation_returns_conflict(
+    client, db_session, monkeypatch
+):
+    """Test an exclusion constraint violation from the database maps to 409"""
+    admin = User(
+        id=str(uuid.uuid4()),
+        name="Admin User",
+        email="admin@example.com",
+        password_hash=get_password_hash("adminpassword123"),
+        role="admin",
+        is_active=True,
+        status="active",
+    )
+    user = User(
+        id=str(uuid.uuid4()),
+        name="Test User",
+        email="test@example.com",
+        password_hash=get_password_hash("testpassword123"),
+        role="user",
+        is_active=True,
+        status="active",
+    )
+    db_session.add_all([admin, user])
+    db_session.commit()
+
+    service = Service(
+        id=str(uuid.uuid4()),
+        title="Cleaning Service",
+        description="Professional cleaning",
+        price=Decimal("80.00"),
+        duration_minutes=120,
+        is_active=True,
+        owner_id=admin.id,
+    )
+    db_session.add(service)
+    db_session.commit()
+
+    class ExclusionViolation(Exception):
+        pgcode = "23P01"
+
+    def failing_commit():
+        raise IntegrityError("INSERT INTO bookings", {}, ExclusionViolation())
+
+    # Simulate PostgreSQL rejecting the INSERT through the exclusion constraint
+    monkeypatch.setattr(BookingCRUD, "_enforces_overlap_in_db", lambda db: True)
+    monkeypatch.setattr(db_session, "commit", failing_commit)
+
+    user_token, _ = create_access_token(
+        data={"sub": str(user.id)}, expires_delta=timedelta(minutes=30)
+    )
+    start_time = datetime.now(timezone.utc) + timedelta(days=1)
+    booking_data = {
+        "service_id": str(service.id),
+        "start_time": start_time.isoformat(),
+        "end_time": (start_time + timedelta(hours=2)).isoformat(),
+    }
+
+    response = client.post(
+        "/api/bookings",
+        json=booking_data,
+        headers={"Authorization": f"Bearer {user_token}"},
+    )
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert response.json()["detail"] == "Time slot is already booked for this service"
+
+
+def test_interval_index_conflicts_and_sync(client, db_session, monkeypatch):
+    """Test the in-memory interval index rejects overlaps and tracks cancellations"""
+    monkeypatch.setattr(booking_interval_index, "enabled", True)
+    booking_interval_index.clear()
+
+    admin = User(
+        id=str(uuid.uuid4()),
+        name="Admin User",
+        email="admin@example.com",
+        password_hash=get_password_hash("adminpassword123"),
+        role="admin",
+        is_active=True,
+        status="active",
+    )
+    user = User(
+        id=str(uuid.uuid4()),
+        name="Test User",
+        email="test@example.com",
+        password_hash=get_password_hash("testpassword123"),
+        role="user",
+        is_active=True,
+        status="active",
+    )
+    db_session.add_all([admin, user])
+    db_session.commit()
+
+    service = Service(
+        id=str(uuid.uuid4()),
+        title="Cleaning Service",
+        description="Professional cleaning",
+        price=Decimal("80.00"),
+        duration_minutes=120,
+        is_active=True,
+        owner_id=admin.id,
+    )
+    db_session.add(service)
+    db_session.commit()
+
+    start_time = datetime.now(timezone.utc) + timedelta(days=1)
+    end_time = start_time + timedelta(hours=2)
+    existing_booking = Booking(
+        id=str(uuid.uuid4()),
+        user_id=user.id,
+        service_id=service.id,
+        start_time=start_time,
+        end_time=end_time,
+        status="confirmed",
+    )
+    db_session.add(existing_booking)
+    db_session.commit()
+
+    user_token, _ = create_access_token(
+        data={"sub": str(user.id)}, expires_delta=timedelta(minutes=30)
+    )
+    user_headers = {"Authorization": f"Bearer {user_token}"}
+    booking_data = {
+        "service_id": str(service.id),
+        "start_time": (start_time + timedelta(hours=1)).isoformat(),
+        "end_time": (end_time + timedelta(hours=1)).isoformat(),
+    }
+
+    # The index is loaded lazily and rejects the overlap
+    response = client.post("/api/bookings", json=booking_data, headers=user_headers)
+    assert response.status_code == status.HTTP_409_CONFLICT
+
+    # Adjacent bookings do not conflict and are added to the index
+    adjacent_data = {
+        "service_id": str(service.id),
+        "start_time": end_time.isoformat(),
+        "end_time": (end_time + timedelta(minutes=30)).isoformat(),
+    }
+    response = client.post("/api/bookings", json=adjacent_data, headers=user_headers)
+    assert response.status_code == status.HTTP_201_CREATED
+    assert booking_interval_index.has_conflict(
+        db_session, service.id, end_time, end_time + timedelta(minutes=10)
+    )
+
+    # Cancelling the existing booking frees its slot in the index
+    response = client.patch(
+        f"/api/bookings/{existing_booking.id}",
+        json={"status": "cancelled"},
+        headers=user_headers,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert not booking_interval_index.has_conflict(
+        db_session, service.id, start_time, end_time
+    )
+
+    booking_interval_index.clear()
+
+
+def test_interval_index_hit_is_confirmed_in_database(client, db_session, monkeypatch):
+    """Test a booking cancelled behind the index's back frees its slot"""
+    monkeypatch.setattr(booking_interval_index, "enabled", True)
+    booking_interval_index.clear()
+
+    admin = User(
+        id=str(uuid.uuid4()),
+        name="Admin User",
+        email="admin@example.com",
+        password_hash=get_password_hash("adminpassword123"),
+        role="admin",
+        is_active=True,
+        status="active",
+    )
+    user = User(
+        id=str(uuid.uuid4()),
+        name="Test User",
+        email="test@example.com",
+        password_hash=get_password_hash("testpassword123"),
+        role="user",
+        is_active=True,
+        status="active",
+    )
+    db_session.add_all([admin, user])
+    db_session.commit()
+
+    service = Service(
+        id=str(uuid.uuid4()),
+        title="Cleaning Service",
+        description="Professional cleaning",
+        price=Decimal("80.00"),
+        duration_minutes=120,
+        is_active=True,
+        owner_id=admin.id,
+    )
+    db_session.add(service)
+    db_session.commit()
+
+    user_token, _ = create_access_token(
+        data={"sub": str(user.id)}, expires_delta=timedelta(minutes=30)
+    )
+    user_headers = {"Authorization": f"Bearer {user_token}"}
+    start_time = datetime.now(timezone.utc) + timedelta(days=1)
+    booking_data = {
+        "service_id": str(service.id),
+        "start_time": start_time.isoformat(),
+        "end_time": (start_time + timedelta(hours=2)).isoformat(),
+    }
+    response = client.post("/api/bookings", json=booking_data, headers=user_headers)
+    assert response.status_code == status.HTTP_201_CREATED
+    booking_id = response.json()["id"]
+
+    # With the index loaded, a free slot is booked without the conflict query
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    free_data = dict(
+        booking_data,
+        start_time=(start_time + timedelta(hours=3)).isoformat(),
+        end_time=(start_time + timedelta(hours=4)).isoformat(),
+    )
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = client.post("/api/bookings", json=free_data, headers=user_headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert response.status_code == status.HTTP_201_CREATED
+    assert not any("bookings.status IN" in statement for statement in statements)
+
+    # Another worker cancels the booking; this worker's index still has it
+    db_session.query(Booking).filter(Booking.id == booking_id).update(
+        {"status": "cancelled"}
+    )
+    db_session.commit()
+    assert booking_interval_index.has_conflict(
+        db_session, service.id, start_time, start_time + timedelta(hours=2)
+    )
+
+    response = client.post("/api/bookings", json=booking_data, headers=user_headers)
+    assert response.status_code == status.HTTP_201_CREATED
+
+    # The stale intervals were reloaded and now hold the new booking
+    response = client.post("/api/bookings", json=booking_data, headers=user_headers)
+    assert response.status_code == status.HTTP_409_CONFLICT
+
+    booking_interval_index.clear()
+
+
+def test_interval_index_finds_overlaps_past_overlapping_entries():
+    from services.booking_index import _ServiceIntervals
+
+    day = datetime(2026, 3, 2)
+    # A stale index can hold bookings that overlap each other
+    intervals = _ServiceIntervals(
+        [
+            (day.replace(hour=9), day.replace(hour=17), "all-day"),
+            (day.replace(hour=10), day.replace(hour=11), "short"),
+        ]
+    )
+    assert intervals.overlaps(day.replace(hour=12), day.replace(hour=13), None)
+    assert not intervals.overlaps(
+        day.replace(hour=12), day.replace(hour=13), "all-day"
+    )
+    intervals.remove("all-day")
+    assert not intervals.overlaps(day.replace(hour=12), day.replace(hour=13), None)
+    intervals.add(day.replace(hour=8), day.replace(hour=12, minute=30), "morning")
+    assert intervals.overlaps(day.replace(hour=12), day.replace(hour=13), None)
+    assert not intervals.overlaps(day.replace(hour=17), day.replace(hour=18), None)
+
+
 def test_create_booking_invalid_time(client, db_session):
     """Test booking creation with invalid time (past time)"""
     # Create admin and user
@@ -1145,6 +1419,27 @@ def test_booking_pagination(client, db_session):
     data = response.json()
     assert len(data) >= 2
 
+    # Cursor pagination walks the same bookings without offsets
+    response = client.get("/api/bookings?limit=3", headers=user_headers)
+    first_page = response.json()
+    cursor = response.headers["X-Next-Cursor"]
+
+    response = client.get(
+        "/api/bookings", params={"limit": 3, "cursor": cursor}, headers=user_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    second_page = response.json()
+    assert len(second_page) == 2
+    assert "X-Next-Cursor" not in response.headers
+
+    pages = first_page + second_page
+    assert len({booking["id"] for booking in pages}) == 5
+    start_times = [booking["start_time"] for booking in pages]
+    assert start_times == sorted(start_times, reverse=True)
+
+    response = client.get("/api/bookings?cursor=not-a-cursor", headers=user_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
 
 def test_unauthorized_access_to_booking_endpoints(client):
     """Test accessing booking endpoints without authentication"""
@@ -2,15 +2,25 @@ import pytest
 import os
 import tempfile
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from fastapi.testclient import TestClient
-from database.database import Base, get_db
+from database.database import Base, get_async_db, get_db
 from main import app
+from security.token_cache import token_cache
+from security.session_epoch import session_epochs
+from services.catalog_cache import catalog_cache
 
 
 SQLITE_DATABASE_URL = "sqlite:///./test.db"
 engine = create_engine(SQLITE_DATABASE_URL, connect_args={"check_same_thread": False})
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Each TestClient runs its own event loop, so async connections are not pooled
+async_engine = create_async_engine("sqlite+aiosqlite:///./test.db", poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(
+    async_engine, autoflush=False, expire_on_commit=False
+)
 
 
 @pytest.fixture(scope="function")
@@ -25,6 +35,18 @@ def db_session():
         Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    """Cached tokens must not leak between tests that reuse user ids."""
+    token_cache.clear()
+    session_epochs.clear()
+    catalog_cache.clear()
+    yield
+    token_cache.clear()
+    session_epochs.clear()
+    catalog_cache.clear()
+
+
 @pytest.fixture(scope="function")
 def client(db_session):
     """Create a TestClient that uses the test database session."""
@@ -35,7 +57,12 @@ def client(db_session):
         finally:
             pass
 
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as db:
+            yield db
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     with TestClient(app) as client:
         yield client
     app.dependency_overrides.clear()
@@ -0,0 +1,257 @@
+"""Query plan checks for the CRUD indexes.
+
+These run the real CRUD queries against PostgreSQL and EXPLAIN every
+statement they issue. Set TEST_POSTGRES_URL to a scratch database to run
+them; they are skipped otherwise.
+"""
+
+import os
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+from database.database import Base
+from models.user import User
+from models.service import Service
+from models.booking import Booking
+from models.review import Review
+from crud.booking import booking_crud
+from crud.review import review_crud
+from crud.service import service_crud
+from crud.user import user_crud
+
+TEST_POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+pytestmark = pytest.mark.skipif(
+    not TEST_POSTGRES_URL, reason="TEST_POSTGRES_URL is not set"
+)
+
+
+@pytest.fixture(scope="module")
+def pg_engine():
+    engine = create_engine(TEST_POSTGRES_URL)
+    with engine.begin() as connection:
+        connection.execute(text("CREATE EXTENSION IF NOT EXISTS btree_gist"))
+        connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    Base.metadata.create_all(bind=engine)
+    try:
+        yield engine
+    finally:
+        Base.metadata.drop_all(bind=engine)
+        engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def seeded(pg_engine):
+    """Insert a small data set and return the ids used by the queries"""
+    session = sessionmaker(bind=pg_engine)()
+    owner = User(
+        id=str(uuid.uuid4()),
+        name="Owner",
+        email="owner@example.com",
+        password_hash="not-a-real-hash",
+        role="admin",
+    )
+    session.add(owner)
+    services = [
+        Service(
+            id=str(uuid.uuid4()),
+            title=f"Service {i}",
+            price=Decimal(10 + i),
+            duration_minutes=60,
+            is_active=i % 2 == 0,
+            owner_id=owner.id,
+        )
+        for i in range(20)
+    ]
+    session.add_all(services)
+    start = datetime(2030, 1, 1, 9)
+    bookings = [
+        Booking(
+            id=str(uuid.uuid4()),
+            user_id=owner.id,
+            service_id=services[i % len(services)].id,
+            start_time=start + timedelta(hours=i),
+            end_time=start + timedelta(hours=i, minutes=30),
+            status="completed" if i % 3 == 0 else "confirmed",
+        )
+        for i in range(100)
+    ]
+    session.add_all(bookings)
+    session.flush()
+    session.add_all(
+        [
+            Review(booking_id=booking.id, rating=5, created_at=booking.end_time)
+            for booking in bookings
+            if booking.status == "completed"
+        ]
+    )
+    session.commit()
+    with pg_engine.begin() as connection:
+        connection.execute(text("ANALYZE"))
+    ids = {"user_id": owner.id, "service_id": services[0].id}
+    session.close()
+    return ids
+
+
+@pytest.fixture
+def pg_session(pg_engine, seeded):
+    session = sessionmaker(bind=pg_engine)()
+    # Tiny tables would otherwise always be scanned sequentially
+    session.execute(text("SET enable_seqscan = off"))
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+
+
+def explain_crud_call(session, call):
+    """Run a CRUD call and return the query plans of the SELECTs it issued"""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    connection = session.connection()
+    event.listen(connection, "before_cursor_execute", capture)
+    try:
+        call()
+    finally:
+        event.remove(connection, "before_cursor_execute", capture)
+
+    plans = []
+    for statement, parameters in statements:
+        rows = connection.exec_driver_sql("EXPLAIN " + statement, parameters)
+        plans.append("\n".join(row[0] for row in rows))
+    assert plans, "CRUD call did not issue any SELECT"
+    return "\n".join(plans)
+
+
+def test_user_bookings_use_user_start_index(pg_session, seeded):
+    plan = explain_crud_call(
+        pg_session,
+        lambda: booking_crud.get_bookings(pg_session, user_id=seeded["user_id"]),
+    )
+    assert "ix_bookings_user_start" in plan
+
+
+def test_service_bookings_use_service_start_index(pg_session, seeded):
+    plan = explain_crud_call(
+        pg_session,
+        lambda: booking_crud.get_service_bookings(pg_session, seeded["service_id"]),
+    )
+    assert "ix_bookings_service_start" in plan
+
+
+def test_availability_uses_partial_active_index(pg_session, seeded):
+    plan = explain_crud_call(
+        pg_session,
+        lambda: booking_crud.get_free_intervals(
+            pg_session,
+            seeded["service_id"],
+            datetime(2030, 1, 1),
+            datetime(2030, 1, 8),
+            timedelta(minutes=60),
+        ),
+    )
+    assert "ix_bookings_service_active_start" in plan
+
+
+def test_active_services_use_active_price_index(pg_session, seeded):
+    plan = explain_crud_call(
+        pg_session,
+        lambda: service_crud.get_active_services(
+            pg_session, price_min=12, price_max=20
+        ),
+    )
+    assert "ix_services_active_price" in plan
+
+
+def test_owner_services_use_owner_index(pg_session, seeded):
+    plan = explain_crud_call(
+        pg_session,
+        lambda: service_crud.get_services_by_owner(pg_session, seeded["user_id"]),
+    )
+    assert "ix_services_owner_id" in plan
+
+
+def test_review_listing_uses_created_at_index(pg_session, seeded):
+    plan = explain_crud_call(
+        pg_session, lambda: review_crud.get_reviews(pg_session, limit=10)
+    )
+    assert "ix_reviews_created_at" in plan
+
+
+def test_service_search_uses_search_vector_index(pg_session, seeded):
+    plan = explain_crud_call(
+        pg_session, lambda: service_crud.get_services(pg_session, q="serv")
+    )
+    assert "ix_services_search_vector" in plan
+
+
+def test_service_search_ranks_title_matches_first(pg_session, seeded):
+    pg_session.add_all(
+        [
+            Service(
+                title="Guitar lessons",
+                description="Learn yoga breathing while you play",
+                price=Decimal(30),
+                duration_minutes=60,
+                owner_id=seeded["user_id"],
+            ),
+            Service(
+                title="Yoga classes",
+                description="Morning yoga for beginners",
+                price=Decimal(20),
+                duration_minutes=60,
+                owner_id=seeded["user_id"],
+            ),
+        ]
+    )
+    pg_session.flush()
+
+    results = service_crud.get_active_services(pg_session, q="yog")
+    assert [service.title for service in results] == ["Yoga classes", "Guitar lessons"]
+    assert service_crud.get_active_services(pg_session, q="yoga beginner")[0].title == (
+        "Yoga classes"
+    )
+    assert service_crud.get_active_services(pg_session, q="& | !") == []
+
+
+def test_service_search_tolerates_typos(pg_session, seeded):
+    pg_session.add(
+        Service(
+            title="Babysitting",
+            price=Decimal(15),
+            duration_minutes=60,
+            owner_id=seeded["user_id"],
+        )
+    )
+    pg_session.flush()
+
+    # "babysittng" does not stem to "babysit", so only trigrams can match it
+    for q in ("babysiting", "babysittng"):
+        results = service_crud.get_active_services(pg_session, q=q)
+        assert [service.title for service in results] == ["Babysitting"]
+
+
+def test_service_title_search_uses_trigram_index(pg_session, seeded):
+    plan = explain_crud_call(
+        pg_session, lambda: service_crud.get_services(pg_session, q="Servce")
+    )
+    assert "ix_services_title_trgm" in plan
+
+
+def test_user_search_uses_trigram_indexes(pg_session, seeded):
+    plan = explain_crud_call(
+        pg_session, lambda: user_crud.search_users(pg_session, "ownerr")
+    )
+    assert "ix_users_name_trgm" in plan
+    assert "ix_users_email_trgm" in plan
+    assert user_crud.search_users(pg_session, "ownerr")[0].email == "owner@example.com"
@@ -0,0 +1,104 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from database.pool import (
+    InstrumentedAsyncAdaptedQueuePool,
+    InstrumentedQueuePool,
+    instrument_pool,
+    pool_status,
+)
+
+
+def test_instrumented_pool_records_checkouts_and_timeouts(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.01,
+    )
+    instrument_pool(engine)
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        status = pool_status(engine)
+        assert status["checked_out"] == 1
+        assert status["idle"] == 0
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+
+    status = pool_status(engine)
+    assert status["pool_class"] == "InstrumentedQueuePool"
+    assert status["checked_out"] == 0
+    assert status["idle"] == 1
+    assert status["checkouts"] == 1
+    assert status["timeouts"] == 1
+    assert status["connects"] == 1
+    assert sum(status["checkout_latency_buckets"].values()) == 1
+
+    # Stats survive dispose(), which swaps in a recreated pool
+    engine.dispose()
+    assert pool_status(engine)["checkouts"] == 1
+    engine.dispose()
+
+
+def test_instrumented_async_pool_records_checkouts(tmp_path):
+    import asyncio
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+    )
+    instrument_pool(engine)
+
+    async def query():
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+            assert pool_status(engine)["checked_out"] == 1
+        await engine.dispose()
+
+    asyncio.run(query())
+    status = pool_status(engine)
+    assert status["pool_class"] == "InstrumentedAsyncAdaptedQueuePool"
+    assert status["checkouts"] == 1
+    assert status["connects"] == 1
+
+
+def test_engines_are_created_at_startup_not_import():
+    import subprocess
+    import sys
+
+    # A fresh interpreter, since the test session has already used the engine
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import main, database.database as d; "
+            "print(d._engine is None, d._async_engine is None)",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.split()[-2:] == ["True", "True"]
+
+
+def test_init_engines_warms_the_pool():
+    from database.database import get_engine, init_engines
+
+    init_engines(warm_connections=2)
+    assert pool_status(get_engine())["idle"] >= 2
+
+
+def test_reset_engines_after_fork_drops_inherited_connections():
+    from database.database import get_engine, init_engines, reset_engines_after_fork
+
+    init_engines(warm_connections=1)
+    reset_engines_after_fork()
+    engine = get_engine()
+    assert pool_status(engine)["idle"] == 0
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT 1")).scalar() == 1
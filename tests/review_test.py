@@ -1,12 +1,19 @@
 from datetime import timedelta, datetime, timezone
 import uuid
+import pytest
 from fastapi import status
 from decimal import Decimal
 from models.user import User
 from models.service import Service
 from models.booking import Booking
 from models.review import Review
+from models.rating_prior import RATING_PRIOR_ID, RatingPrior
 from security.auth import create_access_token, get_password_hash
+from services.review_aggregates import (
+    ReviewAggregateService,
+    reconcile_stats,
+    review_aggregate_service,
+)
 
 
 def test_create_review_success(client, db_session):
@@ -827,6 +834,9 @@ def test_get_service_review_stats(client, db_session):
         db_session.add(review)
 
     db_session.commit()
+    # Reviews inserted behind the CRUD's back reach the stored aggregates
+    # through the reconcile job
+    review_aggregate_service.reconcile(db_session)
 
     response = client.get(f"/api/services/{service.id}/reviews/stats")
     assert response.status_code == status.HTTP_200_OK
@@ -1279,3 +1289,500 @@ def test_reviews_pagination(client, db_session):
     assert response.status_code == status.HTTP_200_OK
     data = response.json()
     assert len(data) >= 2
+
+
+def test_relationships_must_be_eager_loaded(db_session):
+    """Lazy loads raise instead of silently issuing queries"""
+    import pytest
+    from sqlalchemy.exc import InvalidRequestError
+    from sqlalchemy.orm import joinedload
+
+    user = User(
+        id=str(uuid.uuid4()),
+        name="Test User",
+        email="test@example.com",
+        password_hash="not-a-real-hash",
+        role="user",
+    )
+    service = Service(
+        id=str(uuid.uuid4()),
+        title="House Cleaning",
+        price=Decimal("99.99"),
+        duration_minutes=120,
+        owner_id=user.id,
+    )
+    booking = Booking(
+        id=str(uuid.uuid4()),
+        user_id=user.id,
+        service_id=service.id,
+        start_time=datetime.now(timezone.utc) - timedelta(days=2),
+        end_time=datetime.now(timezone.utc) - timedelta(days=2, hours=-2),
+        status="completed",
+    )
+    db_session.add_all([user, service, booking])
+    db_session.flush()
+    db_session.add(Review(booking_id=booking.id, rating=5))
+    db_session.commit()
+    db_session.expunge_all()
+
+    review = db_session.query(Review).first()
+    with pytest.raises(InvalidRequestError):
+        review.user
+
+    review = (
+        db_session.query(Review)
+        .options(joinedload(Review.booking).joinedload(Booking.user))
+        .first()
+    )
+    assert review.user.email == "test@example.com"
+
+
+def test_review_stats_etag_changes_with_reviews(client, db_session):
+    owner = User(
+        id=str(uuid.uuid4()),
+        name="Owner",
+        email="owner@example.com",
+        password_hash="not-a-real-hash",
+        role="admin",
+    )
+    user = User(
+        id=str(uuid.uuid4()),
+        name="Test User",
+        email="test@example.com",
+        password_hash=get_password_hash("testpassword123"),
+        role="user",
+        is_active=True,
+        status="active",
+    )
+    service = Service(
+        id=str(uuid.uuid4()),
+        title="Stats Service",
+        price=Decimal("50.00"),
+        duration_minutes=60,
+        owner_id=owner.id,
+    )
+    booking = Booking(
+        id=str(uuid.uuid4()),
+        user_id=user.id,
+        service_id=service.id,
+        start_time=datetime.now(timezone.utc) - timedelta(days=1),
+        end_time=datetime.now(timezone.utc) - timedelta(hours=23),
+        status="completed",
+    )
+    db_session.add_all([owner, user, service, booking])
+    db_session.commit()
+    url = f"/api/services/{service.id}/reviews/stats"
+
+    response = client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["Cache-Control"].startswith("public")
+    etag = response.headers["ETag"]
+
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b""
+    # Only the change counter was read, not the aggregate
+    assert response.headers["X-DB-Queries"] == "1"
+
+    user_token, _ = create_access_token(
+        data={"sub": str(user.id)}, expires_delta=timedelta(minutes=30)
+    )
+    response = client.post(
+        "/api/reviews",
+        json={"booking_id": booking.id, "rating": 4},
+        headers={"Authorization": f"Bearer {user_token}"},
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != etag
+    assert response.json()["total_reviews"] == 1
+
+
+def test_review_writes_maintain_service_aggregates(client, db_session):
+    owner = User(
+        id=str(uuid.uuid4()),
+        name="Owner",
+        email="owner@example.com",
+        password_hash="not-a-real-hash",
+        role="admin",
+    )
+    user = User(
+        id=str(uuid.uuid4()),
+        name="Test User",
+        email="test@example.com",
+        password_hash=get_password_hash("testpassword123"),
+        role="user",
+        is_active=True,
+        status="active",
+    )
+    service = Service(
+        id=str(uuid.uuid4()),
+        title="Aggregate Service",
+        price=Decimal("50.00"),
+        duration_minutes=60,
+        owner_id=owner.id,
+    )
+    bookings = [
+        Booking(
+            id=str(uuid.uuid4()),
+            user_id=user.id,
+            service_id=service.id,
+            start_time=datetime.now(timezone.utc) - timedelta(days=day),
+            end_time=datetime.now(timezone.utc) - timedelta(days=day, hours=-1),
+            status="completed",
+        )
+        for day in (1, 2)
+    ]
+    db_session.add_all([owner, user, service, *bookings])
+    db_session.commit()
+    user_token, _ = create_access_token(
+        data={"sub": str(user.id)}, expires_delta=timedelta(minutes=30)
+    )
+    headers = {"Authorization": f"Bearer {user_token}"}
+    url = f"/api/services/{service.id}/reviews/stats"
+
+    review_ids = []
+    for booking, rating in zip(bookings, (2, 5)):
+        response = client.post(
+            "/api/reviews",
+            json={"booking_id": booking.id, "rating": rating},
+            headers=headers,
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        review_ids.append(response.json()["id"])
+    assert client.get(url).json() == {
+        "total_reviews": 2,
+        "average_rating": 3.5,
+        "min_rating": 2,
+        "max_rating": 5,
+        # No prior stored yet: ten reviews averaging 3
+        "rating_score": (10 * 3 + 7) / 12,
+        "rating_histogram": {"1": 0, "2": 1, "3": 0, "4": 0, "5": 1},
+    }
+
+    response = client.patch(
+        f"/api/reviews/{review_ids[0]}", json={"rating": 4}, headers=headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    db_session.refresh(service)
+    assert (service.review_count, service.rating_sum) == (2, 9)
+    assert (service.rating_2_count, service.rating_4_count) == (0, 1)
+
+    response = client.delete(f"/api/reviews/{review_ids[1]}", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert client.get(url).json() == {
+        "total_reviews": 1,
+        "average_rating": 4.0,
+        "min_rating": 4,
+        "max_rating": 4,
+        "rating_score": (10 * 3 + 4) / 11,
+        "rating_histogram": {"1": 0, "2": 0, "3": 0, "4": 1, "5": 0},
+    }
+    # Stats are read from the service row alone
+    assert client.get(url).headers["X-DB-Queries"] == "1"
+    assert review_aggregate_service.find_drifted_services(db_session) == []
+
+    # Deleting a reviewed booking takes its review out of the aggregates
+    owner_token, _ = create_access_token(
+        data={"sub": str(owner.id)}, expires_delta=timedelta(minutes=30)
+    )
+    response = client.delete(
+        f"/api/bookings/{bookings[0].id}",
+        headers={"Authorization": f"Bearer {owner_token}"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert db_session.query(Review).count() == 0
+    db_session.refresh(service)
+    assert (service.review_count, service.rating_sum, service.rating_4_count) == (
+        0,
+        0,
+        0,
+    )
+    assert review_aggregate_service.find_drifted_services(db_session) == []
+
+
+def test_admin_reviews_with_details_in_one_query(client, db_session):
+    admin = User(
+        id=str(uuid.uuid4()),
+        name="Admin User",
+        email="admin@example.com",
+        password_hash="not-a-real-hash",
+        role="admin",
+    )
+    service = Service(
+        id=str(uuid.uuid4()),
+        title="Window Cleaning",
+        price=Decimal("40.00"),
+        duration_minutes=60,
+        owner_id=admin.id,
+    )
+    users = [
+        User(
+            id=str(uuid.uuid4()),
+            name=f"Reviewer {index}",
+            email=f"reviewer{index}@example.com",
+            password_hash="not-a-real-hash",
+        )
+        for index in range(3)
+    ]
+    bookings = [
+        Booking(
+            id=str(uuid.uuid4()),
+            user_id=user.id,
+            service_id=service.id,
+            start_time=datetime.now(timezone.utc) - timedelta(days=index + 1),
+            end_time=datetime.now(timezone.utc) - timedelta(days=index + 1, hours=-1),
+            status="completed",
+        )
+        for index, user in enumerate(users)
+    ]
+    reviews = [
+        Review(id=str(uuid.uuid4()), booking_id=booking.id, rating=4)
+        for booking in bookings
+    ]
+    db_session.add_all([admin, service, *users, *bookings, *reviews])
+    db_session.commit()
+    admin_token, _ = create_access_token(
+        data={"sub": str(admin.id)}, expires_delta=timedelta(minutes=30)
+    )
+    headers = {"Authorization": f"Bearer {admin_token}"}
+
+    plain = client.get("/api/admin/reviews", headers=headers)
+    assert "user" not in plain.json()[0]
+    response = client.get("/api/admin/reviews?include=details", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    # With the token cached, the reviews and their details are one query
+    assert response.headers["X-DB-Queries"] == "1"
+    data = response.json()
+    assert len(data) == 3
+    assert {item["user"]["email"] for item in data} == {
+        user.email for user in users
+    }
+    assert {item["service"]["title"] for item in data} == {"Window Cleaning"}
+    assert {item["booking"]["id"] for item in data} == {
+        booking.id for booking in bookings
+    }
+
+
+def test_reconcile_repairs_drifted_review_aggregates(db_session):
+    owner = User(
+        id=str(uuid.uuid4()),
+        name="Owner",
+        email="owner@example.com",
+        password_hash="not-a-real-hash",
+        role="admin",
+    )
+    reviewed = Service(
+        id=str(uuid.uuid4()),
+        title="Reviewed",
+        price=Decimal("50.00"),
+        duration_minutes=60,
+        owner_id=owner.id,
+    )
+    # Claims reviews it does not have
+    drifted = Service(
+        id=str(uuid.uuid4()),
+        title="Drifted",
+        price=Decimal("50.00"),
+        duration_minutes=60,
+        owner_id=owner.id,
+        review_count=3,
+        rating_sum=12,
+        rating_4_count=3,
+    )
+    booking = Booking(
+        id=str(uuid.uuid4()),
+        user_id=owner.id,
+        service_id=reviewed.id,
+        start_time=datetime.now(timezone.utc) - timedelta(days=1),
+        end_time=datetime.now(timezone.utc) - timedelta(hours=23),
+        status="completed",
+    )
+    review = Review(id=str(uuid.uuid4()), booking_id=booking.id, rating=3)
+    db_session.add_all([owner, reviewed, drifted, booking, review])
+    db_session.commit()
+
+    assert sorted(review_aggregate_service.find_drifted_services(db_session)) == (
+        sorted([reviewed.id, drifted.id])
+    )
+    assert review_aggregate_service.reconcile(db_session) == 2
+    db_session.refresh(reviewed)
+    db_session.refresh(drifted)
+    assert (reviewed.review_count, reviewed.rating_sum) == (1, 3)
+    assert reviewed.rating_3_count == 1
+    assert reviewed.review_version == 1
+    assert (drifted.review_count, drifted.rating_sum, drifted.rating_4_count) == (
+        0,
+        0,
+        0,
+    )
+    assert review_aggregate_service.reconcile(db_session) == 0
+
+
+def test_reconcile_reraises_failures(db_session, monkeypatch):
+    owner = User(
+        id=str(uuid.uuid4()),
+        name="Owner",
+        email="owner@example.com",
+        password_hash="not-a-real-hash",
+        role="admin",
+    )
+    services = [
+        Service(
+            id=str(uuid.uuid4()),
+            title=f"Drifted {index}",
+            price=Decimal("50.00"),
+            duration_minutes=60,
+            owner_id=owner.id,
+            review_count=1,
+            rating_sum=5,
+            rating_5_count=1,
+        )
+        for index in range(2)
+    ]
+    db_session.add_all([owner] + services)
+    db_session.commit()
+
+    recompute_service = ReviewAggregateService.recompute_service
+    calls = []
+
+    def fail_second(db, service_id):
+        calls.append(service_id)
+        if len(calls) == 2:
+            raise RuntimeError("connection lost")
+        recompute_service(db, service_id)
+
+    monkeypatch.setattr(
+        ReviewAggregateService, "recompute_service", staticmethod(fail_second)
+    )
+    failures = reconcile_stats["failures"]
+    with pytest.raises(RuntimeError):
+        review_aggregate_service.reconcile(db_session)
+    assert reconcile_stats["failures"] == failures + 1
+    assert reconcile_stats["last_services_fixed"] == 1
+
+
+def test_batch_review_stats_for_many_services(client, db_session):
+    owner = User(
+        id=str(uuid.uuid4()),
+        name="Owner",
+        email="owner@example.com",
+        password_hash="not-a-real-hash",
+        role="admin",
+    )
+    reviewed = Service(
+        id=str(uuid.uuid4()),
+        title="Reviewed",
+        price=Decimal("50.00"),
+        duration_minutes=60,
+        owner_id=owner.id,
+        review_count=2,
+        rating_sum=7,
+        rating_3_count=1,
+        rating_4_count=1,
+    )
+    unreviewed = Service(
+        id=str(uuid.uuid4()),
+        title="Unreviewed",
+        price=Decimal("50.00"),
+        duration_minutes=60,
+        owner_id=owner.id,
+    )
+    db_session.add_all([owner, reviewed, unreviewed])
+    db_session.commit()
+    unknown = str(uuid.uuid4())
+
+    url = f"/api/services/reviews/stats?ids={unreviewed.id},{reviewed.id},{unknown}"
+    response = client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["X-DB-Queries"] == "1"
+    data = response.json()
+    service_ids = [item["service_id"] for item in data]
+    assert service_ids == [unreviewed.id, reviewed.id, unknown]
+    assert [item["total_reviews"] for item in data] == [0, 2, 0]
+    assert data[1]["average_rating"] == 3.5
+    assert (data[1]["min_rating"], data[1]["max_rating"]) == (3, 4)
+    assert data[1]["rating_histogram"] == {"1": 0, "2": 0, "3": 1, "4": 1, "5": 0}
+    # An unreviewed service scores the prior mean
+    assert data[0]["rating_score"] == 3.0
+    assert data[2] == {
+        "total_reviews": 0,
+        "average_rating": 0.0,
+        "min_rating": 0,
+        "max_rating": 0,
+        "rating_score": 0.0,
+        "rating_histogram": {"1": 0, "2": 0, "3": 0, "4": 0, "5": 0},
+        "service_id": unknown,
+    }
+    response = client.get(url, headers={"If-None-Match": response.headers["ETag"]})
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    for ids in ("not-a-uuid", ",", ",".join(str(uuid.uuid4()) for _ in range(101))):
+        response = client.get(f"/api/services/reviews/stats?ids={ids}")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_refresh_prior_rescores_services_around_global_average(db_session):
+    owner = User(
+        id=str(uuid.uuid4()),
+        name="Owner",
+        email="owner@example.com",
+        password_hash="not-a-real-hash",
+        role="admin",
+    )
+    services = [
+        Service(
+            id=str(uuid.uuid4()),
+            title=title,
+            price=Decimal("50.00"),
+            duration_minutes=60,
+            owner_id=owner.id,
+        )
+        for title in ("Many fives", "One five", "Many twos", "Unreviewed")
+    ]
+    db_session.add_all([owner, *services])
+    ratings = [(services[0], 5)] * 20 + [(services[1], 5)] + [(services[2], 2)] * 20
+    for service, rating in ratings:
+        booking = Booking(
+            id=str(uuid.uuid4()),
+            user_id=owner.id,
+            service_id=service.id,
+            start_time=datetime.now(timezone.utc) - timedelta(days=1),
+            end_time=datetime.now(timezone.utc) - timedelta(hours=23),
+            status="completed",
+        )
+        review = Review(id=str(uuid.uuid4()), booking_id=booking.id, rating=rating)
+        db_session.add_all([booking, review])
+    db_session.commit()
+
+    review_aggregate_service.reconcile(db_session)
+    prior = db_session.get(RatingPrior, RATING_PRIOR_ID)
+    assert prior.mean == (20 * 5 + 5 + 20 * 2) / 41
+    scores = {}
+    for service in services:
+        db_session.refresh(service)
+        scores[service.title] = service.rating_score
+    assert scores["Unreviewed"] == pytest.approx(prior.mean)
+    assert scores["One five"] == pytest.approx((prior.weight * prior.mean + 5) / 11)
+    # Many good reviews outrank a single perfect one
+    assert scores["Many fives"] > scores["One five"] > scores["Unreviewed"]
+    assert scores["Unreviewed"] > scores["Many twos"]
+
+    # Nothing moved, so nothing is rescored
+    assert review_aggregate_service.refresh_prior(db_session) == 0
+
+    # A service added later starts at the stored prior, not at zero
+    late = Service(
+        id=str(uuid.uuid4()),
+        title="Added later",
+        price=Decimal("50.00"),
+        duration_minutes=60,
+        owner_id=owner.id,
+    )
+    db_session.add(late)
+    db_session.commit()
+    db_session.refresh(late)
+    assert late.rating_score == pytest.approx(prior.mean)
+    assert Service.__table__.c.rating_score.server_default is None
@@ -1,10 +1,15 @@
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone
 import uuid
+import pytest
 from fastapi import status
+from fastapi.responses import JSONResponse
 from decimal import Decimal
 
 from models.user import User
 from models.service import Service
+from models.booking import Booking
+from routers.json_response import FastJSONResponse
+from schemas.service import ServiceResponse
 from security.auth import create_access_token, get_password_hash
 
 
@@ -595,6 +600,169 @@ def test_services_pagination(client, db_session):
     data = response.json()
     assert len(data) >= 2  # Should get at least the remaining 2 services
 
+    # Cursor pagination walks the same services without offsets
+    response = client.get("/api/services?limit=3")
+    first_page = response.json()
+    cursor = response.headers["X-Next-Cursor"]
+
+    response = client.get("/api/services", params={"limit": 3, "cursor": cursor})
+    assert response.status_code == status.HTTP_200_OK
+    second_page = response.json()
+    assert len(second_page) == 2
+    assert "X-Next-Cursor" not in response.headers
+    assert {service["id"] for service in first_page + second_page} == {
+        service.id for service in services
+    }
+
+
+def test_get_service_availability(client, db_session):
+    """Test free intervals are computed around active bookings"""
+    admin = User(
+        id=str(uuid.uuid4()),
+        name="Admin User",
+        email="admin@example.com",
+        password_hash=get_password_hash("adminpassword123"),
+        role="admin",
+        is_active=True,
+        status="active",
+    )
+    db_session.add(admin)
+    db_session.commit()
+
+    service = Service(
+        id=str(uuid.uuid4()),
+        title="Tutoring",
+        description="One hour tutoring sessions",
+        price=Decimal("40.00"),
+        duration_minutes=60,
+        is_active=True,
+        owner_id=admin.id,
+    )
+    db_session.add(service)
+    db_session.commit()
+
+    # Bookings are stored as naive UTC
+    day = (datetime.now(timezone.utc) + timedelta(days=1)).replace(
+        hour=0, minute=0, second=0, microsecond=0, tzinfo=None
+    )
+    bookings = [
+        (day.replace(hour=10), day.replace(hour=11), "confirmed"),
+        (day.replace(hour=11, minute=30), day.replace(hour=12), "pending"),
+        (day.replace(hour=12), day.replace(hour=13), "cancelled"),
+    ]
+    db_session.add_all(
+        [
+            Booking(
+                id=str(uuid.uuid4()),
+                user_id=admin.id,
+                service_id=service.id,
+                start_time=start_time,
+                end_time=end_time,
+                status=booking_status,
+            )
+            for start_time, end_time, booking_status in bookings
+        ]
+    )
+    db_session.commit()
+
+    response = client.get(
+        f"/api/services/{service.id}/availability",
+        params={
+            "from": day.replace(hour=9).isoformat(),
+            "to": day.replace(hour=13).isoformat(),
+        },
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["duration_minutes"] == 60
+    # 11:00-11:30 is too short for the service; the cancelled booking is free.
+    # Every time in the response is UTC
+    assert data["window_start"] == day.replace(hour=9).isoformat() + "Z"
+    assert data["free_slots"] == [
+        {
+            "start_time": day.replace(hour=9).isoformat() + "Z",
+            "end_time": day.replace(hour=10).isoformat() + "Z",
+        },
+        {
+            "start_time": day.replace(hour=12).isoformat() + "Z",
+            "end_time": day.replace(hour=13).isoformat() + "Z",
+        },
+    ]
+
+    # Invalid windows are rejected
+    response = client.get(
+        f"/api/services/{service.id}/availability",
+        params={
+            "from": day.replace(hour=13).isoformat(),
+            "to": day.replace(hour=9).isoformat(),
+        },
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    response = client.get(
+        f"/api/services/{uuid.uuid4()}/availability",
+        params={
+            "from": day.replace(hour=9).isoformat(),
+            "to": day.replace(hour=13).isoformat(),
+        },
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_service_availability_with_offsets_and_mixed_bounds(client, db_session):
+    admin = User(
+        id=str(uuid.uuid4()),
+        name="Admin User",
+        email="admin@example.com",
+        password_hash="not-a-real-hash",
+        role="admin",
+    )
+    service = Service(
+        id=str(uuid.uuid4()),
+        title="Tutoring",
+        price=Decimal("40.00"),
+        duration_minutes=60,
+        owner_id=admin.id,
+    )
+    day = datetime(2030, 1, 1)
+    booking = Booking(
+        id=str(uuid.uuid4()),
+        user_id=admin.id,
+        service_id=service.id,
+        start_time=day.replace(hour=10),
+        end_time=day.replace(hour=11),
+        status="confirmed",
+    )
+    db_session.add_all([admin, service, booking])
+    db_session.commit()
+    url = f"/api/services/{service.id}/availability"
+    expected_slots = [
+        {"start_time": "2030-01-01T09:00:00Z", "end_time": "2030-01-01T10:00:00Z"},
+        {"start_time": "2030-01-01T11:00:00Z", "end_time": "2030-01-01T12:00:00Z"},
+    ]
+
+    # 09:00-12:00 UTC given in +02:00
+    response = client.get(
+        url,
+        params={"from": "2030-01-01T11:00:00+02:00", "to": "2030-01-01T14:00:00+02:00"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["window_start"] == "2030-01-01T09:00:00Z"
+    assert data["window_end"] == "2030-01-01T12:00:00Z"
+    assert data["free_slots"] == expected_slots
+
+    # A naive bound is read as UTC
+    response = client.get(
+        url, params={"from": "2030-01-01T09:00:00Z", "to": "2030-01-01T12:00:00"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["free_slots"] == expected_slots
+
+    response = client.get(
+        url, params={"from": "2030-01-01T12:00:00", "to": "2030-01-01T12:00:00Z"}
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
 
 def test_unauthorized_access_to_protected_endpoints(client):
     """Test accessing protected endpoints without authentication"""
@@ -626,3 +794,370 @@ def test_unauthorized_access_to_protected_endpoints(client):
 
     response = client.get(f"/api/admin/services/{service_id}")
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_async_service_crud_matches_sync(db_session):
+    import asyncio
+    from crud.service import async_service_crud, service_crud
+    from tests.conftest import TestingAsyncSessionLocal
+
+    owner = User(
+        id=str(uuid.uuid4()),
+        name="Owner",
+        email="owner@example.com",
+        password_hash=get_password_hash("password123"),
+        role="admin",
+    )
+    db_session.add(owner)
+    db_session.add_all(
+        [
+            Service(
+                id=str(uuid.uuid4()),
+                title=f"Service {i}",
+                price=Decimal(10 + i),
+                duration_minutes=60,
+                is_active=i != 1,
+                owner_id=owner.id,
+            )
+            for i in range(4)
+        ]
+    )
+    db_session.commit()
+
+    async def fetch():
+        async with TestingAsyncSessionLocal() as db:
+            services = await async_service_crud.get_active_services(db, price_min=11)
+            missing = await async_service_crud.get_service_by_id(db, uuid.uuid4())
+            return [service.id for service in services], missing
+
+    ids, missing = asyncio.run(fetch())
+    expected = service_crud.get_active_services(db_session, price_min=11)
+    assert ids == [service.id for service in expected]
+    assert len(ids) == 2
+    assert missing is None
+
+
+def test_public_reads_use_replica_until_client_writes(client, monkeypatch):
+    from database import replica
+    from tests.conftest import TestingAsyncSessionLocal
+
+    # Point the replica at the test database so only routing differs
+    monkeypatch.setattr(replica, "ReplicaSessionLocal", TestingAsyncSessionLocal)
+    before = replica.routing_stats.snapshot()
+
+    assert client.get("/api/services").status_code == status.HTTP_200_OK
+    assert replica.routing_stats.snapshot()["replica"] == before["replica"] + 1
+
+    response = client.post(
+        "/api/auth/register",
+        json={
+            "name": "Writer",
+            "email": "writer@example.com",
+            "password": "password123",
+            "role": "user",
+        },
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    assert replica.PRIMARY_STICKY_COOKIE in response.cookies
+
+    assert client.get("/api/services").status_code == status.HTTP_200_OK
+    after = replica.routing_stats.snapshot()
+    assert after["replica"] == before["replica"] + 1
+    assert after["primary_sticky"] == before["primary_sticky"] + 1
+    assert after["sticky_marks"] == before["sticky_marks"] + 1
+
+
+def test_db_query_headers_and_n_plus_one_detection(client, db_session):
+    import pytest
+    from sqlalchemy import text
+    from database.query_stats import NPlusOneError, track_queries
+
+    response = client.get("/api/services")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["X-DB-Queries"] == "1"
+    assert float(response.headers["X-DB-Time"]) >= 0
+
+    with track_queries(threshold=2, mode="raise") as stats:
+        db_session.execute(text("SELECT 1"))
+        db_session.execute(text("SELECT 1"))
+        with pytest.raises(NPlusOneError):
+            db_session.execute(text("SELECT 1"))
+    assert stats.count == 3
+
+
+def test_catalog_cache_serves_reads_until_catalog_changes(
+    client, db_session, monkeypatch
+):
+    from services.catalog_cache import bump_catalog_version, catalog_cache
+
+    admin = User(
+        id=str(uuid.uuid4()),
+        name="Admin User",
+        email="admin@example.com",
+        password_hash=get_password_hash("adminpassword123"),
+        role="admin",
+        is_active=True,
+        status="active",
+    )
+    db_session.add(admin)
+    db_session.commit()
+    admin_token, _ = create_access_token(
+        data={"sub": str(admin.id)}, expires_delta=timedelta(minutes=30)
+    )
+    admin_headers = {"Authorization": f"Bearer {admin_token}"}
+    response = client.post(
+        "/api/services",
+        json={"title": "Yoga", "price": 20.0, "duration_minutes": 60},
+        headers=admin_headers,
+    )
+    service_id = response.json()["id"]
+
+    first = client.get("/api/services?q=Yoga")
+    assert first.headers["X-DB-Queries"] == "1"
+    # Same search in another spelling is served from the cache
+    second = client.get("/api/services?q=%20yoga%20")
+    assert second.headers["X-DB-Queries"] == "0"
+    assert second.json() == first.json()
+    assert client.get(f"/api/services/{service_id}").headers["X-DB-Queries"] == "1"
+    assert client.get(f"/api/services/{service_id}").headers["X-DB-Queries"] == "0"
+
+    # A write in this worker is visible immediately
+    client.patch(
+        f"/api/services/{service_id}", json={"title": "Hot yoga"}, headers=admin_headers
+    )
+    response = client.get(f"/api/services/{service_id}")
+    assert response.headers["X-DB-Queries"] == "1"
+    assert response.json()["title"] == "Hot yoga"
+
+    # With the version check, a write by another worker is noticed at once
+    monkeypatch.setattr(catalog_cache, "version_check", True)
+    client.get(f"/api/services/{service_id}")
+    bump_catalog_version(db_session)
+    db_session.commit()
+    response = client.get(f"/api/services/{service_id}")
+    assert response.headers["X-DB-Queries"] == "2"
+    response = client.get(f"/api/services/{service_id}")
+    assert response.headers["X-DB-Queries"] == "1"
+    assert catalog_cache.stats()["hits"] >= 3
+
+
+def test_public_service_endpoints_answer_conditional_requests(client, db_session):
+    admin = User(
+        id=str(uuid.uuid4()),
+        name="Admin User",
+        email="admin@example.com",
+        password_hash=get_password_hash("adminpassword123"),
+        role="admin",
+        is_active=True,
+        status="active",
+    )
+    service = Service(
+        id=str(uuid.uuid4()),
+        title="Original Service",
+        price=Decimal("100.00"),
+        duration_minutes=60,
+        owner_id=admin.id,
+    )
+    db_session.add_all([admin, service])
+    db_session.commit()
+
+    for url in ("/api/services", f"/api/services/{service.id}"):
+        response = client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        etag = response.headers["ETag"]
+        assert response.headers["Cache-Control"].startswith("public")
+
+        response = client.get(url, headers={"If-None-Match": f'"other", W/{etag}'})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers["ETag"] == etag
+        # Served from the catalog cache without touching the database
+        assert response.headers["X-DB-Queries"] == "0"
+
+    admin_token, _ = create_access_token(
+        data={"sub": str(admin.id)}, expires_delta=timedelta(minutes=30)
+    )
+    client.patch(
+        f"/api/services/{service.id}",
+        json={"price": 120.0},
+        headers={"Authorization": f"Bearer {admin_token}"},
+    )
+    response = client.get(
+        f"/api/services/{service.id}", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert "version" not in response.json()
+    assert response.headers["ETag"] != etag
+    db_session.refresh(service)
+    assert service.version == 2
+
+
+def test_get_services_include_stats(client, db_session):
+    admin = User(
+        id=str(uuid.uuid4()),
+        name="Admin User",
+        email="admin@example.com",
+        password_hash="not-a-real-hash",
+        role="admin",
+    )
+    services = [
+        Service(
+            id=str(uuid.uuid4()),
+            title=f"Service {index}",
+            price=Decimal("100.00"),
+            duration_minutes=60,
+            owner_id=admin.id,
+            review_count=index,
+            rating_sum=5 * index,
+            rating_5_count=index,
+        )
+        for index in range(3)
+    ]
+    db_session.add_all([admin, *services])
+    db_session.commit()
+
+    response = client.get("/api/services")
+    assert "review_stats" not in response.json()[0]
+
+    response = client.get("/api/services?include=stats")
+    assert response.status_code == status.HTTP_200_OK
+    # The listing comes from the catalog cache; the stats of the whole page
+    # are one query
+    assert response.headers["X-DB-Queries"] == "1"
+    assert "version" not in response.json()[0]
+    stats = {item["title"]: item["review_stats"] for item in response.json()}
+    assert stats["Service 0"]["total_reviews"] == 0
+    assert stats["Service 2"]["total_reviews"] == 2
+    assert stats["Service 2"]["average_rating"] == 5.0
+    assert stats["Service 2"]["rating_histogram"]["5"] == 2
+    etag = response.headers["ETag"]
+
+    # A new review changes the stats, so the page is no longer current
+    db_session.query(Service).filter(Service.id == services[0].id).update(
+        {"review_version": 1, "review_count": 1, "rating_sum": 3, "rating_3_count": 1}
+    )
+    db_session.commit()
+    response = client.get(
+        "/api/services?include=stats", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != etag
+
+    response = client.get("/api/services?include=reviews")
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_get_services_top_rated_pages_by_score(client, db_session):
+    admin = User(
+        id=str(uuid.uuid4()),
+        name="Admin User",
+        email="admin@example.com",
+        password_hash="not-a-real-hash",
+        role="admin",
+    )
+    scores = {"Good": 4.5, "Tied A": 4.0, "Tied B": 4.0, "Poor": 2.0, "Hidden": 5.0}
+    services = [
+        Service(
+            id=str(uuid.uuid4()),
+            title=title,
+            price=Decimal("100.00"),
+            duration_minutes=60,
+            owner_id=admin.id,
+            is_active=title != "Hidden",
+            rating_score=score,
+            review_count=1,
+            rating_sum=4,
+            rating_4_count=1,
+        )
+        for title, score in scores.items()
+    ]
+    db_session.add_all([admin, *services])
+    db_session.commit()
+    tied = sorted(
+        (service for service in services if service.title.startswith("Tied")),
+        key=lambda service: service.id,
+        reverse=True,
+    )
+
+    items = []
+    cursor = None
+    while True:
+        url = "/api/services?sort=top_rated&limit=2"
+        response = client.get(url + (f"&cursor={cursor}" if cursor else ""))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["X-DB-Queries"] == "1"
+        items += response.json()
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    titles = [item["title"] for item in items]
+    assert titles == ["Good", tied[0].title, tied[1].title, "Poor"]
+    assert items[-1]["review_stats"]["rating_score"] == 2.0
+    assert items[-1]["review_stats"]["rating_histogram"]["4"] == 1
+
+    response = client.get("/api/services?sort=top_rated&price_max=10")
+    assert response.json() == []
+    response = client.get("/api/services?sort=newest")
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_responses_match_stdlib_json_byte_for_byte(client, db_session):
+    admin = User(
+        id=str(uuid.uuid4()),
+        name="Admin User",
+        email="admin@example.com",
+        password_hash="not-a-real-hash",
+        role="admin",
+    )
+    services = [
+        Service(
+            id=str(uuid.uuid4()),
+            title=title,
+            description="Ménage à domicile — 清洁",
+            price=price,
+            duration_minutes=90,
+            owner_id=admin.id,
+            review_count=3,
+            rating_sum=11,
+            rating_3_count=1,
+            rating_4_count=2,
+            rating_score=(10 * 3 + 11) / 13,
+        )
+        for title, price in (("Café cleaning", Decimal("49.99")), ("Lawn", 120))
+    ]
+    db_session.add_all([admin, *services])
+    db_session.commit()
+
+    for url in (
+        "/api/services",
+        "/api/services?include=stats",
+        "/api/services?sort=top_rated",
+        f"/api/services/{services[0].id}/reviews/stats",
+    ):
+        response = client.get(url)
+        assert response.headers["content-type"] == "application/json"
+        assert response.content == JSONResponse(response.json()).body
+
+    # Values handed over without a conversion pass come out as pydantic and
+    # jsonable_encoder would write them
+    created_at = datetime(2026, 1, 2, 3, 4, 5, 678000, tzinfo=timezone.utc)
+    service = ServiceResponse.model_validate(services[0]).model_copy(
+        update={"created_at": created_at}
+    )
+    raw = service.model_dump() | {"price": Decimal("49.99"), "minutes": Decimal("90")}
+    assert FastJSONResponse(raw).body == JSONResponse(
+        service.model_dump(mode="json") | {"price": 49.99, "minutes": 90}
+    ).body
+
+
+def test_fast_json_response_rejects_non_finite_floats():
+    for content in (
+        {"average_rating": float("nan")},
+        [{"rating_score": None}, {"rating_score": float("inf")}],
+        {"price": Decimal("-Infinity")},
+    ):
+        with pytest.raises(ValueError):
+            FastJSONResponse(content)
+
+    assert FastJSONResponse({"note": None, "score": 1.5}).body == (
+        b'{"note":null,"score":1.5}'
+    )
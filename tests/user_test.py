@@ -1,5 +1,6 @@
-from datetime import timedelta
+from datetime import datetime, timedelta
 import uuid
+import pytest
 from fastapi import status
 from models.user import User
 from security.auth import create_access_token, get_password_hash
@@ -466,3 +467,334 @@ def test_admin_delete_user(client, db_session):
     admin_headers = {"Authorization": f"Bearer {admin_token}"}
     response = client.delete(f"/api/users/{user.id}", headers=admin_headers)
     assert response.status_code == status.HTTP_200_OK
+
+
+def test_token_cache_hits_and_invalidation(client, db_session):
+    from security.token_cache import token_cache
+
+    user = User(
+        id=str(uuid.uuid4()),
+        name="Cached User",
+        email="cached@example.com",
+        password_hash=get_password_hash("testpassword123"),
+        role="user",
+        is_active=True,
+        status="active",
+    )
+    db_session.add(user)
+    db_session.commit()
+
+    access_token, _ = create_access_token(
+        data={"sub": str(user.id)}, expires_delta=timedelta(minutes=30)
+    )
+    headers = {"Authorization": f"Bearer {access_token}"}
+    hits = token_cache.stats()["hits"]
+    assert client.get("/api/me", headers=headers).status_code == status.HTTP_200_OK
+    assert client.get("/api/me", headers=headers).status_code == status.HTTP_200_OK
+    stats = token_cache.stats()
+    assert stats["hits"] == hits + 1
+    assert stats["size"] == 1
+
+    # Updating the profile drops the cached snapshot
+    response = client.patch("/api/me", json={"name": "Renamed"}, headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert token_cache.stats()["size"] == 0
+    assert client.get("/api/me", headers=headers).json()["name"] == "Renamed"
+
+    # Metrics are admin only
+    response = client.get("/api/internal/metrics", headers=headers)
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_revocation_filter_tracks_blacklisted_tokens(client, db_session):
+    from models.token_blacklist import TokenBlacklist
+    from services.revocation_filter import RevocationFilter
+    from services.token_blacklist import token_blacklist_service
+
+    user = User(
+        id=str(uuid.uuid4()),
+        name="Revoked User",
+        email="revoked@example.com",
+        password_hash=get_password_hash("testpassword123"),
+        role="user",
+        is_active=True,
+        status="active",
+    )
+    db_session.add(user)
+    db_session.commit()
+
+    login_response = client.post(
+        "/api/auth/login",
+        json={"email": "revoked@example.com", "password": "testpassword123"},
+    )
+    tokens = login_response.json()
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    response = client.post(
+        "/api/auth/logout",
+        json={"refresh_token": tokens["refresh_token"]},
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    response = client.get("/api/me", headers=headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    unknown_jti = str(uuid.uuid4())
+    assert not token_blacklist_service.is_token_blacklisted(db_session, unknown_jti)
+
+    # A separate worker's filter learns about rows through rebuild and refresh
+    revoked_filter = RevocationFilter(enabled=True, capacity=100, error_rate=0.01)
+    revoked_filter.rebuild(db_session)
+    assert revoked_filter.stats()["items"] == 2
+    db_session.add(
+        TokenBlacklist(
+            jti="late-jti", token="token", expires_at=datetime.now() + timedelta(hours=1)
+        )
+    )
+    db_session.commit()
+    assert not revoked_filter.might_contain("late-jti")
+    revoked_filter.refresh(db_session)
+    assert revoked_filter.might_contain("late-jti")
+    assert revoked_filter.stats()["estimated_false_positive_rate"] < 0.01
+
+
+def test_cleanup_expired_tokens_in_batches(db_session):
+    from models.token_blacklist import TokenBlacklist
+    from services.token_blacklist import cleanup_stats, token_blacklist_service
+
+    now = datetime.now()
+    db_session.add_all(
+        [
+            TokenBlacklist(
+                jti=f"expired-{i}", token="token", expires_at=now - timedelta(hours=1)
+            )
+            for i in range(5)
+        ]
+    )
+    db_session.add(
+        TokenBlacklist(jti="live", token="token", expires_at=now + timedelta(hours=1))
+    )
+    db_session.commit()
+
+    runs = cleanup_stats["runs"]
+    assert token_blacklist_service.cleanup_expired_tokens(db_session, batch_size=2) == 5
+    assert [row.jti for row in db_session.query(TokenBlacklist).all()] == ["live"]
+    assert cleanup_stats["runs"] == runs + 1
+    assert cleanup_stats["last_rows_purged"] == 5
+
+
+def test_login_rejected_when_password_hash_pool_saturated(
+    client, db_session, monkeypatch
+):
+    from security.auth import password_hash_pool
+
+    user = User(
+        id=str(uuid.uuid4()),
+        name="Busy User",
+        email="busy@example.com",
+        password_hash=get_password_hash("testpassword123"),
+        role="user",
+        is_active=True,
+        status="active",
+    )
+    db_session.add(user)
+    db_session.commit()
+    login_data = {"email": "busy@example.com", "password": "testpassword123"}
+
+    monkeypatch.setattr(password_hash_pool, "max_queue", 0)
+    monkeypatch.setattr(password_hash_pool, "in_flight", password_hash_pool.workers)
+    rejected = password_hash_pool.rejected
+    response = client.post("/api/auth/login", json=login_data)
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.headers["Retry-After"] == "1"
+    assert password_hash_pool.rejected == rejected + 1
+
+    monkeypatch.setattr(password_hash_pool, "in_flight", 0)
+    response = client.post("/api/auth/login", json=login_data)
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_password_hash_pool_counts_failures_apart():
+    import asyncio
+    from security.auth import PasswordHashPool
+
+    pool = PasswordHashPool(workers=1, max_queue=1)
+
+    def fail():
+        raise ValueError("malformed hash")
+
+    assert pool.run(pow, 2, 3) == 8
+    assert asyncio.run(pool.run_async(pow, 2, 4)) == 16
+    with pytest.raises(ValueError):
+        asyncio.run(pool.run_async(fail))
+    pool._executor.shutdown(wait=True)
+    stats = pool.stats()
+    assert (stats["completed"], stats["failed"], stats["in_flight"]) == (2, 1, 0)
+
+
+def test_stateless_auth_uses_claims_and_session_epoch(
+    client, db_session, monkeypatch
+):
+    from sqlalchemy import event
+    from security.token_cache import token_cache
+
+    monkeypatch.setattr("security.auth.STATELESS_AUTH", True)
+    admin = User(
+        id=str(uuid.uuid4()),
+        name="Stateless Admin",
+        email="stateless@example.com",
+        password_hash=get_password_hash("testpassword123"),
+        role="admin",
+        is_active=True,
+        status="active",
+    )
+    db_session.add(admin)
+    db_session.commit()
+
+    tokens = client.post(
+        "/api/auth/login",
+        json={"email": "stateless@example.com", "password": "testpassword123"},
+    ).json()
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    response = client.get("/api/internal/metrics", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+
+    # With the session epoch cached, an admin request needs no queries at all
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        token_cache.clear()
+        response = client.get("/api/internal/metrics", headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    assert response.status_code == status.HTTP_200_OK
+    assert statements == []
+
+    response = client.post(
+        "/api/auth/logout",
+        json={"refresh_token": tokens["refresh_token"]},
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    db_session.refresh(admin)
+    assert admin.session_epoch == 1
+    response = client.get("/api/internal/metrics", headers=headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_access_token_profile_claims_only_in_stateless_mode(
+    client, db_session, monkeypatch
+):
+    from jose import jwt
+
+    user = User(
+        id=str(uuid.uuid4()),
+        name="Claims User",
+        email="claims@example.com",
+        password_hash=get_password_hash("testpassword123"),
+        role="user",
+        is_active=True,
+        status="active",
+    )
+    db_session.add(user)
+    db_session.commit()
+    login_data = {"email": "claims@example.com", "password": "testpassword123"}
+
+    tokens = client.post("/api/auth/login", json=login_data).json()
+    claims = jwt.get_unverified_claims(tokens["access_token"])
+    assert claims["sub"] == user.id
+    assert claims["role"] == "user"
+    assert "sep" in claims
+    for claim in ("name", "email", "status", "is_active"):
+        assert claim not in claims
+
+    # A token issued before stateless mode was enabled is still accepted
+    monkeypatch.setattr("security.auth.STATELESS_AUTH", True)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    response = client.get("/api/me", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+
+    tokens = client.post("/api/auth/login", json=login_data).json()
+    claims = jwt.get_unverified_claims(tokens["access_token"])
+    assert claims["name"] == "Claims User"
+    assert claims["email"] == "claims@example.com"
+
+
+def test_password_change_revokes_stateless_tokens(client, db_session, monkeypatch):
+    monkeypatch.setattr("security.auth.STATELESS_AUTH", True)
+    user = User(
+        id=str(uuid.uuid4()),
+        name="Stateless User",
+        email="stateless@example.com",
+        password_hash=get_password_hash("testpassword123"),
+        role="user",
+        is_active=True,
+        status="active",
+    )
+    db_session.add(user)
+    db_session.commit()
+
+    tokens = client.post(
+        "/api/auth/login",
+        json={"email": "stateless@example.com", "password": "testpassword123"},
+    ).json()
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    # Changing the name keeps the session
+    response = client.patch("/api/me", json={"name": "Renamed"}, headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    db_session.refresh(user)
+    assert user.session_epoch == 0
+
+    response = client.patch(
+        "/api/me", json={"password": "newpassword123"}, headers=headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    db_session.refresh(user)
+    assert user.session_epoch == 1
+    response = client.get("/api/me", headers=headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_admin_search_users(client, db_session):
+    admin = User(
+        id=str(uuid.uuid4()),
+        name="Admin User",
+        email="admin@example.com",
+        password_hash=get_password_hash("adminpassword123"),
+        role="admin",
+        is_active=True,
+        status="active",
+    )
+    db_session.add_all(
+        [
+            admin,
+            User(
+                id=str(uuid.uuid4()),
+                name="Alice Johnson",
+                email="alice@example.com",
+                password_hash="not-a-real-hash",
+            ),
+            User(
+                id=str(uuid.uuid4()),
+                name="Bob Smith",
+                email="bob@johnson.org",
+                password_hash="not-a-real-hash",
+            ),
+        ]
+    )
+    db_session.commit()
+
+    admin_token, _ = create_access_token(
+        data={"sub": str(admin.id)}, expires_delta=timedelta(minutes=30)
+    )
+    admin_headers = {"Authorization": f"Bearer {admin_token}"}
+    response = client.get("/api/users/search?q=johnson", headers=admin_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert [user["name"] for user in response.json()] == ["Alice Johnson", "Bob Smith"]
+
+    response = client.get("/api/users/search?q=", headers=admin_headers)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY